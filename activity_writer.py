@@ -0,0 +1,83 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityOutbox:
+    """Asynchronous outbox that bulk-inserts activity rows from a background thread.
+
+    Request threads only enqueue plain dicts. The worker drains the queue and
+    hands at most ``max_batch`` rows at a time to ``write_batch``; a row waits
+    at most ``max_latency`` seconds before its batch is written. Rows still
+    queued at interpreter exit are flushed by an atexit hook.
+    """
+
+    def __init__(self, write_batch: Callable[[List[Dict[str, Any]]], None],
+                 max_batch: int = 500, max_latency: float = 0.5, max_queue: int = 100000):
+        self.write_batch = write_batch
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def put(self, row: Dict[str, Any]):
+        """Queue one row, starting the worker on first use; blocks only if the queue is full."""
+        if self._thread is None:
+            self._start()
+        self._queue.put(row)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='activity-outbox', daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def _collect(self) -> List[Dict[str, Any]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_latency
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            rows = [row for row in batch if row is not None]
+            if rows:
+                try:
+                    self.write_batch(rows)
+                except Exception:
+                    logger.exception('Activity outbox failed to write %d rows', len(rows))
+            for _ in batch:
+                self._queue.task_done()
+            if self._stopping.is_set() and self._queue.empty():
+                return
+
+    def flush(self):
+        """Block until every queued row has been handed to write_batch."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def stop(self):
+        """Flush pending rows and stop the worker."""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._queue.put(None)  # wake the worker if it is idle
+        self._thread.join()
+        self._thread = None
+        self._stopping.clear()
@@ -46,57 +46,13 @@ def generate_resume_sections(profile: Profile) -> Dict[str, Any]:
     }
 
 
-def generate_resume_html(sections_or_profile: Union[Dict[str, Any], Profile], template: str = 'classic') -> str:
+def generate_resume_html(sections_or_profile: Union[Dict[str, Any], Profile], template: str = 'classic',
+                         template_variant: str = None) -> str:
     # Simple HTML snippet; final PDF via browser print or html2pdf client-side
-    # Support both passing a Profile and precomputed sections
-    sections = sections_or_profile if isinstance(sections_or_profile, dict) else generate_resume_sections(sections_or_profile)
-    classes = 'resume resume-' + template
-    header = sections['header']
-    html = f"""
-    <div class='{classes}'>
-      <section class='resume-header'>
-        <h1>{header['name']}</h1>
-        <p class='subtitle'>{header['title']}</p>
-        <p class='contact'>
-          <span>{header['contact']['email']}</span> ·
-          <span>{header['contact']['phone']}</span> ·
-          <span>{header['contact']['location']}</span>
-        </p>
-      </section>
-      <section class='resume-summary'>
-        <h2>Professional Summary</h2>
-        <p>{sections['summary']}</p>
-      </section>
-      <section class='resume-skills'>
-        <h2>Skills</h2>
-        <ul>"""
-    for s in sections['skills']:
-        html += f"<li>{s}</li>"
-    html += """</ul>
-      </section>
-    """
-    if sections['experience']:
-        html += "<section class='resume-experience'><h2>Experience</h2>"
-        for exp in sections['experience']:
-            period = exp.get('dates') or exp.get('period', '')
-            details = exp.get('details') or exp.get('description', '')
-            html += f"<div class='role'><h3>{exp.get('role','')}</h3><p class='company'>{exp.get('company','')} · {period}</p><p>{details}</p></div>"
-        html += "</section>"
-    if sections['education']:
-        html += "<section class='resume-education'><h2>Education</h2>"
-        for ed in sections['education']:
-            school = ed.get('school') or ed.get('institution', '')
-            html += f"<div class='edu'><h3>{ed.get('degree','')}</h3><p class='school'>{school} · {ed.get('year','')}</p></div>"
-        html += "</section>"
-    # Optional projects section
-    projects = sections.get('projects') or []
-    if projects:
-        html += "<section class='resume-projects'><h2>Projects</h2>"
-        for p in projects:
-            html += f"<div class='project'><h3>{p.get('title','')}</h3><p>{p.get('description','')}</p></div>"
-        html += "</section>"
-    html += "</div>"
-    return html
+    # Support both passing a Profile and precomputed sections. Rendering goes
+    # through the compiled, escaping and memoized templates in resume_renderer.
+    from resume_renderer import resume_renderer
+    return resume_renderer.render(sections_or_profile, template_variant or template)
 
 
 def compute_match_score(user_skills: List[str], job_skills_text: str) -> Dict[str, Any]:
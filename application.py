@@ -1,31 +1,49 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
+from flask import (Flask, render_template, request, redirect, url_for, flash, session, jsonify, make_response,
+                   Response, stream_with_context, g, has_request_context, send_from_directory)
+import click
+from collections import OrderedDict
+from functools import wraps
 import logging
 from logging.handlers import RotatingFileHandler
-from google_auth_oauthlib.flow import Flow
 from google_calendar import (
-    get_calendar_service,
-    get_user_credentials,
-    save_user_credentials,
+    CalendarClientPool,
+    get_oauth_flow,
+    refresh_credentials,
+    revoke_credentials,
     get_authorization_url,
-    CLIENT_SECRETS_FILE,
-    SCOPES,
-    delete_user_credentials,
 )
-from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 from datetime import datetime, timedelta
 from werkzeug.utils import secure_filename
 from werkzeug.security import generate_password_hash, check_password_hash
+import hashlib
+import hmac
 import os
 import random
-from google.auth.transport.requests import Request
+import threading
+import time
 from ai_features import (
-    Profile,
-    generate_resume_sections,
     generate_resume_html,
-    recommend_jobs_for_user,
     score_answer_against_keywords,
     build_career_plan,
+    normalize_skills,
 )
+from matching_engine import MatchingEngine
+from job_search import create_search_backend, LikeSearchBackend
+from pagination import keyset_paginate, encode_cursor, decode_cursor, Page
+from activity_writer import ActivityOutbox
+from response_cache import create_response_cache, LocalCacheBackend, ResponseCache
+from resume_export import ROW_FIELDS, profile_from_row, iter_resume_zip, export_resumes
+from calendar_sync import CalendarSync, insert_events, DEFAULT_BATCH_URI
+from credential_store import CredentialStore, CredentialRefresher
+from slot_scheduling import parse_recurrence, expand, split_conflicts
+from interview_assignment import assign_slots
+from config import Config
+from db_engine import RoutingSQLAlchemy, engine_options, create_replica_engine, max_bind_parameters
+from request_metrics import RequestMetrics
+from request_profiler import RequestProfiler, CAPTURE_NAME
 
 app = Flask(__name__)
 app.debug = True
@@ -47,13 +65,115 @@ app.config['UPLOAD_FOLDER'] = 'static/uploads'
 app.config['MAX_CONTENT_LENGTH'] = 2 * 1024 * 1024  # 2MB
 app.config['ALLOWED_EXTENSIONS'] = {'pdf', 'doc', 'docx'}
 
+# List pages are keyset-paginated; ?per_page= may override up to MAX_PAGE_SIZE
+app.config['PAGE_SIZE'] = int(os.getenv('PAGE_SIZE', '25'))
+app.config['MAX_PAGE_SIZE'] = int(os.getenv('MAX_PAGE_SIZE', '100'))
+
+# Slot calendars load one window of ?days= days (SLOT_WINDOW_DAYS by default)
+# from ?start=. A slot lasts at most MAX_SLOT_HOURS, which bounds how far back
+# an overlap check has to look.
+app.config['SLOT_WINDOW_DAYS'] = int(os.getenv('SLOT_WINDOW_DAYS', '14'))
+app.config['MAX_SLOT_WINDOW_DAYS'] = int(os.getenv('MAX_SLOT_WINDOW_DAYS', '92'))
+app.config['MAX_SLOT_HOURS'] = int(os.getenv('MAX_SLOT_HOURS', '24'))
+
+# Activities are written in the request's own commit by default. With
+# ACTIVITY_OUTBOX=1 they are queued and bulk-inserted by a background worker
+# instead, at most ACTIVITY_OUTBOX_LATENCY seconds after being created.
+app.config['ACTIVITY_OUTBOX'] = os.getenv('ACTIVITY_OUTBOX', '0') == '1'
+app.config['ACTIVITY_OUTBOX_BATCH'] = int(os.getenv('ACTIVITY_OUTBOX_BATCH', '500'))
+app.config['ACTIVITY_OUTBOX_LATENCY'] = float(os.getenv('ACTIVITY_OUTBOX_LATENCY', '0.5'))
+
+# Rendered /jobs and /job/<id> responses are cached for RESPONSE_CACHE_TTL seconds
+# in a RESPONSE_CACHE_SIZE-entry LRU per process, backed by Redis when
+# RESPONSE_CACHE_URL is set and by an in-process stand-in otherwise.
+app.config['RESPONSE_CACHE'] = os.getenv('RESPONSE_CACHE', '1') == '1'
+app.config['RESPONSE_CACHE_TTL'] = float(os.getenv('RESPONSE_CACHE_TTL', '60'))
+app.config['RESPONSE_CACHE_SIZE'] = int(os.getenv('RESPONSE_CACHE_SIZE', '1024'))
+app.config['RESPONSE_CACHE_URL'] = os.getenv('RESPONSE_CACHE_URL')
+
+# Worker processes used when an employer downloads all resumes for a job
+app.config['RESUME_EXPORT_WORKERS'] = int(os.getenv('RESUME_EXPORT_WORKERS', '1'))
+app.config['RESUME_EXPORT_CHUNK'] = int(os.getenv('RESUME_EXPORT_CHUNK', '200'))
+
+# Google Calendar inserts go through the batch endpoint. With CALENDAR_SYNC_ASYNC=1
+# the scheduling request only queues the event; a background worker sends what
+# arrives within CALENDAR_SYNC_LATENCY seconds, batched per employer, retrying
+# rate limits with backoff. Otherwise the request makes one attempt, and an
+# HTTP call gives up after CALENDAR_TIMEOUT seconds.
+app.config['CALENDAR_BATCH_URI'] = os.getenv('CALENDAR_BATCH_URI', DEFAULT_BATCH_URI)
+app.config['CALENDAR_SYNC_ASYNC'] = os.getenv('CALENDAR_SYNC_ASYNC', '0') == '1'
+app.config['CALENDAR_SYNC_LATENCY'] = float(os.getenv('CALENDAR_SYNC_LATENCY', '0.5'))
+app.config['CALENDAR_TIMEOUT'] = float(os.getenv('CALENDAR_TIMEOUT', '5'))
+
+# Google OAuth credentials live encrypted in CalendarCredential (key:
+# CALENDAR_CREDENTIAL_KEY, a Fernet key or passphrase; in production, reading
+# or saving credentials without it fails, elsewhere it falls back to SECRET_KEY
+# with a warning; credentials stored under one key cannot be read with
+# another), cached per process for CALENDAR_CREDENTIAL_TTL seconds. A background
+# thread refreshes tokens expiring within CALENDAR_REFRESH_MARGIN seconds.
+app.config['CALENDAR_CREDENTIAL_KEY'] = os.getenv('CALENDAR_CREDENTIAL_KEY')
+app.config['CALENDAR_CREDENTIAL_TTL'] = float(os.getenv('CALENDAR_CREDENTIAL_TTL', '300'))
+app.config['CALENDAR_REFRESH_MARGIN'] = float(os.getenv('CALENDAR_REFRESH_MARGIN', '300'))
+app.config['CALENDAR_REFRESH_INTERVAL'] = float(os.getenv('CALENDAR_REFRESH_INTERVAL', '60'))
+
+# Per-endpoint latency, SQL statement counts/time and driver-reported rows are
+# collected when METRICS=1 and served in Prometheus text format on /metrics,
+# which answers 404 unless METRICS_TOKEN is set and the scraper sends
+# "Authorization: Bearer METRICS_TOKEN". There is no loopback exception: behind
+# a reverse proxy on the same host every request arrives from 127.0.0.1, and
+# X-Forwarded-For is client-controlled. With several worker processes, point
+# METRICS_DIR at a directory they share: each writes its totals there every
+# METRICS_FLUSH_SECONDS and /metrics adds them up.
+app.config['METRICS'] = os.getenv('METRICS', '1') == '1'
+app.config['METRICS_TOKEN'] = os.getenv('METRICS_TOKEN')
+app.config['METRICS_DIR'] = os.getenv('METRICS_DIR')
+app.config['METRICS_FLUSH_SECONDS'] = float(os.getenv('METRICS_FLUSH_SECONDS', '5'))
+
+# Users whose email is listed here (comma-separated) can open the /admin pages
+app.config['ADMIN_EMAILS'] = {e.strip().lower() for e in os.getenv('ADMIN_EMAILS', '').split(',') if e.strip()}
+
+# Sampling profiler, off unless PROFILING=1: the stacks of a profiled request
+# are sampled every PROFILE_INTERVAL_MS. Requests are profiled at
+# PROFILE_SAMPLE_RATE (a fraction), always when their endpoint is in
+# PROFILE_ENDPOINTS (comma-separated), and on demand with an "X-Profile: 1"
+# header from a logged-in admin (the header alone triggers nothing). The newest
+# PROFILE_KEEP captures stay in PROFILE_DIR, listed on /admin/profiles.
+app.config['PROFILING'] = os.getenv('PROFILING', '0') == '1'
+app.config['PROFILE_SAMPLE_RATE'] = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+app.config['PROFILE_ENDPOINTS'] = {e.strip() for e in os.getenv('PROFILE_ENDPOINTS', '').split(',') if e.strip()}
+app.config['PROFILE_INTERVAL_MS'] = float(os.getenv('PROFILE_INTERVAL_MS', '5'))
+app.config['PROFILE_DIR'] = os.getenv('PROFILE_DIR', 'logs/profiles')
+app.config['PROFILE_KEEP'] = int(os.getenv('PROFILE_KEEP', '100'))
+
 # Session security hardening
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 app.config['SESSION_COOKIE_SECURE'] = True if os.getenv('FLASK_ENV') == 'production' else False
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=1)
 
-db = SQLAlchemy(app)
+# Engine tuning (SQLite pragmas, pool sizing, pre-ping) comes from config.Config
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'], Config)
+# With DATABASE_REPLICA_URL set, GET requests to REPLICA_ENDPOINTS read from the
+# replica, except for REPLICA_STICKY_SECONDS after the same browser session wrote.
+# Views behind cached_page always read from the primary: a lagging replica's
+# page would be cached under the new generation and served to everyone.
+app.config['DATABASE_REPLICA_URL'] = Config.DATABASE_REPLICA_URL
+app.config['REPLICA_STICKY_SECONDS'] = Config.REPLICA_STICKY_SECONDS
+REPLICA_ENDPOINTS = {'results', 'dashboard', 'employer_dashboard', 'analytics'}
+
+db = RoutingSQLAlchemy(app, engine_config=Config)
+
+# Number of matches shown on the AI job matching page (/results is paginated)
+JOB_MATCH_LIMIT = int(os.getenv('JOB_MATCH_LIMIT', '50'))
+# Seconds between checks for jobs that other worker processes have posted
+MATCHING_REFRESH_SECONDS = float(os.getenv('MATCHING_REFRESH_SECONDS', '30'))
+# Skill names kept in learning_resource_cache, least recently used evicted first
+LEARNING_RESOURCE_CACHE_SIZE = int(os.getenv('LEARNING_RESOURCE_CACHE_SIZE', '4096'))
+# Seconds a cached skill's learning resources are served before being read
+# again; bounds how stale other workers get when the response cache is local
+LEARNING_RESOURCE_CACHE_TTL = float(os.getenv('LEARNING_RESOURCE_CACHE_TTL', '300'))
+# Maximum number of ranked hits returned by a /jobs full-text search
+SEARCH_RESULTS_LIMIT = int(os.getenv('SEARCH_RESULTS_LIMIT', '200'))
 
 
 # Database Models
@@ -92,6 +212,10 @@ class Job(db.Model):
     date_posted = db.Column(db.DateTime, default=datetime.utcnow)
     employer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     applications = db.relationship('Application', backref='job', lazy=True)
+    __table_args__ = (
+        db.Index('ix_job_date_posted_id', 'date_posted', 'id'),  # /jobs keyset order
+        db.Index('ix_job_employer_id_date_posted', 'employer_id', 'date_posted'),
+    )
 
 
 class Application(db.Model):
@@ -103,6 +227,10 @@ class Application(db.Model):
     cover_letter = db.Column(db.Text)
     date_applied = db.Column(db.DateTime, default=datetime.utcnow)
     interview_date = db.Column(db.DateTime)
+    __table_args__ = (
+        db.Index('ix_application_job_id_status', 'job_id', 'status'),
+        db.Index('ix_application_user_id', 'user_id'),
+    )
 
 
 class Activity(db.Model):
@@ -114,6 +242,28 @@ class Activity(db.Model):
     is_read = db.Column(db.Boolean, default=False)
 
 
+# Serves every per-user feed query: newest first, keyset on (date, id)
+activity_feed_index = db.Index('ix_activity_user_id_date_id', Activity.user_id, Activity.date.desc(), Activity.id.desc())
+
+
+class ActivityUnreadCount(db.Model):
+    """Denormalized number of unread activities per user, read for the navbar badge."""
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class CalendarCredential(db.Model):
+    """A user's Google OAuth credentials, Fernet-encrypted; expiry is kept in clear for the refresher."""
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    encrypted_credentials = db.Column(db.LargeBinary, nullable=False)
+    expiry = db.Column(db.DateTime)
+    refreshable = db.Column(db.Boolean, nullable=False, default=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (
+        db.Index('ix_calendar_credential_refreshable_expiry', 'refreshable', 'expiry'),
+    )
+
+
 class InterviewSlot(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     employer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -122,6 +272,11 @@ class InterviewSlot(db.Model):
     is_booked = db.Column(db.Boolean, default=False)
 
 
+# Calendar views and conflict checks read one employer's slots by time window
+interview_slot_window_index = db.Index('ix_interview_slot_employer_id_start_time',
+                                       InterviewSlot.employer_id, InterviewSlot.start_time)
+
+
 class Interview(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     slot_id = db.Column(db.Integer, db.ForeignKey('interview_slot.id'), nullable=False)
@@ -131,6 +286,11 @@ class Interview(db.Model):
     meeting_link = db.Column(db.String(200))
     application = db.relationship('Application', backref='interviews')
     slot = db.relationship('InterviewSlot', backref='interviews')
+    __table_args__ = (db.Index('ix_interview_application_id', 'application_id'),)
+
+
+# A slot holds at most one interview, whatever races the booking path loses
+interview_slot_unique_index = db.Index('uq_interview_slot_id', Interview.slot_id, unique=True)
 
 
 class Skill(db.Model):
@@ -138,6 +298,32 @@ class Skill(db.Model):
     name = db.Column(db.String(100), unique=True, nullable=False)
 
 
+# Skill names are matched case-insensitively, so index lower(name) as well
+skill_name_lower_index = db.Index('ix_skill_name_lower', db.func.lower(Skill.name))
+
+
+class JobSkill(db.Model):
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skill.id'), primary_key=True)
+    job = db.relationship('Job', backref='job_skills')
+    skill = db.relationship('Skill', backref='job_skills')
+    __table_args__ = (
+        db.Index('ix_job_skill_skill_id_job_id', 'skill_id', 'job_id'),
+    )
+
+
+class JobContentHash(db.Model):
+    """SHA-1 of a job's normalized content, used by the CSV importer to skip duplicates."""
+    content_hash = db.Column(db.String(40), primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False, index=True)
+
+
+def job_content_hash(title, company, description, required_skills, location, salary):
+    """Hash of the fields that identify a posting; case and surrounding whitespace are ignored."""
+    parts = [(value or '').strip().lower() for value in (title, company, description, required_skills, location, salary)]
+    return hashlib.sha1('\x1f'.join(parts).encode()).hexdigest()
+
+
 class UserSkill(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -145,6 +331,7 @@ class UserSkill(db.Model):
     is_verified = db.Column(db.Boolean, default=False)
     user = db.relationship('User', backref='user_skills')
     skill = db.relationship('Skill', backref='user_skills')
+    __table_args__ = (db.Index('ix_user_skill_user_id', 'user_id'),)
 
 
 class PortfolioLink(db.Model):
@@ -153,6 +340,7 @@ class PortfolioLink(db.Model):
     url = db.Column(db.String(200), nullable=False)
     description = db.Column(db.String(200))
     user = db.relationship('User', backref='portfolio_links')
+    __table_args__ = (db.Index('ix_portfolio_link_user_id', 'user_id'),)
 
 
 class LearningResource(db.Model):
@@ -162,37 +350,995 @@ class LearningResource(db.Model):
     url = db.Column(db.String(200), nullable=False)
     resource_type = db.Column(db.String(50))  # e.g., 'Course', 'Certification', 'Article'
     skill = db.relationship('Skill', backref='learning_resources')
+    __table_args__ = (db.Index('ix_learning_resource_skill_id', 'skill_id'),)
+
+
+class JobStatusCount(db.Model):
+    """Denormalized number of applications per job and status."""
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class EmployerStatusCount(db.Model):
+    """Denormalized number of applications per employer and status."""
+    employer_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class ApplicationStatusEvent(db.Model):
+    """Append-only log of application status transitions; from_status is NULL on apply."""
+    id = db.Column(db.Integer, primary_key=True)
+    application_id = db.Column(db.Integer, db.ForeignKey('application.id'), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False)
+    employer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    from_status = db.Column(db.String(20))
+    to_status = db.Column(db.String(20), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    seconds_in_previous = db.Column(db.Integer)  # time spent in from_status
+    __table_args__ = (
+        db.Index('ix_application_status_event_application_id_created_at', 'application_id', 'created_at'),
+    )
+
+
+class JobDailyRollup(db.Model):
+    """Per-day, per-job funnel: entries into and exits from each status, and time spent in it."""
+    day = db.Column(db.Date, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    entered = db.Column(db.Integer, nullable=False, default=0)
+    exited = db.Column(db.Integer, nullable=False, default=0)  # timed exits only
+    seconds_in_stage = db.Column(db.BigInteger, nullable=False, default=0)
+    __table_args__ = (db.Index('ix_job_daily_rollup_job_id_day', 'job_id', 'day'),)
+
+
+class EmployerDailyRollup(db.Model):
+    """Per-day, per-employer funnel, the sum of the employer's JobDailyRollup rows."""
+    day = db.Column(db.Date, primary_key=True)
+    employer_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    entered = db.Column(db.Integer, nullable=False, default=0)
+    exited = db.Column(db.Integer, nullable=False, default=0)
+    seconds_in_stage = db.Column(db.BigInteger, nullable=False, default=0)
+    __table_args__ = (db.Index('ix_employer_daily_rollup_employer_id_day', 'employer_id', 'day'),)
+
+
+# In-process sparse job x skill matrix used for all job matching
+matching_engine = MatchingEngine()
+# When get_matching_engine() last looked for new jobs, the job id it looked
+# after, and the highest id it has loaded
+matching_engine_sync = {'checked': 0.0, 'after': 0, 'newest': 0}
+# Full-text job search backend, chosen from the database dialect on first use
+search_backend = None
+# Lowercased skill name -> (its first three learning resources as plain dicts,
+# expiry time), an LRU of LEARNING_RESOURCE_CACHE_SIZE names (they come from
+# user input). Skill and LearningResource writes bump the response cache's
+# 'learning_resources' generation; a worker seeing a new generation drops its
+# entries, see get_learning_resources().
+learning_resource_cache = OrderedDict()
+learning_resource_lock = threading.Lock()
+learning_resource_sync = {'generation': 0}
+# Rendered job listing/detail pages, see cached_page()
+response_cache = None
+# Engine for DATABASE_REPLICA_URL, created on first use
+read_replica = None
+# Per-request stack sampling, see profile_trigger()
+request_profiler = RequestProfiler(
+    app.config['PROFILE_DIR'],
+    keep=app.config['PROFILE_KEEP'],
+    interval=app.config['PROFILE_INTERVAL_MS'] / 1000,
+) if app.config['PROFILING'] else None
+# Request and SQL counters behind /metrics
+request_metrics = RequestMetrics(
+    directory=app.config['METRICS_DIR'],
+    flush_interval=app.config['METRICS_FLUSH_SECONDS'],
+) if app.config['METRICS'] else None
 
 
 # Helper Functions
+def get_matching_engine():
+    """Return the process-wide matching engine, building it from the Job table on first use.
+
+    Every MATCHING_REFRESH_SECONDS it also loads jobs posted through other
+    worker processes. Each check starts after the newest id seen one check
+    earlier, so a job whose insert committed after a higher id's is still
+    picked up; jobs already loaded are skipped.
+    """
+    sync = matching_engine_sync
+    now = time.monotonic()
+    rows = db.session.query(Job.id, Job.required_skills, Job.location)
+    if not matching_engine.loaded:
+        matching_engine.load(rows.yield_per(1000))
+        newest = max(matching_engine.index.job_ids(), default=0)
+        sync.update(checked=now, after=newest, newest=newest)
+    elif now - sync['checked'] >= MATCHING_REFRESH_SECONDS:
+        newest = matching_engine.extend(rows.filter(Job.id > sync['after']).order_by(Job.id))
+        sync.update(checked=now, after=sync['newest'], newest=max(sync['newest'], newest or 0))
+    return matching_engine
+
+
+def get_search_backend():
+    """Return the full-text search backend, installing its index structures on first use."""
+    global search_backend
+    if search_backend is None:
+        backend = create_search_backend(db.engine)
+        try:
+            backend.install()
+        except Exception as e:
+            app.logger.warning('Full-text search unavailable, falling back to ilike: %s', e)
+            backend = LikeSearchBackend(db.engine)
+        search_backend = backend
+    return search_backend
+
+
+def get_response_cache():
+    """Return the response cache, falling back to the local stand-in if the shared one is unreachable."""
+    global response_cache
+    if response_cache is None:
+        max_entries, ttl = app.config['RESPONSE_CACHE_SIZE'], app.config['RESPONSE_CACHE_TTL']
+        try:
+            response_cache = create_response_cache(app.config['RESPONSE_CACHE_URL'], max_entries, ttl)
+            response_cache.generation('jobs')
+        except Exception as e:
+            app.logger.warning('Shared response cache unavailable, using the local one: %s', e)
+            response_cache = ResponseCache(LocalCacheBackend(max_entries), max_entries, ttl)
+    return response_cache
+
+
+def get_read_replica():
+    """Return the read replica engine, or None when no replica is configured."""
+    global read_replica
+    if read_replica is None and app.config['DATABASE_REPLICA_URL']:
+        read_replica = create_replica_engine(db.engine, app.config['DATABASE_REPLICA_URL'], Config)
+    return read_replica
+
+
+@app.before_request
+def start_request_metrics():
+    # Registered first, so the timing includes every other hook
+    if request_metrics is not None:
+        request_metrics.start_request()
+
+
+@app.after_request
+def record_response_status(response):
+    if request_metrics is not None:
+        request_metrics.set_status(response.status_code)
+    return response
+
+
+@app.teardown_request
+def finish_request_metrics(exc):
+    if request_metrics is not None:
+        request_metrics.finish_request(request.endpoint or 'unmatched', request.method)
+
+
+@db.event.listens_for(Engine, 'before_cursor_execute')
+def _start_statement_metrics(*args):
+    if request_metrics is not None:
+        request_metrics.before_cursor_execute(*args)
+
+
+@db.event.listens_for(Engine, 'after_cursor_execute')
+def _finish_statement_metrics(*args):
+    if request_metrics is not None:
+        request_metrics.after_cursor_execute(*args)
+
+
+def is_admin():
+    if 'user_id' not in session or not app.config['ADMIN_EMAILS']:
+        return False
+    user = User.query.get(session['user_id'])
+    return user is not None and user.email.lower() in app.config['ADMIN_EMAILS']
+
+
+def profile_trigger():
+    """Why the current request should be profiled, or None."""
+    if request.headers.get('X-Profile') == '1' and is_admin():
+        return 'header'
+    if request.endpoint in app.config['PROFILE_ENDPOINTS']:
+        return 'endpoint'
+    rate = app.config['PROFILE_SAMPLE_RATE']
+    if rate and random.random() < rate:
+        return 'sampled'
+    return None
+
+
+@app.before_request
+def start_profile():
+    if request_profiler is None:
+        return
+    trigger = profile_trigger()
+    if trigger:
+        g.profile = request_profiler.start(request.endpoint, trigger)
+
+
+@app.after_request
+def tag_profile(response):
+    capture = g.get('profile')
+    if capture is not None:
+        capture.status = response.status_code
+        if capture.trigger == 'header':
+            response.headers['X-Profile-Id'] = capture.name
+    return response
+
+
+@app.teardown_request
+def finish_profile(exc):
+    capture = g.pop('profile', None)
+    if capture is not None:
+        request_profiler.finish(capture, {'endpoint': request.endpoint, 'method': request.method,
+                                          'path': request.full_path.rstrip('?'),
+                                          'error': repr(exc) if exc is not None else None})
+
+
+@app.before_request
+def route_reads_to_replica():
+    if request.method != 'GET' or request.endpoint not in REPLICA_ENDPOINTS:
+        return
+    if getattr(app.view_functions.get(request.endpoint), 'response_cached', False):
+        return
+    if session.get('primary_until', 0) > datetime.utcnow().timestamp():
+        return
+    replica = get_read_replica()
+    if replica is not None:
+        db.session.info['replica'] = replica
+
+
+@db.event.listens_for(db.session, 'after_commit')
+def _note_request_write(session):
+    if has_request_context():
+        g.database_written = True
+
+
+@app.after_request
+def stick_writers_to_primary(response):
+    # Replicas lag a little; keep a browser that just wrote on the primary so it sees its own changes
+    if g.get('database_written') and app.config['DATABASE_REPLICA_URL']:
+        session['primary_until'] = datetime.utcnow().timestamp() + app.config['REPLICA_STICKY_SECONDS']
+    return response
+
+
+def invalidate_after_commit(*namespaces):
+    """Bump response-cache namespaces once the current transaction commits."""
+    db.session.info.setdefault('response_cache_bumps', set()).update(namespaces)
+
+
+def invalidate_job_pages():
+    """Drop every cached /jobs and /job/<id> response right away (for writers outside the ORM session)."""
+    if app.config['RESPONSE_CACHE']:
+        get_response_cache().bump('jobs')
+
+
+@db.event.listens_for(db.session, 'before_flush')
+def _collect_response_cache_bumps(session, flush_context, instances):
+    # Any job write invalidates the job pages; a user's own writes invalidate
+    # the pages rendered for them (match percentages, unread badge); skill and
+    # learning resource writes invalidate every worker's learning_resource_cache.
+    bumps = session.info.setdefault('response_cache_bumps', set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, (Job, JobSkill)):
+            bumps.add('jobs')
+        elif isinstance(obj, User):
+            bumps.add(f'viewer:{obj.id}')
+        elif isinstance(obj, (UserSkill, Activity)):
+            bumps.add(f'viewer:{obj.user_id}')
+        if isinstance(obj, (Skill, LearningResource)):
+            bumps.add('learning_resources')
+
+
+@db.event.listens_for(db.session, 'after_bulk_update')
+@db.event.listens_for(db.session, 'after_bulk_delete')
+def _collect_bulk_response_cache_bumps(context):
+    # Query.update()/delete() bypass the flush
+    if context.mapper.class_ in (Job, JobSkill):
+        context.session.info.setdefault('response_cache_bumps', set()).add('jobs')
+    elif context.mapper.class_ in (Skill, LearningResource):
+        context.session.info.setdefault('response_cache_bumps', set()).add('learning_resources')
+
+
+@db.event.listens_for(db.session, 'after_commit')
+def _apply_response_cache_bumps(session):
+    bumps = session.info.pop('response_cache_bumps', None)
+    if bumps and app.config['RESPONSE_CACHE']:
+        cache = get_response_cache()
+        for namespace in bumps:
+            cache.bump(namespace)
+
+
+@db.event.listens_for(db.session, 'after_rollback')
+def _discard_response_cache_bumps(session):
+    session.info.pop('response_cache_bumps', None)
+
+
+def cache_viewer_class():
+    """Cache partition for the current request, or None when the page must not be cached.
+
+    Anonymous visitors share one partition. Seekers' pages carry their match
+    percentage and unread badge, so each seeker gets their own, invalidated
+    by writes to their profile and activities. Employer pages are not cached.
+    """
+    if 'user_id' not in session:
+        return 'anonymous'
+    if session.get('is_employer'):
+        return None
+    return f"seeker:{session['user_id']}"
+
+
+def cached_page(view):
+    """Serve a GET view from the response cache, with ETag/Last-Modified for conditional GETs.
+
+    The key is the route, the sorted query string and the viewer class; a
+    matching If-None-Match or If-Modified-Since is answered with 304 straight
+    from the cached entry, without running the view.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        viewer = cache_viewer_class()
+        # Pending flash messages are rendered into (and consumed by) the page
+        if not app.config['RESPONSE_CACHE'] or viewer is None or '_flashes' in session:
+            return view(*args, **kwargs)
+        cache = get_response_cache()
+        namespaces = ['jobs'] if viewer == 'anonymous' else ['jobs', 'viewer:' + viewer.split(':', 1)[1]]
+        query_string = sorted(request.args.items(multi=True))
+        key = cache.key(request.path, query_string, viewer, namespaces=namespaces)
+        entry = cache.get(key)
+        if entry is None:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            entry = cache.set(key, response.get_data(as_text=True), response.content_type)
+        response = app.response_class(entry['body'], content_type=entry['content_type'])
+        response.set_etag(entry['etag'])
+        response.last_modified = datetime.utcfromtimestamp(int(entry['stored_at']))
+        response.cache_control.no_cache = True
+        if viewer == 'anonymous':
+            response.cache_control.public = True
+        else:
+            response.cache_control.private = True
+        response.vary.add('Cookie')
+        return response.make_conditional(request)
+    wrapper.response_cached = True  # keeps route_reads_to_replica() off this view
+    return wrapper
+
+
+def resume_export_query(job_id=None):
+    """User rows (in ROW_FIELDS order) for a job's applicants, or every job seeker without a job.
+
+    An applicant who applied to the job more than once is still one row.
+    """
+    query = db.session.query(*[getattr(User, field) for field in ROW_FIELDS])
+    if job_id is not None:
+        return query.filter(User.id.in_(db.session.query(Application.user_id).filter(Application.job_id == job_id)))
+    return query.filter(db.or_(User.is_employer.is_(False), User.is_employer.is_(None)))
+
+
+def resume_export_rows(job_id=None, chunk_size=200):
+    """Stream resume_export_query() in keyset chunks on User.id, for iter_resume_zip()."""
+    last_id = 0
+    while True:
+        rows = resume_export_query(job_id).filter(User.id > last_id).order_by(User.id).limit(chunk_size).all()
+        if not rows:
+            return
+        yield [tuple(row) for row in rows]
+        last_id = rows[-1][0]
+
+
+def clear_learning_resource_cache():
+    """Drop this worker's cached learning resources (others follow the generation bump)."""
+    with learning_resource_lock:
+        learning_resource_cache.clear()
+
+
+def get_learning_resources(skill_names):
+    """Map lowercased skill names to up to three learning resources each.
+
+    Names missing from learning_resource_cache (or expired, or cached under an
+    older 'learning_resources' generation) are fetched together in one
+    windowed query per 500 names instead of two queries per skill.
+    """
+    names = {name.lower() for name in skill_names}
+    resources = {}
+    generation = get_response_cache().generation('learning_resources') if app.config['RESPONSE_CACHE'] else 0
+    now = time.monotonic()
+    with learning_resource_lock:
+        if generation != learning_resource_sync['generation']:
+            learning_resource_cache.clear()
+            learning_resource_sync['generation'] = generation
+        for name in names:
+            item = learning_resource_cache.get(name)
+            if item is None:
+                continue
+            if item[1] <= now:
+                del learning_resource_cache[name]
+                continue
+            learning_resource_cache.move_to_end(name)
+            resources[name] = item[0]
+    missing = [name for name in names if name not in resources]
+    for start in range(0, len(missing), 500):
+        chunk = missing[start:start + 500]
+        skill_name = db.func.lower(Skill.name)
+        ranked = db.session.query(
+            skill_name.label('skill_name'),
+            LearningResource.id,
+            LearningResource.title,
+            LearningResource.url,
+            LearningResource.resource_type,
+            db.func.row_number().over(partition_by=skill_name, order_by=LearningResource.id).label('position'),
+        ).join(Skill, LearningResource.skill_id == Skill.id).filter(skill_name.in_(chunk)).subquery()
+        found = {name: [] for name in chunk}
+        rows = db.session.query(ranked).filter(ranked.c.position <= 3).\
+            order_by(ranked.c.skill_name, ranked.c.position)
+        for row in rows:
+            found[row.skill_name].append({
+                'id': row.id,
+                'title': row.title,
+                'url': row.url,
+                'resource_type': row.resource_type,
+            })
+        resources.update(found)
+        expires = time.monotonic() + LEARNING_RESOURCE_CACHE_TTL
+        with learning_resource_lock:
+            learning_resource_cache.update((name, (found[name], expires)) for name in found)
+            while len(learning_resource_cache) > LEARNING_RESOURCE_CACHE_SIZE:
+                learning_resource_cache.popitem(last=False)
+    return {name: resources.get(name, []) for name in names}
+
+
+def page_args():
+    """Cursor and page size requested through ?cursor= and ?per_page=."""
+    try:
+        page_size = int(request.args.get('per_page', app.config['PAGE_SIZE']))
+    except ValueError:
+        page_size = app.config['PAGE_SIZE']
+    page_size = max(1, min(page_size, app.config['MAX_PAGE_SIZE']))
+    return request.args.get('cursor'), page_size
+
+
+def user_skill_names(user):
+    """Skill names from the user's UserSkill rows, falling back to the free-text skills field."""
+    if user.user_skills:
+        return [user_skill.skill.name for user_skill in user.user_skills]
+    return normalize_skills(user.skills or '')
+
+
+def parse_skill_names(skills_text):
+    """Split a comma-separated skills string, keeping the original casing."""
+    return [s.strip() for s in (skills_text or '').split(',') if s.strip()]
+
+
+def find_skill(name):
+    """Case-insensitive Skill lookup backed by ix_skill_name_lower."""
+    return Skill.query.filter(db.func.lower(Skill.name) == name.strip().lower()).order_by(Skill.id).first()
+
+
+def get_skill_ids(names):
+    """Map lowercased skill names to Skill ids, creating any missing Skill rows."""
+    wanted = {}
+    for name in names:
+        wanted.setdefault(name.strip().lower(), name.strip())
+    wanted.pop('', None)
+
+    skill_ids = {}
+    keys = list(wanted)
+    for start in range(0, len(keys), 500):
+        rows = db.session.query(Skill.id, Skill.name).\
+            filter(db.func.lower(Skill.name).in_(keys[start:start + 500])).\
+            order_by(Skill.id)
+        for skill_id, name in rows:
+            skill_ids.setdefault(name.lower(), skill_id)
+
+    new_skills = [Skill(name=wanted[key]) for key in keys if key not in skill_ids]
+    if new_skills:
+        db.session.add_all(new_skills)
+        db.session.flush()
+        for skill in new_skills:
+            skill_ids[skill.name.lower()] = skill.id
+    return skill_ids
+
+
+def sync_job_skills(jobs):
+    """Replace the JobSkill rows of flushed jobs with their parsed required_skills."""
+    jobs = list(jobs)
+    for start in range(0, len(jobs), 500):
+        parsed = {job.id: parse_skill_names(job.required_skills) for job in jobs[start:start + 500]}
+        skill_ids = get_skill_ids(name for names in parsed.values() for name in names)
+        JobSkill.query.filter(JobSkill.job_id.in_(list(parsed))).delete(synchronize_session=False)
+        rows = [
+            {'job_id': job_id, 'skill_id': skill_id}
+            for job_id, names in parsed.items()
+            for skill_id in {skill_ids[name.lower()] for name in names}
+        ]
+        if rows:
+            db.session.execute(JobSkill.__table__.insert(), rows)
+
+
 def allowed_file(filename, allowed_extensions=None):
     if allowed_extensions is None:
         allowed_extensions = app.config['ALLOWED_EXTENSIONS']
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in allowed_extensions
 
 
+def rows_per_statement(params_per_row):
+    """Rows per multi-row INSERT, or ids per IN list, that fit the database's bind parameter limit."""
+    return max(1, max_bind_parameters(db.engine.dialect) // params_per_row)
+
+
+def _increment(model, keys, **deltas):
+    """Add deltas to the counter columns of a row, creating it if needed, in a single upsert.
+
+    Columns never go below zero: decrementing a missing row, or one that has
+    not been reconciled yet, stops at 0 instead of storing a negative count.
+    """
+    table = model.__table__
+    initial = {column: max(delta, 0) for column, delta in deltas.items()}
+    updated = {}
+    for column, delta in deltas.items():
+        value = table.c[column] + delta
+        updated[column] = db.case((value < 0, 0), else_=value) if delta < 0 else value
+    dialect = db.engine.dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table).values(**keys, **initial).on_conflict_do_update(
+            index_elements=list(keys), set_=updated)
+        db.session.execute(stmt)
+        return
+    condition = db.and_(*[table.c[key] == value for key, value in keys.items()])
+    result = db.session.execute(table.update().where(condition).values(**updated))
+    if result.rowcount == 0:
+        db.session.execute(table.insert().values(**keys, **initial))
+
+
+def record_status_change(application, old_status, new_status, job=None):
+    """Log an application status transition and update the counters and daily rollups.
+
+    Call with old_status=None for a new application. Runs in the caller's
+    transaction, so the event, counters and rollups commit (or roll back)
+    with the status change itself.
+    """
+    if old_status == new_status:
+        return
+    job = job or Job.query.get(application.job_id)
+    if application.id is None:
+        db.session.flush()
+    now = datetime.utcnow()
+
+    seconds_in_previous = None
+    if old_status is not None:
+        last_change = db.session.query(ApplicationStatusEvent.created_at).\
+            filter(ApplicationStatusEvent.application_id == application.id).\
+            order_by(ApplicationStatusEvent.created_at.desc()).first()
+        entered_at = last_change[0] if last_change else application.date_applied
+        if entered_at:
+            seconds_in_previous = max(0, int((now - entered_at).total_seconds()))
+
+    db.session.add(ApplicationStatusEvent(
+        application_id=application.id,
+        job_id=job.id,
+        employer_id=job.employer_id,
+        from_status=old_status,
+        to_status=new_status,
+        created_at=now,
+        seconds_in_previous=seconds_in_previous,
+    ))
+
+    owners = ((JobStatusCount, JobDailyRollup, {'job_id': job.id}),
+              (EmployerStatusCount, EmployerDailyRollup, {'employer_id': job.employer_id}))
+    for counter, rollup, owner in owners:
+        _increment(counter, dict(owner, status=new_status), count=1)
+        _increment(rollup, dict(owner, day=now.date(), status=new_status), entered=1)
+        if old_status is not None:
+            _increment(counter, dict(owner, status=old_status), count=-1)
+        if seconds_in_previous is not None:
+            _increment(rollup, dict(owner, day=now.date(), status=old_status),
+                       exited=1, seconds_in_stage=seconds_in_previous)
+
+
+def record_status_changes(applications, old_status, new_status, job):
+    """Bulk record_status_change for applications of ``job`` that all move from old_status to new_status.
+
+    One query finds when each entered old_status, one INSERT logs the events
+    and the counters and rollups get a single aggregated upsert each.
+    """
+    if not applications or old_status == new_status:
+        return
+    now = datetime.utcnow()
+    entered = {}
+    ids = [application.id for application in applications]
+    chunk_size = rows_per_statement(1)
+    for offset in range(0, len(ids), chunk_size):
+        entered.update(db.session.query(ApplicationStatusEvent.application_id,
+                                        db.func.max(ApplicationStatusEvent.created_at)).
+                       filter(ApplicationStatusEvent.application_id.in_(ids[offset:offset + chunk_size])).
+                       group_by(ApplicationStatusEvent.application_id))
+    events, timed, seconds = [], 0, 0
+    for application in applications:
+        entered_at = entered.get(application.id) or application.date_applied
+        seconds_in_previous = max(0, int((now - entered_at).total_seconds())) if entered_at else None
+        if seconds_in_previous is not None:
+            timed += 1
+            seconds += seconds_in_previous
+        events.append({
+            'application_id': application.id,
+            'job_id': job.id,
+            'employer_id': job.employer_id,
+            'from_status': old_status,
+            'to_status': new_status,
+            'created_at': now,
+            'seconds_in_previous': seconds_in_previous,
+        })
+    db.session.execute(ApplicationStatusEvent.__table__.insert(), events)
+
+    moved = len(applications)
+    owners = ((JobStatusCount, JobDailyRollup, {'job_id': job.id}),
+              (EmployerStatusCount, EmployerDailyRollup, {'employer_id': job.employer_id}))
+    for counter, rollup, owner in owners:
+        _increment(counter, dict(owner, status=new_status), count=moved)
+        _increment(rollup, dict(owner, day=now.date(), status=new_status), entered=moved)
+        _increment(counter, dict(owner, status=old_status), count=-moved)
+        if timed:
+            _increment(rollup, dict(owner, day=now.date(), status=old_status), exited=timed, seconds_in_stage=seconds)
+
+
+def book_interview_slot(application, slot_id, employer_id):
+    """Claim a free slot of ``employer_id`` and schedule the interview, in the caller's transaction.
+
+    The claim is a single conditional UPDATE, so of any number of concurrent
+    attempts on one slot exactly one matches the row; the others get None and
+    should roll back. uq_interview_slot_id enforces the same at commit.
+    """
+    claimed = InterviewSlot.query.filter(
+        InterviewSlot.id == slot_id,
+        InterviewSlot.employer_id == employer_id,
+        db.or_(InterviewSlot.is_booked.is_(False), InterviewSlot.is_booked.is_(None)),
+    ).update({InterviewSlot.is_booked: True}, synchronize_session=False)
+    if not claimed:
+        return None
+    interview = Interview(
+        slot_id=slot_id,
+        application_id=application.id,
+        meeting_link=f"https://meet.luminate.com/{slot_id}",  # Placeholder
+        notes=""
+    )
+    db.session.add(interview)
+    job = application.job
+    record_status_change(application, application.status, 'Interview Scheduled', job)
+    application.status = 'Interview Scheduled'
+    create_activity(application.user_id, f"Interview scheduled for {job.title}")
+    create_activity(job.employer_id, f"Interview scheduled with {application.applicant.name}", job.id)
+    return interview
+
+
+def bulk_schedule_interviews(job, status, availability=None, window_start=None, window_end=None):
+    """Schedule every ``status`` application of ``job`` without an interview into the employer's free slots.
+
+    Applications are served in the order they came in; ``availability`` maps
+    an application id to the (start, end) windows it can attend, and
+    applications without an entry can take any slot. interview_assignment
+    finds a maximum assignment, and the slot claims, Interview rows, status
+    changes and activities are all written in the caller's transaction.
+    Returns (scheduled [(application, slot)], unassigned applications), or
+    None if another request took a slot or moved an application meanwhile;
+    the caller should roll back and may retry.
+    """
+    window_start = max(window_start or datetime.utcnow(), datetime.utcnow())
+    applications = Application.query.filter(Application.job_id == job.id, Application.status == status,
+                                            ~Application.interviews.any()).\
+        order_by(Application.date_applied, Application.id).all()
+    slots = InterviewSlot.query.filter(
+        InterviewSlot.employer_id == job.employer_id,
+        InterviewSlot.start_time >= window_start,
+        InterviewSlot.is_booked.isnot(True),
+    )
+    if window_end is not None:
+        slots = slots.filter(InterviewSlot.start_time < window_end)
+    slots = slots.order_by(InterviewSlot.start_time, InterviewSlot.id).all()
+
+    assignment = assign_slots([application.id for application in applications],
+                              [(slot.start_time, slot.end_time) for slot in slots],
+                              {int(k): v for k, v in (availability or {}).items()})
+    scheduled = [(application, slots[assignment[application.id]])
+                 for application in applications if application.id in assignment]
+    unassigned = [application for application in applications if application.id not in assignment]
+    if not scheduled:
+        return scheduled, unassigned
+
+    slot_ids = [slot.id for _, slot in scheduled]
+    application_ids = [application.id for application, _ in scheduled]
+    # Sized for the 5-column Interview INSERT; the IN lists of the UPDATEs are shorter
+    chunk_size = rows_per_statement(5)
+    for offset in range(0, len(scheduled), chunk_size):
+        chunk = slice(offset, offset + chunk_size)
+        claimed = InterviewSlot.query.filter(InterviewSlot.id.in_(slot_ids[chunk]),
+                                             InterviewSlot.is_booked.isnot(True)).\
+            update({InterviewSlot.is_booked: True}, synchronize_session=False)
+        moved = Application.query.filter(Application.id.in_(application_ids[chunk]),
+                                         Application.status == status).\
+            update({Application.status: 'Interview Scheduled'}, synchronize_session=False)
+        if claimed != len(slot_ids[chunk]) or moved != len(application_ids[chunk]):
+            return None
+        db.session.execute(Interview.__table__.insert().values([{
+            'slot_id': slot.id,
+            'application_id': application.id,
+            'status': 'Scheduled',
+            'meeting_link': f"https://meet.luminate.com/{slot.id}",  # Placeholder
+            'notes': '',
+        } for application, slot in scheduled[chunk]]))
+
+    record_status_changes([application for application, _ in scheduled], status, 'Interview Scheduled', job)
+    create_activities([{'user_id': application.user_id, 'job_id': None,
+                        'message': f"Interview scheduled for {job.title}"} for application, _ in scheduled] +
+                      [{'user_id': job.employer_id, 'job_id': job.id,
+                        'message': f"Scheduled {len(scheduled)} interviews for {job.title}"}])
+    return scheduled, unassigned
+
+
+
+def interview_slots_between(employer_id, start, end):
+    """An employer's slots starting in [start, end), read through ix_interview_slot_employer_id_start_time."""
+    return InterviewSlot.query.filter(
+        InterviewSlot.employer_id == employer_id,
+        InterviewSlot.start_time >= start,
+        InterviewSlot.start_time < end,
+    ).order_by(InterviewSlot.start_time, InterviewSlot.id)
+
+
+def create_interview_slots(employer_id, intervals):
+    """Insert the (start, end) intervals that overlap no existing slot, in the caller's transaction.
+
+    Only the employer's slots near the span the intervals cover are loaded,
+    into an interval tree that every candidate is checked against; the
+    survivors go in as multi-row INSERTs sized by rows_per_statement().
+    Returns (number created, conflicting intervals).
+    """
+    if not intervals:
+        return 0, []
+    # Serialize slot writes per employer where the database has row locks (a no-op on SQLite)
+    db.session.query(User.id).filter(User.id == employer_id).with_for_update().first()
+    earliest = min(start for start, _ in intervals) - timedelta(hours=app.config['MAX_SLOT_HOURS'])
+    latest = max(end for _, end in intervals)
+    existing = db.session.query(InterviewSlot.start_time, InterviewSlot.end_time).filter(
+        InterviewSlot.employer_id == employer_id,
+        InterviewSlot.start_time > earliest,
+        InterviewSlot.start_time < latest,
+    )
+    accepted, conflicts = split_conflicts([tuple(row) for row in existing], intervals)
+    chunk_size = rows_per_statement(4)
+    for offset in range(0, len(accepted), chunk_size):
+        db.session.execute(InterviewSlot.__table__.insert().values([
+            {'employer_id': employer_id, 'start_time': start, 'end_time': end, 'is_booked': False}
+            for start, end in accepted[offset:offset + chunk_size]
+        ]))
+    return len(accepted), conflicts
+
+
+def slot_window_args():
+    """(start, end) of the calendar window from ?start=YYYY-MM-DD and ?days=, defaulting to from today."""
+    try:
+        start = datetime.strptime(request.args['start'], '%Y-%m-%d')
+    except (KeyError, ValueError):
+        start = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+    try:
+        days = int(request.args.get('days', app.config['SLOT_WINDOW_DAYS']))
+    except ValueError:
+        days = app.config['SLOT_WINDOW_DAYS']
+    days = max(1, min(days, app.config['MAX_SLOT_WINDOW_DAYS']))
+    return start, start + timedelta(days=days)
+
+
+def get_funnel(rollup, owner_column, owner_id, since):
+    """Summarize daily rollups since a date into per-status funnel figures.
+
+    Reads at most (days x statuses) rollup rows, independent of the number of
+    applications. Conversion is relative to the applications received.
+    """
+    rows = db.session.query(
+        rollup.status,
+        db.func.sum(rollup.entered),
+        db.func.sum(rollup.exited),
+        db.func.sum(rollup.seconds_in_stage),
+    ).filter(owner_column == owner_id, rollup.day >= since).group_by(rollup.status)
+    funnel = {}
+    for status, entered, exited, seconds in rows:
+        funnel[status] = {
+            'entered': int(entered or 0),
+            'exited': int(exited or 0),
+            'avg_hours_in_stage': round(int(seconds or 0) / exited / 3600, 1) if exited else None,
+        }
+    applied = funnel.get('Pending', {}).get('entered', 0)
+    for figures in funnel.values():
+        figures['conversion_rate'] = round(figures['entered'] / applied * 100, 1) if applied else 0.0
+    return funnel
+
+
+def get_employer_status_counts(employer_id):
+    """Application counts by status for one employer, read from EmployerStatusCount."""
+    rows = db.session.query(EmployerStatusCount.status, EmployerStatusCount.count).\
+        filter(EmployerStatusCount.employer_id == employer_id)
+    return {status: count for status, count in rows}
+
+
+def get_jobs_with_application_counts(employer_id):
+    """The employer's jobs paired with their total application count, in one query."""
+    total = db.func.coalesce(db.func.sum(JobStatusCount.count), 0)
+    return db.session.query(Job, total).\
+        outerjoin(JobStatusCount, JobStatusCount.job_id == Job.id).\
+        filter(Job.employer_id == employer_id).\
+        group_by(Job.id).\
+        order_by(Job.date_posted.desc()).all()
+
+
+def _insert_activity_rows(rows):
+    db.session.execute(Activity.__table__.insert(), rows)
+    unread = {}
+    for row in rows:
+        if not row.get('is_read'):
+            unread[row['user_id']] = unread.get(row['user_id'], 0) + 1
+    for user_id, count in unread.items():
+        _increment(ActivityUnreadCount, {'user_id': user_id}, count=count)
+    invalidate_after_commit(*(f'viewer:{user_id}' for user_id in unread))
+
+
+def _write_activity_batch(rows):
+    """Bulk-insert queued activity rows; runs on the outbox worker thread."""
+    with app.app_context():
+        _insert_activity_rows(rows)
+        db.session.commit()
+
+
+activity_outbox = ActivityOutbox(
+    _write_activity_batch,
+    max_batch=app.config['ACTIVITY_OUTBOX_BATCH'],
+    max_latency=app.config['ACTIVITY_OUTBOX_LATENCY'],
+) if app.config['ACTIVITY_OUTBOX'] else None
+
+
+@db.event.listens_for(db.session, 'after_commit')
+def _release_outbox_activities(session):
+    for row in session.info.pop('outbox_activities', ()):
+        activity_outbox.put(row)
+
+
+@db.event.listens_for(db.session, 'after_rollback')
+def _discard_outbox_activities(session):
+    session.info.pop('outbox_activities', None)
+
+
+# Authorized Calendar clients, reused across requests per user
+calendar_clients = CalendarClientPool(timeout=app.config['CALENDAR_TIMEOUT'])
+
+calendar_sync = CalendarSync(
+    calendar_clients.service,
+    max_latency=app.config['CALENDAR_SYNC_LATENCY'],
+    batch_uri=app.config['CALENDAR_BATCH_URI'],
+) if app.config['CALENDAR_SYNC_ASYNC'] else None
+
+
+def _calendar_sync_callback(employer_id, applicant_name, job_id):
+    """Report a queued calendar insert that could not be delivered, on the worker thread."""
+    def callback(result):
+        if result.ok:
+            return
+        app.logger.warning('Calendar insert for employer %s failed: %s', employer_id, result.error)
+        with app.app_context():
+            create_activity(employer_id, f"Could not add the interview with {applicant_name} to Google Calendar",
+                            job_id)
+            db.session.commit()
+    return callback
+
+
+credential_key = app.config['CALENDAR_CREDENTIAL_KEY']
+if not credential_key:
+    if os.getenv('FLASK_ENV') == 'production':
+        # Only Calendar features fail, when they read or save credentials
+        app.logger.warning('CALENDAR_CREDENTIAL_KEY is not set; Google Calendar credentials cannot be stored')
+    else:
+        app.logger.warning('CALENDAR_CREDENTIAL_KEY is not set; calendar credentials are encrypted with SECRET_KEY')
+        credential_key = app.config['SECRET_KEY']
+
+credential_store = CredentialStore(
+    db, CalendarCredential, credential_key,
+    ttl=app.config['CALENDAR_CREDENTIAL_TTL'],
+)
+credential_refresher = CredentialRefresher(
+    app, credential_store, refresh_credentials,
+    margin=app.config['CALENDAR_REFRESH_MARGIN'],
+    interval=app.config['CALENDAR_REFRESH_INTERVAL'],
+)
+
+
+def get_user_credentials(user_id):
+    """Stored Google credentials for a user (from the per-process cache when fresh)."""
+    credential_refresher.start()
+    return credential_store.get(user_id)
+
+
+def save_user_credentials(user_id, credentials):
+    credential_store.save(user_id, credentials)
+
+
+def delete_user_credentials(user_id):
+    """Deletes stored credentials and attempts token revocation."""
+    credentials = credential_store.get(user_id)
+    credential_store.delete(user_id)
+    calendar_clients.clear(user_id)
+    revoke_credentials(credentials)
+
+
 def create_activity(user_id, message, job_id=None):
+    """Record an activity as part of the caller's transaction; the caller commits.
+
+    In outbox mode the row is held until that commit succeeds and is then
+    queued for the background writer, becoming visible shortly afterwards.
+    """
+    if activity_outbox is not None:
+        db.session.info.setdefault('outbox_activities', []).append({
+            'user_id': user_id,
+            'job_id': job_id,
+            'message': message,
+            'date': datetime.utcnow(),
+            'is_read': False,
+        })
+        return None
     activity = Activity(
         user_id=user_id,
         job_id=job_id,
         message=message
     )
     db.session.add(activity)
-    db.session.commit()
+    _increment(ActivityUnreadCount, {'user_id': user_id}, count=1)
+    return activity
+
+
+def create_activities(rows):
+    """Bulk create_activity for dicts with user_id, job_id and message, in the caller's transaction."""
+    now = datetime.utcnow()
+    rows = [dict(row, date=now, is_read=False) for row in rows]
+    if activity_outbox is not None:
+        db.session.info.setdefault('outbox_activities', []).extend(rows)
+    elif rows:
+        _insert_activity_rows(rows)
+
 
+def get_unread_count(user_id):
+    """Unread activities for a user: a primary-key lookup on ActivityUnreadCount."""
+    count = db.session.query(ActivityUnreadCount.count).filter(ActivityUnreadCount.user_id == user_id).scalar()
+    return max(count or 0, 0)
 
-def calculate_match_percentage(user_skills, job_skills):
-    user_skill_set = {skill.skill.name.lower() for skill in user_skills}
-    job_skill_list = [skill.strip().lower() for skill in job_skills.split(',')]
 
-    if not job_skill_list:
-        return 0, [], []
+def recent_activities_for(user_id, limit=4):
+    """Newest activities for a user, read through ix_activity_user_id_date_id."""
+    return Activity.query.filter_by(user_id=user_id).\
+        order_by(Activity.date.desc(), Activity.id.desc()).limit(limit).all()
 
-    matching_skills = user_skill_set.intersection(job_skill_list)
-    missing_skills = set(job_skill_list) - user_skill_set
-    match_percentage = (len(matching_skills) / len(job_skill_list)) * 100 if job_skill_list else 0
 
-    return match_percentage, list(matching_skills), list(missing_skills)
+def mark_activities_read(user_id, cursor=None):
+    """Mark the user's activities up to and including a feed cursor (or all) as read.
+
+    Returns the number of activities that changed; the unread counter drops by
+    the same amount in the same transaction.
+    """
+    query = Activity.query.filter(Activity.user_id == user_id,
+                                 db.or_(Activity.is_read.is_(False), Activity.is_read.is_(None)))
+    up_to = decode_cursor(cursor, (datetime, int))
+    if up_to is not None:
+        date, activity_id = up_to
+        query = query.filter(db.or_(Activity.date < date, db.and_(Activity.date == date, Activity.id <= activity_id)))
+    changed = query.update({Activity.is_read: True}, synchronize_session=False)
+    if changed:
+        _increment(ActivityUnreadCount, {'user_id': user_id}, count=-changed)
+        invalidate_after_commit(f'viewer:{user_id}')
+    return changed
+
+
+@app.context_processor
+def inject_unread_activity_count():
+    user_id = session.get('user_id')
+    return {'unread_activity_count': get_unread_count(user_id) if user_id else 0}
 
 
 # Routes
@@ -211,17 +1357,9 @@ def ai_resume_builder():
     user = User.query.get(session['user_id'])
     if request.method == 'POST':
         variant = request.form.get('template', 'classic')
-        skills_list = [s.strip() for s in (user.skills or '').split(',') if s.strip()]
-        profile = Profile(
-            name=user.name,
-            title=user.title or ('Employer' if user.is_employer else 'Job Seeker'),
-            email=user.email,
-            phone=user.phone or '',
-            location=user.location or '',
-            skills=skills_list,
-        )
-        sections = generate_resume_sections(profile)
-        resume_html = generate_resume_html(sections, template_variant=variant)
+        profile = profile_from_row([getattr(user, field) for field in ROW_FIELDS])
+        # Memoized on the profile's content, so an unchanged profile is not re-rendered
+        resume_html = generate_resume_html(profile, template=variant)
         return render_template('resume_result.html', resume_html=resume_html, template_variant=variant)
     return render_template('resume_builder.html', user=user)
 
@@ -235,8 +1373,10 @@ def ai_job_matching():
     prefs = {}
     if request.method == 'POST':
         prefs['location'] = request.form.get('preferred_location', '')
-    jobs = Job.query.order_by(Job.date_posted.desc()).all()
-    recommendations = recommend_jobs_for_user(user, jobs, preferences=prefs)
+    hits = get_matching_engine().top_k(normalize_skills(user.skills or ''), k=JOB_MATCH_LIMIT,
+                                   location=prefs.get('location', ''))
+    jobs_by_id = {job.id: job for job in Job.query.filter(Job.id.in_([h['job_id'] for h in hits])).all()}
+    recommendations = [dict(hit, job=jobs_by_id[hit['job_id']]) for hit in hits if hit['job_id'] in jobs_by_id]
     return render_template('job_matching.html', recommendations=recommendations, prefs=prefs)
 
 
@@ -379,18 +1519,14 @@ def employer_dashboard():
         return redirect(url_for('login'))
 
     employer = User.query.get(session['user_id'])
-    jobs = Job.query.filter_by(employer_id=employer.id).all()
-
-    # Get total applications across all jobs
-    total_applications = 0
-    for job in jobs:
-        total_applications += len(job.applications)
-
-    # Get number of scheduled interviews
-    interviews_scheduled = Application.query.filter(
-        Application.job.has(employer_id=employer.id),
-        Application.status == 'Interview Scheduled'
-    ).count()
+    jobs_with_counts = get_jobs_with_application_counts(employer.id)
+    jobs = [job for job, _ in jobs_with_counts]
+    application_counts = {job.id: count for job, count in jobs_with_counts}
+
+    # Application totals by status come from the denormalized counters
+    status_counts = get_employer_status_counts(employer.id)
+    total_applications = sum(status_counts.values())
+    interviews_scheduled = status_counts.get('Interview Scheduled', 0)
     
     # Get scheduled interview details for employer's jobs
     scheduled_interviews = db.session.query(Interview, Application, Job, User).\
@@ -400,25 +1536,20 @@ def employer_dashboard():
         filter(Job.employer_id == employer.id).all()
     
     # Get counts for analytics section
-    pending_count = Application.query.join(Job).filter(
-        Job.employer_id == employer.id,
-        Application.status == 'Pending'
-    ).count()
-    
-    reviewing_count = Application.query.join(Job).filter(
-        Job.employer_id == employer.id,
-        Application.status == 'Reviewing'
-    ).count()
+    pending_count = status_counts.get('Pending', 0)
+    reviewing_count = status_counts.get('Reviewing', 0)
 
     # Get recent activities
-    activities = Activity.query.filter_by(user_id=employer.id).order_by(Activity.date.desc()).limit(4).all()
+    activities = recent_activities_for(employer.id)
     
     today = datetime.utcnow()
 
     return render_template('employer_dashboard.html',
                            employer=employer,
                            jobs=jobs,
+                           application_counts=application_counts,
                            total_applications=total_applications,
+                           status_counts=status_counts,
                            interviews=interviews_scheduled,
                            scheduled_interviews=scheduled_interviews,
                            activities=activities,
@@ -457,7 +1588,9 @@ def post_job():
             )
 
             db.session.add(job)
-            db.session.flush()  # get job.id early for activity association if needed
+            db.session.flush()  # get job.id early for JobSkill rows and the activity
+            sync_job_skills([job])
+            matching_engine.add_job(job.id, job.required_skills, job.location)
             create_activity(employer.id, f"Posted new job: {job.title}", job_id=job.id)
             db.session.commit()
             flash('Job posted successfully!', 'success')
@@ -495,9 +1628,8 @@ def oauth2callback():
         return redirect(url_for('employer_dashboard'))
 
     redirect_uri = url_for('oauth2callback', _external=True)
-    flow = Flow.from_client_secrets_file(
-        CLIENT_SECRETS_FILE, scopes=SCOPES, redirect_uri=redirect_uri)
-    
+    flow = get_oauth_flow(redirect_uri)
+
     flow.fetch_token(authorization_response=request.url)
     credentials = flow.credentials
     
@@ -523,9 +1655,10 @@ def schedule_interview_form(application_id):
     if not credentials:
         return redirect(url_for('authorize'))
     if getattr(credentials, 'expired', False):
+        # Normally renewed ahead of time by credential_refresher; refresh inline only as a fallback
         try:
             if getattr(credentials, 'refresh_token', None):
-                credentials.refresh(Request())
+                refresh_credentials(credentials)
                 save_user_credentials(user_id, credentials)
             else:
                 return redirect(url_for('authorize'))
@@ -540,8 +1673,6 @@ def schedule_interview_form(application_id):
         summary = request.form['summary']
         description = request.form['description']
 
-        service = get_calendar_service(credentials)
-
         event = {
             'summary': summary,
             'description': description,
@@ -560,12 +1691,26 @@ def schedule_interview_form(application_id):
         }
 
         try:
-            service.events().insert(calendarId='primary', body=event).execute()
-            flash('Interview scheduled successfully!', 'success')
+            if calendar_sync is not None:
+                calendar_sync.put(user_id, credentials, event, _calendar_sync_callback(
+                    user_id, application.applicant.name, application.job_id))
+                # Delivered by the sync worker; a failure shows up in the employer's activities
+                message = 'Interview queued; it will be added to Google Calendar shortly.'
+            else:
+                # A single attempt: retrying a rate limit here would hold the request for seconds
+                with calendar_clients.service(user_id, credentials) as service:
+                    result, = insert_events(service, [event], batch_uri=app.config['CALENDAR_BATCH_URI'],
+                                            max_retries=0)
+                if not result.ok:
+                    raise result.error
+                message = 'Interview scheduled successfully!'
+            record_status_change(application, application.status, 'Interview Scheduled')
             application.status = 'Interview Scheduled'
             db.session.commit()
+            flash(message, 'success')
             return redirect(url_for('view_applications', job_id=application.job_id))
         except Exception as e:
+            db.session.rollback()
             flash(f'An error occurred: {e}', 'danger')
 
     return render_template('schedule_interview.html', application=application)
@@ -584,8 +1729,80 @@ def view_applications(job_id):
         flash('Unauthorized access', 'danger')
         return redirect(url_for('employer_dashboard'))
 
-    applications = Application.query.filter_by(job_id=job.id).all()
-    return render_template('view_applications.html', job=job, applications=applications)
+    cursor, page_size = page_args()
+    applications = keyset_paginate(Application.query.filter_by(job_id=job.id),
+                                   [Application.date_applied, Application.id], cursor, page_size)
+    return render_template('view_applications.html', job=job, applications=applications,
+                           next_cursor=applications.next_cursor)
+
+
+@app.route('/view_applications/<int:job_id>/resumes.zip')
+def export_applicant_resumes(job_id):
+    """Stream a ZIP with a rendered resume for every applicant of the employer's job."""
+    if 'user_id' not in session or not session.get('is_employer'):
+        flash('Please login as employer', 'danger')
+        return redirect(url_for('login'))
+
+    job = Job.query.get_or_404(job_id)
+    if job.employer_id != session['user_id']:
+        flash('Unauthorized access', 'danger')
+        return redirect(url_for('employer_dashboard'))
+
+    variant = request.args.get('template', 'classic')
+    chunks = resume_export_rows(job.id, app.config['RESUME_EXPORT_CHUNK'])
+    archive = iter_resume_zip(chunks, variant, workers=app.config['RESUME_EXPORT_WORKERS'])
+    return Response(stream_with_context(archive), mimetype='application/zip',
+                    headers={'Content-Disposition': f'attachment; filename=job-{job.id}-resumes.zip'})
+
+
+def _parse_availability(data):
+    """{application_id: [[start, end], ...]} with ISO datetimes, as (start, end) datetime pairs."""
+    return {int(application_id): [(datetime.fromisoformat(start), datetime.fromisoformat(end))
+                                  for start, end in windows]
+            for application_id, windows in (data or {}).items()}
+
+
+@app.route('/view_applications/<int:job_id>/schedule-interviews', methods=['POST'])
+def schedule_interviews_in_bulk(job_id):
+    """Assign free slots to all of a job's applications in one status (default Reviewing) at once."""
+    if 'user_id' not in session or not session.get('is_employer'):
+        flash('Please login as employer', 'danger')
+        return redirect(url_for('login'))
+
+    job = Job.query.get_or_404(job_id)
+    if job.employer_id != session['user_id']:
+        flash('Unauthorized access', 'danger')
+        return redirect(url_for('employer_dashboard'))
+
+    data = request.get_json(silent=True) or request.form.to_dict()
+    try:
+        availability = _parse_availability(data.get('availability'))
+        window_start = datetime.fromisoformat(data['start']) if data.get('start') else None
+        window_end = datetime.fromisoformat(data['end']) if data.get('end') else None
+    except (TypeError, ValueError, AttributeError) as e:
+        return jsonify({'error': f'invalid availability or window: {e}'}), 400
+
+    result = bulk_schedule_interviews(job, data.get('status') or 'Reviewing', availability, window_start, window_end)
+    if result is None:
+        db.session.rollback()
+        message = 'Slots or applications changed while scheduling; please try again'
+        if request.is_json:
+            return jsonify({'error': message}), 409
+        flash(message, 'danger')
+        return redirect(url_for('view_applications', job_id=job.id))
+    db.session.commit()
+
+    scheduled, unassigned = result
+    if request.is_json:
+        return jsonify({
+            'scheduled': len(scheduled),
+            'assignments': [{'application_id': application.id, 'slot_id': slot.id,
+                             'start_time': slot.start_time.isoformat()} for application, slot in scheduled],
+            'unassigned': [application.id for application in unassigned],
+        })
+    flash(f'Scheduled {len(scheduled)} interviews; {len(unassigned)} applications could not be given a slot',
+          'success' if scheduled else 'warning')
+    return redirect(url_for('view_applications', job_id=job.id))
 
 
 @app.route('/analytics')
@@ -595,17 +1812,63 @@ def analytics():
         return redirect(url_for('login'))
 
     employer = User.query.get(session['user_id'])
-    jobs = Job.query.filter_by(employer_id=employer.id).all()
-
-    # Get total applications across all jobs
-    total_applications = 0
-    for job in jobs:
-        total_applications += len(job.applications)
+    jobs_with_counts = get_jobs_with_application_counts(employer.id)
+    jobs = [job for job, _ in jobs_with_counts]
+    application_counts = {job.id: count for job, count in jobs_with_counts}
+
+    status_counts = get_employer_status_counts(employer.id)
+    total_applications = sum(status_counts.values())
+
+    # Funnel over the last ?days= days (default 30), optionally narrowed to one of the employer's jobs
+    days = min(max(request.args.get('days', 30, type=int), 1), 365)
+    since = (datetime.utcnow() - timedelta(days=days - 1)).date()
+    job_id = request.args.get('job_id', type=int)
+    if job_id and job_id in application_counts:
+        funnel = get_funnel(JobDailyRollup, JobDailyRollup.job_id, job_id, since)
+    else:
+        job_id = None
+        funnel = get_funnel(EmployerDailyRollup, EmployerDailyRollup.employer_id, employer.id, since)
 
     return render_template('analytics.html',
                            employer=employer,
                            jobs=jobs,
-                           total_applications=total_applications)
+                           application_counts=application_counts,
+                           status_counts=status_counts,
+                           total_applications=total_applications,
+                           funnel=funnel,
+                           funnel_days=days,
+                           funnel_job_id=job_id)
+
+
+@app.route('/metrics')
+def metrics():
+    token = app.config['METRICS_TOKEN']
+    if request_metrics is None or not token or \
+            not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return 'Not Found', 404
+    return Response(request_metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/admin/profiles')
+def admin_profiles():
+    if not is_admin():
+        flash('Please login as an administrator', 'danger')
+        return redirect(url_for('login'))
+    captures = request_profiler.recent() if request_profiler is not None else []
+    return render_template('admin_profiles.html', captures=captures, profiling=request_profiler is not None,
+                           sample_rate=app.config['PROFILE_SAMPLE_RATE'],
+                           endpoints=sorted(app.config['PROFILE_ENDPOINTS']),
+                           keep=app.config['PROFILE_KEEP'])
+
+
+@app.route('/admin/profiles/<filename>')
+def admin_profile_file(filename):
+    if not is_admin():
+        flash('Please login as an administrator', 'danger')
+        return redirect(url_for('login'))
+    if request_profiler is None or not CAPTURE_NAME.match(filename):
+        return 'Not Found', 404
+    return send_from_directory(os.path.abspath(request_profiler.directory), filename, as_attachment=True)
 
 
 @app.route('/admin/seed-curated-jobs')
@@ -630,9 +1893,12 @@ def all_applications():
         return redirect(url_for('login'))
 
     employer_id = session['user_id']
-    applications = Application.query.join(Job).filter(Job.employer_id == employer_id).order_by(Application.date_applied.desc()).all()
+    cursor, page_size = page_args()
+    applications = keyset_paginate(Application.query.join(Job).filter(Job.employer_id == employer_id),
+                                   [Application.date_applied, Application.id], cursor, page_size)
     
-    return render_template('all_applications.html', applications=applications)
+    return render_template('all_applications.html', applications=applications,
+                           next_cursor=applications.next_cursor)
 
 
 @app.route('/update_application_status/<int:application_id>', methods=['POST'])
@@ -651,6 +1917,7 @@ def update_application_status(application_id):
     
     new_status = request.form.get('status')
     if new_status in ['Pending', 'Reviewing', 'Accepted', 'Rejected']:
+        record_status_change(application, application.status, new_status, job=job)
         application.status = new_status
         db.session.commit()
         flash('Application status updated successfully', 'success')
@@ -665,11 +1932,49 @@ def all_activities():
         return redirect(url_for('login'))
 
     user_id = session['user_id']
-    activities = Activity.query.filter_by(user_id=user_id).order_by(Activity.date.desc()).all()
+    cursor, page_size = page_args()
+    activities = keyset_paginate(Activity.query.filter_by(user_id=user_id),
+                                 [Activity.date, Activity.id], cursor, page_size)
     
     today = datetime.utcnow()
     
-    return render_template('all_activities.html', activities=activities, today=today)
+    return render_template('all_activities.html', activities=activities, today=today,
+                           next_cursor=activities.next_cursor)
+
+
+@app.route('/api/activities')
+def activity_feed():
+    """JSON activity feed for the logged-in user, newest first, keyset-paginated by ?cursor=."""
+    if 'user_id' not in session:
+        return jsonify({'error': 'unauthorized'}), 401
+    user_id = session['user_id']
+    cursor, page_size = page_args()
+    page = keyset_paginate(Activity.query.filter_by(user_id=user_id),
+                           [Activity.date, Activity.id], cursor, page_size)
+    return jsonify({
+        'items': [{
+            'id': activity.id,
+            'job_id': activity.job_id,
+            'message': activity.message,
+            'date': activity.date.isoformat() if activity.date else None,
+            'is_read': bool(activity.is_read),
+            'cursor': encode_cursor([activity.date, activity.id]),
+        } for activity in page],
+        'next_cursor': page.next_cursor,
+        'unread_count': get_unread_count(user_id),
+    })
+
+
+@app.route('/api/activities/mark-read', methods=['POST'])
+def mark_activity_feed_read():
+    """Mark activities up to ?cursor= (an item's cursor from the feed) as read; all if omitted."""
+    if 'user_id' not in session:
+        return jsonify({'error': 'unauthorized'}), 401
+    user_id = session['user_id']
+    cursor = request.form.get('cursor') or request.args.get('cursor')
+    changed = mark_activities_read(user_id, cursor)
+    db.session.commit()
+    return jsonify({'marked_read': changed, 'unread_count': get_unread_count(user_id)})
 
 
 # Job Seeker Routes
@@ -694,7 +1999,7 @@ def dashboard():
         'saved_jobs': 0  # Placeholder for future feature
     }
 
-    recent_activities = Activity.query.filter_by(user_id=user.id).order_by(Activity.date.desc()).limit(4).all()
+    recent_activities = recent_activities_for(user.id)
     
     today = datetime.utcnow()
 
@@ -707,24 +2012,43 @@ def dashboard():
 
 
 @app.route('/jobs')
+@cached_page
 def jobs():
     query = request.args.get('q', '')
+    skill = request.args.get('skill', '').strip()
+
+    jobs_query = Job.query
+    if skill:
+        # Indexed join through JobSkill instead of scanning required_skills
+        jobs_query = jobs_query.join(JobSkill, JobSkill.job_id == Job.id).\
+            join(Skill, JobSkill.skill_id == Skill.id).\
+            filter(db.func.lower(Skill.name) == skill.lower())
 
+    cursor, page_size = page_args()
     if query:
-        # Simple search implementation
-        search = f"%{query}%"
-        jobs = Job.query.filter(
-            (Job.title.ilike(search)) |
-            (Job.company.ilike(search)) |
-            (Job.required_skills.ilike(search))
-        ).order_by(Job.date_posted.desc()).all()
+        # Relevance-ranked full-text search over title, company, description and skills.
+        # The ranked id list is bounded by SEARCH_RESULTS_LIMIT; the cursor is the
+        # last job id shown, so pages are slices of that list.
+        ranked_ids = get_search_backend().search(query, limit=SEARCH_RESULTS_LIMIT)
+        if skill:
+            allowed = {job_id for (job_id,) in jobs_query.filter(Job.id.in_(ranked_ids)).with_entities(Job.id)}
+            ranked_ids = [job_id for job_id in ranked_ids if job_id in allowed]
+        after = decode_cursor(cursor, (int,))
+        if after and after[0] in ranked_ids:
+            ranked_ids = ranked_ids[ranked_ids.index(after[0]) + 1:]
+        page_ids = ranked_ids[:page_size]
+        rank = {job_id: position for position, job_id in enumerate(page_ids)}
+        items = sorted(Job.query.filter(Job.id.in_(page_ids)).all(), key=lambda job: rank[job.id])
+        next_cursor = encode_cursor([page_ids[-1]]) if len(ranked_ids) > page_size else None
+        jobs = Page(items, next_cursor, page_size)
     else:
-        jobs = Job.query.order_by(Job.date_posted.desc()).all()
+        jobs = keyset_paginate(jobs_query, [Job.date_posted, Job.id], cursor, page_size)
 
-    return render_template('jobs.html', jobs=jobs)
+    return render_template('jobs.html', jobs=jobs, skill=skill, next_cursor=jobs.next_cursor)
 
 
 @app.route('/job/<int:job_id>')
+@cached_page
 def job_detail(job_id):
     job = Job.query.get_or_404(job_id)
     
@@ -732,7 +2056,7 @@ def job_detail(job_id):
     match_percentage = 0
     if 'user_id' in session and not session.get('is_employer'):
         user = User.query.get(session['user_id'])
-        match_percentage = calculate_match_percentage(user.skills, job.required_skills)
+        match_percentage = round(get_matching_engine().match(user_skill_names(user), job.id)['percentage'])
     
     return render_template('job_detail.html', job=job, match_percentage=match_percentage)
 
@@ -779,6 +2103,7 @@ def apply(job_id):
             )
             
             db.session.add(application)
+            record_status_change(application, None, 'Pending', job=job)
             
             # Create activity for both user and employer
             create_activity(user_id, f"Applied for {job.title} at {job.company}")
@@ -824,7 +2149,8 @@ def profile():
         flash('Profile updated successfully!', 'success')
         return redirect(url_for('profile'))
 
-    all_skills = Skill.query.all()
+    # Same bounded, name-ordered list as the learning resources form; /add-skill takes any name
+    all_skills = Skill.query.order_by(Skill.name).limit(app.config['MAX_PAGE_SIZE']).all()
     return render_template('profile.html', user=user, all_skills=all_skills)
 
 
@@ -843,20 +2169,76 @@ def manage_slots():
         if start_time >= end_time:
             flash('End time must be after start time', 'danger')
             return redirect(url_for('manage_slots'))
-        
-        slot = InterviewSlot(
-            employer_id=employer_id,
-            start_time=start_time,
-            end_time=end_time
-        )
-        
-        db.session.add(slot)
+        if end_time - start_time > timedelta(hours=app.config['MAX_SLOT_HOURS']):
+            flash(f"A slot can last at most {app.config['MAX_SLOT_HOURS']} hours", 'danger')
+            return redirect(url_for('manage_slots'))
+
+        created, _ = create_interview_slots(employer_id, [(start_time, end_time)])
+        if not created:
+            flash('This slot overlaps one you already have', 'danger')
+            return redirect(url_for('manage_slots'))
         db.session.commit()
         flash('Interview slot added successfully', 'success')
         return redirect(url_for('manage_slots'))
-    
-    slots = InterviewSlot.query.filter_by(employer_id=employer_id).all()
-    return render_template('interview_slots.html', slots=slots)
+
+    window_start, window_end = slot_window_args()
+    slots = interview_slots_between(employer_id, window_start, window_end).all()
+    days = (window_end - window_start).days
+    return render_template('interview_slots.html', slots=slots, window_start=window_start, window_end=window_end,
+                           prev_start=(window_start - timedelta(days=days)).strftime('%Y-%m-%d'),
+                           next_start=window_end.strftime('%Y-%m-%d'))
+
+
+def _slot_json(slot):
+    return {
+        'id': slot.id,
+        'start_time': slot.start_time.isoformat(),
+        'end_time': slot.end_time.isoformat(),
+        'is_booked': bool(slot.is_booked),
+    }
+
+
+@app.route('/api/slots')
+def slot_calendar():
+    """JSON list of the employer's slots in the window given by ?start= and ?days=."""
+    if 'user_id' not in session or not session.get('is_employer'):
+        return jsonify({'error': 'unauthorized'}), 401
+    window_start, window_end = slot_window_args()
+    slots = interview_slots_between(session['user_id'], window_start, window_end)
+    return jsonify({
+        'start': window_start.isoformat(),
+        'end': window_end.isoformat(),
+        'items': [_slot_json(slot) for slot in slots],
+    })
+
+
+@app.route('/api/slots/recurring', methods=['POST'])
+def create_recurring_slots():
+    """Generate slots from a recurrence rule (see slot_scheduling.parse_recurrence), skipping overlaps.
+
+    With "strict": true nothing is created if any generated slot overlaps
+    an existing one, and the conflicts come back with a 409.
+    """
+    if 'user_id' not in session or not session.get('is_employer'):
+        return jsonify({'error': 'unauthorized'}), 401
+    data = request.get_json(silent=True) or request.form.to_dict()
+    try:
+        intervals = expand(parse_recurrence(data))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    created, conflicts = create_interview_slots(session['user_id'], intervals)
+    strict = str(data.get('strict', '')).lower() in ('1', 'true')
+    body = {
+        'created': 0 if strict and conflicts else created,
+        'conflict_count': len(conflicts),
+        'conflicts': [{'start_time': start.isoformat(), 'end_time': end.isoformat()}
+                      for start, end in conflicts[:app.config['MAX_PAGE_SIZE']]],
+    }
+    if strict and conflicts:
+        db.session.rollback()
+        return jsonify(body), 409
+    db.session.commit()
+    return jsonify(body), 201
 
 
 @app.route('/schedule_interview/<int:application_id>', methods=['GET', 'POST'])
@@ -879,30 +2261,17 @@ def schedule_interview_route(application_id):
         return redirect(url_for('dashboard'))
     
     if request.method == 'POST':
-        slot_id = request.form.get('slot_id')
-        slot = InterviewSlot.query.get(slot_id)
-        
-        if slot.is_booked:
+        slot_id = request.form.get('slot_id', type=int)
+        try:
+            interview = book_interview_slot(application, slot_id, application.job.employer_id)
+            if interview is not None:
+                db.session.commit()
+        except IntegrityError:
+            interview = None
+        if interview is None:
+            db.session.rollback()
             flash('This slot is already booked', 'danger')
-            return redirect(url_for('schedule_interview', application_id=application_id))
-        
-        interview = Interview(
-            slot_id=slot_id,
-            application_id=application_id,
-            meeting_link=f"https://meet.luminate.com/{slot_id}",  # Placeholder
-            notes=""
-        )
-        
-        slot.is_booked = True
-        application.status = 'Interview Scheduled'
-        
-        db.session.add(interview)
-        
-        # Create activities
-        create_activity(application.user_id, f"Interview scheduled for {application.job.title}")
-        create_activity(application.job.employer_id, f"Interview scheduled with {application.applicant.name}", application.job_id)
-        
-        db.session.commit()
+            return redirect(url_for('schedule_interview_route', application_id=application_id))
         flash('Interview scheduled successfully', 'success')
         
         if session.get('is_employer'):
@@ -911,11 +2280,10 @@ def schedule_interview_route(application_id):
             return redirect(url_for('interviews'))
     
     # Get available slots
-    if session.get('is_employer'):
-        slots = InterviewSlot.query.filter_by(employer_id=session['user_id'], is_booked=False).all()
-    else:
-        job = Job.query.get(application.job_id)
-        slots = InterviewSlot.query.filter_by(employer_id=job.employer_id, is_booked=False).all()
+    window_start, window_end = slot_window_args()
+    window_start = max(window_start, datetime.utcnow())
+    slots = interview_slots_between(application.job.employer_id, window_start, window_end).\
+        filter(InterviewSlot.is_booked.isnot(True)).all()
     
     # Get existing interview if any
     interview = Interview.query.filter_by(application_id=application_id).first()
@@ -930,7 +2298,6 @@ def interviews():
         return redirect(url_for('login'))
     
     user_id = session['user_id']
-    from sqlalchemy.orm import joinedload
     if session.get('is_employer'):
         # For employers - interviews for their jobs
         interviews = Interview.query.join(Application).join(Job)\
@@ -953,33 +2320,45 @@ def results():
 
     user = User.query.get(session['user_id'])
     if user.user_skills:
-        all_jobs = Job.query.all()
+        # Matches come ranked by (score, job id); the cursor is the last pair shown
+        cursor, page_size = page_args()
+        after = decode_cursor(cursor, (int, int))
+        # Scores are percentages and the engine packs job ids into the low 40 bits of its sort key
+        if after is not None and not (0 <= after[0] <= 100 and 0 <= after[1] < 1 << 40):
+            after = None
+        matches = get_matching_engine().top_k(user_skill_names(user), k=page_size + 1, after=after)
+        next_cursor = encode_cursor([matches[-2]['score'], matches[-2]['job_id']]) if len(matches) > page_size else None
+        matches = matches[:page_size]
+        job_ids = [m['job_id'] for m in matches]
+        jobs_by_id = {job.id: job for job in Job.query.filter(Job.id.in_(job_ids)).all()}
+        # One batched lookup for the union of missing skills across all matches
+        resources_by_skill = get_learning_resources(
+            skill_name for match in matches for skill_name in match['missing'])
         recommended_jobs = []
 
-        for job in all_jobs:
-            match_percentage, matching_skills, missing_skills = calculate_match_percentage(user.user_skills, job.required_skills)
-            if match_percentage > 0:
-                learning_recommendations = {}
-                if missing_skills:
-                    for skill_name in missing_skills:
-                        skill = Skill.query.filter(Skill.name.ilike(skill_name)).first()
-                        if skill:
-                            resources = LearningResource.query.filter_by(skill_id=skill.id).limit(3).all()
-                            if resources:
-                                learning_recommendations[skill_name] = resources
-
-                recommended_jobs.append({
-                    'job': job,
-                    'match_percentage': round(match_percentage),
-                    'matching_skills': matching_skills,
-                    'missing_skills': missing_skills,
-                    'learning_recommendations': learning_recommendations
-                })
+        for match in matches:
+            job = jobs_by_id.get(match['job_id'])
+            if job is None:
+                continue
+            missing_skills = match['missing']
+            learning_recommendations = {
+                skill_name: resources_by_skill[skill_name]
+                for skill_name in missing_skills
+                if resources_by_skill.get(skill_name)
+            }
+
+            recommended_jobs.append({
+                'job': job,
+                'match_percentage': round(match['percentage']),
+                'matching_skills': match['matching'],
+                'missing_skills': missing_skills,
+                'learning_recommendations': learning_recommendations
+            })
         
         # Sort by match percentage (highest first)
         recommended_jobs.sort(key=lambda x: x['match_percentage'], reverse=True)
         
-        return render_template('results.html', matches=recommended_jobs)
+        return render_template('results.html', matches=recommended_jobs, next_cursor=next_cursor)
     else:
         flash('Please add skills to your profile to get job recommendations', 'info')
         return redirect(url_for('profile'))
@@ -989,15 +2368,17 @@ def results():
 def skills():
     if request.method == 'POST':
         skill_name = request.form.get('skill_name')
-        if skill_name and not Skill.query.filter_by(name=skill_name).first():
+        if skill_name and not find_skill(skill_name):
             new_skill = Skill(name=skill_name)
             db.session.add(new_skill)
             db.session.commit()
+            clear_learning_resource_cache()
             flash('Skill added successfully!', 'success')
         else:
             flash('Skill already exists or is invalid.', 'danger')
-    all_skills = Skill.query.all()
-    return render_template('skills.html', skills=all_skills)
+    cursor, page_size = page_args()
+    skills_page = keyset_paginate(Skill.query, [Skill.name, Skill.id], cursor, page_size, descending=False)
+    return render_template('skills.html', skills=skills_page, next_cursor=skills_page.next_cursor)
 
 
 @app.route('/add-skill', methods=['POST'])
@@ -1008,11 +2389,12 @@ def add_skill():
 
     skill_name = request.form.get('skill_name')
     if skill_name:
-        skill = Skill.query.filter_by(name=skill_name).first()
+        skill = find_skill(skill_name)
         if not skill:
             skill = Skill(name=skill_name)
             db.session.add(skill)
             db.session.commit()
+            clear_learning_resource_cache()
 
         user_skill = UserSkill.query.filter_by(user_id=user_id, skill_id=skill.id).first()
         if not user_skill:
@@ -1052,6 +2434,9 @@ def learning_resources():
         url = request.form.get('url')
         resource_type = request.form.get('resource_type')
         skill_id = request.form.get('skill_id')
+        if not skill_id and request.form.get('skill_name'):
+            skill = find_skill(request.form.get('skill_name'))
+            skill_id = skill.id if skill else None
 
         if all([title, url, resource_type, skill_id]):
             new_resource = LearningResource(
@@ -1062,19 +2447,166 @@ def learning_resources():
             )
             db.session.add(new_resource)
             db.session.commit()
+            clear_learning_resource_cache()
             flash('Learning resource added.', 'success')
         else:
             flash('All fields are required.', 'danger')
 
-    all_skills = Skill.query.all()
-    all_resources = LearningResource.query.all()
-    return render_template('learning_resources.html', skills=all_skills, resources=all_resources)
+    cursor, page_size = page_args()
+    resources = keyset_paginate(LearningResource.query.options(joinedload(LearningResource.skill)),
+                                [LearningResource.id], cursor, page_size)
+    # The add form picks from a bounded, name-ordered skill list; skill_name covers the rest
+    skill_choices = Skill.query.order_by(Skill.name).limit(app.config['MAX_PAGE_SIZE']).all()
+    return render_template('learning_resources.html', skills=skill_choices, resources=resources,
+                           next_cursor=resources.next_cursor)
+
+
+@app.cli.command('backfill-job-skills')
+def backfill_job_skills_command():
+    """Create the JobSkill table and fill it from Job.required_skills."""
+    from database_updates import backfill_job_skills, create_missing_indexes
+    db.create_all()
+    create_missing_indexes()
+    backfill_job_skills()
+
+
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """Create the full-text search index if needed and rebuild it from the Job table."""
+    backend = get_search_backend()
+    backend.rebuild()
+    print(f"Rebuilt {backend.name} search index")
+
+
+@app.cli.command('import-jobs')
+@click.argument('csv_path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--employer-id', type=int, help='Owner of the imported jobs (default: the "Imported Jobs" user).')
+@click.option('--batch-size', type=int, default=5000, help='Rows per insert batch and transaction.')
+@click.option('--rejects', 'reject_path', type=click.Path(dir_okay=False), help='Reject file for unusable rows.')
+def import_jobs_command(csv_path, employer_id, batch_size, reject_path):
+    """Stream a Naukri-style job CSV into the Job table."""
+    from database_updates import import_jobs_from_csv
+    db.create_all()
+    import_jobs_from_csv(csv_path, employer_id, batch_size, reject_path)
+
+
+@app.cli.command('import-calendar-credentials')
+@click.option('--dir', 'directory', default='.', type=click.Path(file_okay=False), help='Where token_*.pickle live.')
+@click.option('--keep', is_flag=True, help='Leave the pickle files in place after importing.')
+def import_calendar_credentials_command(directory, keep):
+    """Move legacy token_<user_id>.pickle files into the encrypted CalendarCredential table."""
+    from database_updates import import_pickled_credentials
+    db.create_all()
+    import_pickled_credentials(directory, remove=not keep)
+
+
+@app.cli.command('export-resumes')
+@click.argument('out', type=click.Path(dir_okay=False, writable=True))
+@click.option('--job-id', type=int, help='Only the applicants of this job (default: every job seeker).')
+@click.option('--template', 'variant', default='classic', help='Resume template variant.')
+@click.option('--workers', type=int, default=os.cpu_count() or 1, help='Render processes.')
+@click.option('--chunk-size', type=int, default=500, help='Users per chunk sent to a worker.')
+def export_resumes_command(out, job_id, variant, workers, chunk_size):
+    """Render resumes for a job's applicants or the whole talent pool into a ZIP archive."""
+    total = resume_export_query(job_id).count()
+    resumes = 0
+
+    def report(done, total, elapsed):
+        nonlocal resumes
+        resumes = done
+        rate = done / elapsed if elapsed else 0.0
+        click.echo(f"\r{done:,}/{total:,} resumes  {rate:,.0f}/s  {rate / max(workers, 1):,.0f}/s per worker",
+                   nl=False, err=True)
+
+    with open(out, 'wb') as f:
+        written = export_resumes(resume_export_rows(job_id, chunk_size), f, variant, workers, total, report)
+    click.echo(err=True)
+    print(f"Wrote {resumes:,} resumes ({written / 1e6:.1f} MB) to {out}")
+
+
+@app.cli.command('create-indexes')
+def create_indexes_command():
+    """Create the tables and indexes an existing database is missing, and fill new counter tables."""
+    from database_updates import create_missing_indexes, ensure_application_counters, ensure_unread_counts
+    db.create_all()
+    create_missing_indexes()
+    ensure_application_counters()
+    ensure_unread_counts()
+
+
+@app.cli.command('reconcile-unread-counts')
+def reconcile_unread_counts_command():
+    """Create the activity feed index if missing and recompute the unread counters."""
+    from database_updates import reconcile_unread_counts, create_missing_indexes
+    db.create_all()
+    create_missing_indexes()
+    reconcile_unread_counts()
+
+
+@app.cli.command('migrate-interview-slots')
+def migrate_interview_slots_command():
+    """Create the missing indexes, uq_interview_slot_id among them, once no slot is double-booked.
+
+    Also available under its original name, add-interview-slot-constraint.
+    """
+    db.create_all()
+    duplicates = [slot_id for (slot_id,) in db.session.query(Interview.slot_id).
+                  group_by(Interview.slot_id).having(db.func.count(Interview.id) > 1)]
+    if duplicates:
+        raise click.ClickException(f"Slots with more than one interview: {', '.join(map(str, duplicates))}")
+    from database_updates import create_missing_indexes
+    create_missing_indexes()
+
+
+app.cli.add_command(migrate_interview_slots_command, 'add-interview-slot-constraint')
+
+
+@app.cli.command('schedule-interviews')
+@click.argument('job_id', type=int)
+@click.option('--status', default='Reviewing', help='Schedule the applications currently in this status.')
+@click.option('--availability', 'availability_path', type=click.Path(exists=True, dir_okay=False),
+              help='JSON file of {application_id: [[start, end], ...]} windows.')
+def schedule_interviews_command(job_id, status, availability_path):
+    """Give a job's applications in one status an interview slot each, in a single transaction."""
+    import json
+    job = Job.query.get(job_id)
+    if job is None:
+        raise click.ClickException(f'No job {job_id}')
+    availability = None
+    if availability_path:
+        with open(availability_path) as f:
+            availability = _parse_availability(json.load(f))
+    started = datetime.utcnow()
+    result = bulk_schedule_interviews(job, status, availability)
+    if result is None:
+        db.session.rollback()
+        raise click.ClickException('Slots or applications changed while scheduling; run again')
+    db.session.commit()
+    scheduled, unassigned = result
+    print(f"Scheduled {len(scheduled):,} interviews, {len(unassigned):,} applications left without a slot "
+          f"({(datetime.utcnow() - started).total_seconds():.2f}s)")
+
+
+@app.cli.command('reconcile-application-counters')
+def reconcile_application_counters_command():
+    """Recompute the per-job and per-employer application counters from Application rows."""
+    from database_updates import reconcile_application_counters
+    db.create_all()
+    reconcile_application_counters()
+
+
+@app.cli.command('rebuild-analytics-rollups')
+def rebuild_analytics_rollups_command():
+    """Recompute the daily analytics rollups from the application status event log."""
+    from database_updates import rebuild_analytics_rollups
+    db.create_all()
+    rebuild_analytics_rollups()
 
 
 @app.before_first_request
 def auto_seed_curated_jobs():
     try:
-        job_count = Job.query.count()
+        job_count = Job.query.limit(15).count()
         if job_count < 15:
             from database_updates import add_curated_job_postings
             add_curated_job_postings()
@@ -1083,8 +2615,23 @@ def auto_seed_curated_jobs():
         app.logger.warning(f'Auto-seeding skipped due to error: {e}')
 
 
+@app.before_first_request
+def fill_counter_tables():
+    # Counter tables that create_all() just added to an existing database start empty
+    try:
+        from database_updates import ensure_application_counters, ensure_unread_counts
+        ensure_application_counters()
+        ensure_unread_counts()
+    except Exception as e:
+        db.session.rollback()
+        app.logger.warning(f'Counter reconcile skipped due to error: {e}')
+
+
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
+        from database_updates import ensure_application_counters, ensure_unread_counts
+        ensure_application_counters()
+        ensure_unread_counts()
     port = int(os.getenv('PORT', '5001'))
     app.run(debug=True, port=port)
@@ -0,0 +1,56 @@
+"""Throughput benchmark: one Calendar insert per request versus the batch endpoint.
+
+Runs against the local fake Calendar server, so no Google account is needed:
+
+    python -m benchmarks.bench_calendar --events 500 --latency 0.05 --fail-rate 0.05
+"""
+import argparse
+import time
+
+from calendar_sync import insert_events
+from fake_calendar_server import start_fake_calendar_server, calendar_service_for
+
+
+def make_events(n):
+    return [{
+        'summary': f'Interview {i}',
+        'start': {'dateTime': '2026-01-05T09:00:00', 'timeZone': 'UTC'},
+        'end': {'dateTime': '2026-01-05T09:30:00', 'timeZone': 'UTC'},
+        'attendees': [{'email': f'candidate{i}@luminate.com'}, {'email': 'employer@defaultco.com'}],
+    } for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.05, help='Simulated round trip per HTTP request.')
+    parser.add_argument('--fail-rate', type=float, default=0.0)
+    parser.add_argument('--batch-fail-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, calendar, url = start_fake_calendar_server(latency=args.latency, fail_rate=args.fail_rate,
+                                                       batch_fail_rate=args.batch_fail_rate, seed=0)
+    service = calendar_service_for(url)
+
+    started = time.perf_counter()
+    failed = 0
+    for event in make_events(args.events):
+        try:
+            service.events().insert(calendarId='primary', body=event).execute()
+        except Exception:
+            failed += 1
+    elapsed = time.perf_counter() - started
+    print(f"single   {args.events / elapsed:8.1f} events/s  {calendar.stats['http_requests']:5d} requests  "
+          f"{failed} failed")
+
+    before = calendar.stats['http_requests']
+    started = time.perf_counter()
+    results = insert_events(service, make_events(args.events), batch_uri=url + '/batch/calendar/v3', backoff=0.05)
+    elapsed = time.perf_counter() - started
+    print(f"batched  {args.events / elapsed:8.1f} events/s  {calendar.stats['http_requests'] - before:5d} requests  "
+          f"{sum(not r.ok for r in results)} failed after retries")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
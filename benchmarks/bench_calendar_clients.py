@@ -0,0 +1,84 @@
+"""Startup and per-request latency of Calendar client construction: build() per request versus the pool.
+
+Runs against the local fake Calendar server:
+
+    python -m benchmarks.bench_calendar_clients --requests 300
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+from google_auth_oauthlib.flow import Flow
+
+import google_calendar
+from google_calendar import CalendarClientPool, get_discovery_document, get_oauth_flow, SCOPES
+from fake_calendar_server import start_fake_calendar_server, fake_client_options
+
+EVENT = {'summary': 'Interview', 'start': {'dateTime': '2026-01-05T09:00:00Z'},
+         'end': {'dateTime': '2026-01-05T09:30:00Z'}}
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[max(0, int(len(samples) * 0.95) - 1)]
+
+
+def timed(fn, n):
+    samples = []
+    for _ in range(n):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return percentiles(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=300)
+    args = parser.parse_args()
+
+    server, calendar, url = start_fake_calendar_server()
+    options = fake_client_options(url)
+    credentials = Credentials(token='fake-token')
+
+    started = time.perf_counter()
+    get_discovery_document()
+    print(f"startup: discovery document parsed once in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    def legacy():
+        # What every scheduling request used to do: build() from scratch, new transport
+        service = build('calendar', 'v3', credentials=credentials, client_options=options, cache_discovery=False)
+        service.events().insert(calendarId='primary', body=dict(EVENT)).execute()
+
+    pool = CalendarClientPool(client_options=options)
+
+    def pooled():
+        with pool.service(1, credentials) as service:
+            service.events().insert(calendarId='primary', body=dict(EVENT)).execute()
+
+    p50, p95 = timed(legacy, args.requests)
+    print(f"build() per request  p50={p50:7.2f}ms p95={p95:7.2f}ms")
+    p50, p95 = timed(pooled, args.requests)
+    print(f"pooled client        p50={p50:7.2f}ms p95={p95:7.2f}ms")
+
+    secrets = os.path.join(tempfile.mkdtemp(), 'client_secret.json')
+    with open(secrets, 'w') as f:
+        json.dump({'web': {'client_id': 'bench', 'client_secret': 'bench', 'redirect_uris': ['http://localhost/cb'],
+                           'auth_uri': 'https://accounts.google.com/o/oauth2/auth',
+                           'token_uri': 'https://oauth2.googleapis.com/token'}}, f)
+    google_calendar.CLIENT_SECRETS_FILE = secrets
+    p50, p95 = timed(lambda: Flow.from_client_secrets_file(secrets, scopes=SCOPES,
+                                                           redirect_uri='http://localhost/cb'), args.requests)
+    print(f"Flow from file       p50={p50:7.3f}ms p95={p95:7.3f}ms")
+    p50, p95 = timed(lambda: get_oauth_flow('http://localhost/cb'), args.requests)
+    print(f"Flow from cache      p50={p50:7.3f}ms p95={p95:7.3f}ms")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
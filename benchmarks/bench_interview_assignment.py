@@ -0,0 +1,117 @@
+"""Benchmark for bulk interview scheduling: the assignment solver alone, then end to end.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_interview_assignment --applicants 3000 --slots 2500 --constrained 0.5
+
+End-to-end runs use a throwaway SQLite file unless --database-url is given.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from interview_assignment import assign_slots
+
+
+def make_slots(n_slots, start):
+    # Weekday 09:00-17:00 in 30-minute slots, like a typical recurrence rule
+    slots, day = [], start
+    while len(slots) < n_slots:
+        if day.weekday() < 5:
+            for i in range(16):
+                begin = day.replace(hour=9) + timedelta(minutes=30 * i)
+                slots.append((begin, begin + timedelta(minutes=30)))
+        day += timedelta(days=1)
+    return slots[:n_slots]
+
+
+def make_availability(applicants, slots, share, rng):
+    # Each constrained applicant can make two or three half-day windows
+    first, last = slots[0][0], slots[-1][1]
+    span_days = max(1, (last - first).days)
+    availability = {}
+    for applicant in applicants:
+        if rng.random() >= share:
+            continue
+        windows = []
+        for _ in range(rng.randint(2, 3)):
+            day = (first + timedelta(days=rng.randrange(span_days))).replace(hour=9 if rng.random() < 0.5 else 13)
+            windows.append((day, day + timedelta(hours=4)))
+        availability[applicant] = windows
+    return availability
+
+
+def bench_solver(args, rng):
+    applicants = list(range(args.applicants))
+    slots = make_slots(args.slots, datetime(2026, 11, 2))
+    availability = make_availability(applicants, slots, args.constrained, rng)
+    started = time.perf_counter()
+    assigned = assign_slots(applicants, slots, availability)
+    elapsed = time.perf_counter() - started
+    print(f"solver      {len(applicants):6,d} applicants x {len(slots):6,d} slots ({len(availability):,} constrained): "
+          f"{len(assigned):6,d} assigned in {elapsed * 1000:8.1f}ms")
+
+
+def bench_end_to_end(args, rng):
+    # application reads DATABASE_URL at import time
+    os.environ['DATABASE_URL'] = args.database_url
+    from application import (app, db, User, Job, Application, InterviewSlot, Interview, bulk_schedule_interviews)
+
+    with app.app_context():
+        db.create_all()
+        stamp = time.time_ns()
+        employer = User(name='Bench Employer', email=f'employer-{stamp}@luminate.com', password_hash='-',
+                        is_employer=True)
+        db.session.add(employer)
+        db.session.flush()
+        job = Job(title='Bulk Scheduling', company='Bench Co', description='-', required_skills='Python',
+                  location='Remote', employer_id=employer.id)
+        db.session.add(job)
+        db.session.flush()
+        start = datetime.combine(datetime.utcnow().date() + timedelta(days=1), datetime.min.time())
+        slots = make_slots(args.slots, start)
+        db.session.execute(InterviewSlot.__table__.insert(), [
+            {'employer_id': employer.id, 'start_time': s, 'end_time': e, 'is_booked': False} for s, e in slots])
+        db.session.execute(User.__table__.insert(), [
+            {'name': f'Candidate {i}', 'email': f'candidate-{stamp}-{i}@luminate.com', 'password_hash': '-',
+             'is_employer': False} for i in range(args.applicants)])
+        user_ids = [user_id for (user_id,) in db.session.query(User.id).
+                    filter(User.email.like(f'candidate-{stamp}-%')).order_by(User.id)]
+        db.session.execute(Application.__table__.insert(), [
+            {'user_id': user_id, 'job_id': job.id, 'status': 'Reviewing', 'date_applied': start - timedelta(days=7)}
+            for user_id in user_ids])
+        db.session.commit()
+        application_ids = [a for (a,) in db.session.query(Application.id).filter_by(job_id=job.id)]
+        availability = make_availability(application_ids, slots, args.constrained, rng)
+
+        started = time.perf_counter()
+        scheduled, unassigned = bulk_schedule_interviews(job, 'Reviewing', availability)
+        db.session.commit()
+        elapsed = time.perf_counter() - started
+        interviews = db.session.query(Interview.id).join(InterviewSlot).\
+            filter(InterviewSlot.employer_id == employer.id).count()
+        print(f"end to end  {len(application_ids):6,d} applications x {len(slots):6,d} slots on "
+              f"{db.engine.dialect.name}: {len(scheduled):6,d} scheduled, {len(unassigned):,} unassigned, "
+              f"{interviews:,} interview rows in {elapsed:6.2f}s")
+        assert interviews == len(scheduled)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--applicants', type=int, default=3000)
+    parser.add_argument('--slots', type=int, default=2500)
+    parser.add_argument('--constrained', type=float, default=0.5, help='Share of applicants with availability.')
+    parser.add_argument('--database-url', default='sqlite:///' + os.path.join(tempfile.mkdtemp(), 'assign.db'))
+    parser.add_argument('--solver-only', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    bench_solver(args, random.Random(args.seed))
+    if not args.solver_only:
+        bench_end_to_end(args, random.Random(args.seed))
+
+
+if __name__ == '__main__':
+    main()
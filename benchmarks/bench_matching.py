@@ -0,0 +1,73 @@
+"""Throughput benchmark for the vectorized matching engine.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_matching --jobs 100000 1000000 --users 256
+"""
+import argparse
+import itertools
+import random
+import time
+
+from matching_engine import MatchingEngine
+
+# Skill pool drawn from the curated postings plus filler skills for a long tail
+BASE_SKILLS = [
+    'python', 'flask', 'sql', 'docker', 'aws', 'pandas', 'scikit-learn', 'statistics',
+    'javascript', 'react', 'css', 'accessibility', 'testing', 'kubernetes', 'terraform',
+    'monitoring', 'flutter', 'dart', 'rest', 'ci/cd', 'ux', 'seo', 'sem', 'analytics',
+    'copywriting', 'social media', 'recruitment', 'onboarding', 'policy', 'communication',
+    'content', 'project management', 'crm', 'negotiation', 'prospecting', 'reporting',
+    'agile', 'risk management', 'planning', 'leadership', 'strategy', 'budgeting',
+]
+SKILLS = BASE_SKILLS + [f'skill-{i}' for i in range(2000)]
+# Zipf weights: the head of the pool gets long posting lists, the tail short ones
+CUM_WEIGHTS = list(itertools.accumulate(1 / rank for rank in range(1, len(SKILLS) + 1)))
+
+
+def _skills(rng, low, high):
+    return rng.choices(SKILLS, cum_weights=CUM_WEIGHTS, k=rng.randint(low, high))
+
+
+def build_engine(n_jobs, seed=0):
+    rng = random.Random(seed)
+    engine = MatchingEngine()
+    engine.load((i, ', '.join(_skills(rng, 3, 8)), 'Remote') for i in range(1, n_jobs + 1))
+    return engine
+
+
+def run(n_jobs, n_users, batch, seed=0):
+    rng = random.Random(seed + 1)
+    started = time.perf_counter()
+    engine = build_engine(n_jobs, seed)
+    build_s = time.perf_counter() - started
+    users = [_skills(rng, 3, 15) for _ in range(n_users)]
+
+    started = time.perf_counter()
+    for skills in users:
+        engine.top_k(skills, k=50)
+    single_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for start in range(0, n_users, batch):
+        engine.score_users(users[start:start + batch])
+    batch_s = time.perf_counter() - started
+
+    print(f"jobs={n_jobs:>9,} nnz={len(engine.indices):>10,} build={build_s:6.2f}s "
+          f"top_k={n_users / single_s:8.1f} users/s "
+          f"batch({batch})={n_users / batch_s:8.1f} users/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--users', type=int, default=256)
+    parser.add_argument('--batch', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    for n_jobs in args.jobs:
+        run(n_jobs, args.users, args.batch, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark for request_metrics: hook overhead per request and scrape cost.
+
+Times start_request/set_status/finish_request around a number of
+simulated statements (before/after_cursor_execute pairs), on one thread and
+on several at once, then the time to render a scrape.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_request_metrics --requests 200000 --statements 5 --threads 8
+"""
+import argparse
+import threading
+import time
+
+from request_metrics import RequestMetrics
+
+ENDPOINTS = ['jobs', 'job_detail', 'dashboard', 'employer_dashboard', 'results', 'analytics', 'profile', 'skills']
+
+
+class FakeCursor:
+    rowcount = -1
+
+
+def run(metrics, n_requests, n_statements, endpoints):
+    cursor = FakeCursor()
+    for i in range(n_requests):
+        metrics.start_request()
+        for _ in range(n_statements):
+            metrics.before_cursor_execute(None, cursor, None, None, None, False)
+            metrics.after_cursor_execute(None, cursor, None, None, None, False)
+        metrics.set_status(200)
+        metrics.finish_request(endpoints[i % len(endpoints)], 'GET')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200_000)
+    parser.add_argument('--statements', type=int, default=5, help='Simulated SQL statements per request.')
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    metrics = RequestMetrics()
+    started = time.perf_counter()
+    run(metrics, args.requests, args.statements, ENDPOINTS)
+    elapsed = time.perf_counter() - started
+    print(f"1 thread     {args.requests:,} requests x {args.statements} statements: "
+          f"{elapsed / args.requests * 1e6:6.2f}us per request")
+
+    per_thread = args.requests // args.threads
+    threads = [threading.Thread(target=run, args=(metrics, per_thread, args.statements, ENDPOINTS))
+               for _ in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    print(f"{args.threads} threads    {per_thread * args.threads:,} requests x {args.statements} statements: "
+          f"{elapsed / (per_thread * args.threads) * 1e6:6.2f}us per request (wall clock, GIL-bound)")
+
+    started = time.perf_counter()
+    text = metrics.render()
+    elapsed = time.perf_counter() - started
+    total = sum(int(line.rsplit(' ', 1)[1]) for line in text.splitlines()
+                if line.startswith('luminate_http_requests_total{'))
+    print(f"scrape       {len(text.splitlines()):,} lines, {total:,} requests counted in {elapsed * 1000:.2f}ms")
+    assert total == args.requests + per_thread * args.threads
+
+
+if __name__ == '__main__':
+    main()
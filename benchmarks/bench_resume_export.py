@@ -0,0 +1,62 @@
+"""Throughput benchmark for the bulk resume export pipeline, in resumes/sec per core.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_resume_export --users 20000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import random
+import time
+
+from resume_export import export_resumes
+from benchmarks.bench_matching import _skills
+
+TITLES = ['Software Engineer', 'Data Scientist', 'Frontend Engineer', 'DevOps Engineer',
+          'Mobile Developer', 'Marketing Specialist', 'HR Manager', 'Project Manager']
+CITIES = ['Remote', 'New York, NY', 'Austin, TX', 'Seattle, WA', 'Chicago, IL']
+
+
+class _NullSink:
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+
+
+def user_rows(n_users, seed=0):
+    rng = random.Random(seed)
+    return [(i, f'Candidate {i}', rng.choice(TITLES), f'candidate{i}@luminate.com', '555-0100',
+             rng.choice(CITIES), ', '.join(_skills(rng, 4, 15)), False) for i in range(1, n_users + 1)]
+
+
+def chunked(rows, size):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def run(rows, workers, chunk_size):
+    sink = _NullSink()
+    started = time.perf_counter()
+    export_resumes(chunked(rows, chunk_size), sink, workers=workers)
+    elapsed = time.perf_counter() - started
+    rate = len(rows) / elapsed
+    print(f"workers={workers:2d}  {rate:9,.0f} resumes/s  {rate / workers:9,.0f} resumes/s/core  "
+          f"{sink.size / 1e6:7.1f} MB zip  {elapsed:6.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=20_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=sorted({1, 2, os.cpu_count() or 1}))
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    rows = user_rows(args.users, args.seed)
+    for workers in args.workers:
+        run(rows, workers, args.chunk_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""Per-route benchmark: latency percentiles, SQL statement counts and peak memory, compared with a baseline.
+
+Drives every route in check_query_plans.routes() through the Flask test
+client against a generated dataset (benchmarks.dataset): first a timed pass
+of --iterations requests per route, then one request per route under
+tracemalloc for its peak allocation. Results can be saved as a baseline
+and later runs compared with it; a route regresses when its p50 or p95
+grows by more than --tolerance (and --min-delta-ms), or when it issues
+more statements.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_routes --jobs 100000 --applications 1000000 --save-baseline
+    python -m benchmarks.bench_routes --jobs 100000 --applications 1000000 --compare
+
+Baselines are only comparable on the same machine, dataset volumes and
+seed; they are written to benchmarks/baselines/ unless --baseline says
+otherwise. --database-url reuses a database already loaded by
+benchmarks.dataset instead of generating a fresh one.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.check_query_plans import routes
+from benchmarks.dataset import add_volume_arguments, generate, sample, volumes_from
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_values[min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))]
+
+
+def label(who, method, path):
+    return f"{'employer' if who and who[1] else 'seeker' if who else 'anonymous'} {method} {path}"
+
+
+def clients(app, requests_to_run):
+    """One test client per identity, already logged in."""
+    by_who = {}
+    for who, *_ in requests_to_run:
+        if who not in by_who:
+            client = by_who[who] = app.test_client()
+            if who is not None:
+                with client.session_transaction() as session:
+                    session['user_id'], session['is_employer'] = who
+    return by_who
+
+
+def send(client, method, path, data):
+    try:
+        return client.open(path, method=method, data=data).status_code
+    except Exception as e:  # missing templates and the like; the work done before the failure still counts
+        return type(e).__name__
+
+
+def measure(app, db, requests_to_run, iterations, warmup):
+    """{label: result dict} for each request.
+
+    Statements are counted on every engine, so reads routed to the replica count too.
+    """
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    statements = [0]
+
+    def count(*args):
+        statements[0] += 1
+
+    by_who = clients(app, requests_to_run)
+    results = {}
+    event.listen(Engine, 'before_cursor_execute', count)
+    try:
+        for who, method, path, data in requests_to_run:
+            client = by_who[who]
+            for _ in range(warmup):
+                send(client, method, path, data)
+            timings, counts = [], []
+            for _ in range(iterations):
+                statements[0] = 0
+                started = time.perf_counter()
+                status = send(client, method, path, data)
+                timings.append((time.perf_counter() - started) * 1000)
+                counts.append(statements[0])
+            timings.sort()
+            results[label(who, method, path)] = {
+                'status': status,
+                'p50_ms': percentile(timings, 0.50),
+                'p95_ms': percentile(timings, 0.95),
+                'p99_ms': percentile(timings, 0.99),
+                'mean_ms': statistics.fmean(timings),
+                'statements': max(counts),
+            }
+    finally:
+        event.remove(Engine, 'before_cursor_execute', count)
+
+    # Separate pass: tracemalloc slows allocation-heavy code several times over
+    tracemalloc.start()
+    try:
+        for who, method, path, data in requests_to_run:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            send(by_who[who], method, path, data)
+            results[label(who, method, path)]['peak_kib'] = (tracemalloc.get_traced_memory()[1] - before) / 1024
+    finally:
+        tracemalloc.stop()
+    return results
+
+
+def report(results, baseline, tolerance, min_delta_ms):
+    """Print the results table, marking changes against ``baseline``; returns the regressed labels."""
+    regressed = []
+    print(f"\n{'route':<54} {'status':>16} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'stmts':>5} {'peak KiB':>9}")
+    for name, r in results.items():
+        notes = []
+        before = baseline.get(name)
+        if before:
+            for key in ('p50_ms', 'p95_ms'):
+                if r[key] > before[key] * (1 + tolerance) and r[key] - before[key] > min_delta_ms:
+                    notes.append(f"{key} {before[key]:.1f} -> {r[key]:.1f}")
+            if r['statements'] > before['statements']:
+                notes.append(f"statements {before['statements']} -> {r['statements']}")
+        if notes:
+            regressed.append(name)
+        print(f"{name[:54]:<54} {r['status']!s:>16} {r['p50_ms']:8.2f} {r['p95_ms']:8.2f} {r['p99_ms']:8.2f} "
+              f"{r['statements']:5d} {r['peak_kib']:9.0f}" + (f"  REGRESSED: {'; '.join(notes)}" if notes else ''))
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_volume_arguments(parser)
+    parser.add_argument('--database-url', help='Database already loaded by benchmarks.dataset; '
+                                               'a fresh throwaway SQLite file is generated otherwise.')
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--baseline', help='Baseline file (default: benchmarks/baselines/routes-<volumes>.json).')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--compare', action='store_true', help='Exit non-zero if any route regressed.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed latency growth, as a fraction.')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                        help='Latency growth below this is noise however large a fraction it is.')
+    args = parser.parse_args()
+    volumes = volumes_from(args)
+
+    # application reads its configuration at import time; cached pages would only time the cache
+    os.environ['DATABASE_URL'] = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'routes.db')
+    os.environ['RESPONSE_CACHE'] = '0'
+    from application import app, db
+    from database_updates import create_missing_indexes
+
+    with app.app_context():
+        if args.database_url:
+            ids = sample()
+        else:
+            db.create_all()
+            create_missing_indexes()
+            ids = generate(volumes, args.seed)
+        requests_to_run = routes(*ids)
+        print(f"Benchmarking {len(requests_to_run)} routes on {db.engine.dialect.name}, "
+              f"{args.iterations} requests each:")
+        results = measure(app, db, requests_to_run, args.iterations, args.warmup)
+
+    path = args.baseline or os.path.join(
+        BASELINE_DIR, f"routes-{volumes.users}u-{volumes.jobs}j-{volumes.applications}a-seed{args.seed}.json")
+    baseline = {}
+    if args.compare:
+        with open(path) as f:
+            baseline = json.load(f)['routes']
+    regressed = report(results, baseline, args.tolerance, args.min_delta_ms)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'volumes': volumes._asdict(), 'seed': args.seed, 'iterations': args.iterations,
+                       'python': sys.version.split()[0], 'routes': results}, f, indent=1)
+        print(f"\nBaseline saved to {path}")
+    if args.compare:
+        print(f"\n{len(regressed)} of {len(results)} routes regressed against {path}")
+    sys.exit(1 if args.compare and regressed else 0)
+
+
+if __name__ == '__main__':
+    main()
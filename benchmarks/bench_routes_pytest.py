@@ -0,0 +1,65 @@
+"""pytest-benchmark front end for benchmarks.bench_routes: one benchmark per route.
+
+Each route in check_query_plans.routes() is timed with pytest-benchmark on
+a generated dataset; the statement count and peak allocation measured by
+bench_routes.measure() are attached as extra_info. Baselines, comparisons
+and regression thresholds are pytest-benchmark's own:
+
+    pip install pytest-benchmark
+    pytest benchmarks/bench_routes_pytest.py --benchmark-autosave
+    pytest benchmarks/bench_routes_pytest.py --benchmark-compare --benchmark-compare-fail=median:25%
+
+The file name keeps it out of a plain ``pytest`` run; name it explicitly.
+Volumes default to benchmarks.dataset.Volumes and can be overridden with
+BENCH_<FIELD> environment variables (BENCH_JOBS=100000, BENCH_SEED=1, ...);
+BENCH_DATABASE_URL reuses a database already loaded by benchmarks.dataset.
+"""
+import os
+import tempfile
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from benchmarks.bench_routes import clients, label, measure, send  # noqa: E402
+from benchmarks.check_query_plans import routes  # noqa: E402
+from benchmarks.dataset import Volumes, generate, sample  # noqa: E402
+
+# The routes with placeholder ids, for test ids; the real ids come from the dataset
+ROUTES = routes('{seeker}', '{employer}', '{job}', '{application}')
+
+
+def volumes_from_env():
+    defaults = Volumes()
+    return Volumes(*(int(os.getenv('BENCH_' + field.upper(), getattr(defaults, field))) for field in Volumes._fields))
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    """(app, db, requests, clients by identity) on a generated or reused database."""
+    database_url = os.getenv('BENCH_DATABASE_URL')
+    # application reads its configuration at import time; cached pages would only time the cache
+    os.environ['DATABASE_URL'] = database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'routes.db')
+    os.environ['RESPONSE_CACHE'] = '0'
+    from application import app, db
+    from database_updates import create_missing_indexes
+
+    with app.app_context():
+        if database_url:
+            ids = sample()
+        else:
+            db.create_all()
+            create_missing_indexes()
+            ids = generate(volumes_from_env(), int(os.getenv('BENCH_SEED', '0')))
+        requests_to_run = routes(*ids)
+        yield app, db, requests_to_run, clients(app, requests_to_run)
+
+
+@pytest.mark.parametrize('index', range(len(ROUTES)), ids=[label(*route[:3]) for route in ROUTES])
+def test_route(benchmark, dataset, index):
+    app, db, requests_to_run, by_who = dataset
+    who, method, path, data = requests_to_run[index]
+    measured, = measure(app, db, [requests_to_run[index]], iterations=1, warmup=1).values()
+    benchmark.extra_info.update(status=str(measured['status']), statements=measured['statements'],
+                                peak_kib=round(measured['peak_kib']))
+    benchmark.pedantic(send, args=(by_who[who], method, path, data), rounds=30, warmup_rounds=3)
@@ -0,0 +1,91 @@
+"""Latency benchmark: FTS5 job search versus the legacy ilike scan on SQLite.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_search --jobs 200000 --queries 200
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, select, or_
+
+from application import db, User, Job
+from job_search import SQLiteFTSBackend
+from benchmarks.bench_matching import _skills
+
+TITLES = ['Software Engineer', 'Data Scientist', 'Frontend Engineer', 'DevOps Engineer',
+          'Mobile Developer', 'Marketing Specialist', 'HR Manager', 'Content Strategist',
+          'Sales Associate', 'Project Manager', 'Product Manager', 'Executive Assistant']
+WORDS = ('build scalable services analyze data lead teams design accessible interfaces '
+         'manage infrastructure drive growth support customers deliver projects').split()
+QUERIES = ['python', 'engineer', 'data*', 'manage*', '"project manager"', 'react testing',
+           '"scalable services"', 'kubernetes', 'sales', 'skill-1*']
+
+
+def seed(engine, n_jobs, seed=0):
+    rng = random.Random(seed)
+    db.Model.metadata.create_all(engine, tables=[User.__table__, Job.__table__])
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [{'id': 1, 'name': 'Bench', 'email': 'bench@luminate.com',
+                                                 'password_hash': '-', 'is_employer': True}])
+        for start in range(0, n_jobs, 10000):
+            conn.execute(Job.__table__.insert(), [{
+                'title': rng.choice(TITLES),
+                'company': f'Company {rng.randint(1, 5000)}',
+                'description': ' '.join(rng.choices(WORDS, k=30)),
+                'required_skills': ', '.join(_skills(rng, 3, 8)),
+                'location': 'Remote',
+                'employer_id': 1,
+            } for _ in range(start, min(n_jobs, start + 10000))])
+
+
+def legacy_search(conn, query):
+    # The pre-FTS /jobs query: leading-wildcard ilike, newest first
+    search = '%' + query.strip('"*') + '%'
+    stmt = select(Job.__table__.c.id).where(or_(
+        Job.__table__.c.title.ilike(search),
+        Job.__table__.c.company.ilike(search),
+        Job.__table__.c.required_skills.ilike(search),
+    )).order_by(Job.__table__.c.date_posted.desc())
+    return conn.execute(stmt).fetchall()
+
+
+def timed(fn, queries):
+    samples = []
+    for query in queries:
+        started = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=200_000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench_search.db')
+    engine = create_engine(f'sqlite:///{path}')
+    started = time.perf_counter()
+    seed(engine, args.jobs)
+    backend = SQLiteFTSBackend(engine)
+    backend.install()
+    print(f"seeded and indexed {args.jobs:,} jobs in {time.perf_counter() - started:.1f}s")
+
+    queries = [QUERIES[i % len(QUERIES)] for i in range(args.queries)]
+    with engine.connect() as conn:
+        p50, p95 = timed(lambda q: legacy_search(conn, q), queries)
+        print(f"ilike  p50={p50:8.2f}ms p95={p95:8.2f}ms")
+    p50, p95 = timed(lambda q: backend.search(q, limit=200), queries)
+    print(f"fts5   p50={p50:8.2f}ms p95={p95:8.2f}ms")
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
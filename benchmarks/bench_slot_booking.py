@@ -0,0 +1,116 @@
+"""Load test: hundreds of parallel bookings of one interview slot, of which exactly one may win.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_slot_booking --attempts 500 --threads 64 --rounds 5
+
+Uses a throwaway SQLite file unless --database-url points somewhere else
+(e.g. a scratch Postgres database; the schema is created there if missing).
+Exits non-zero if any slot was not booked exactly once or any attempt hit
+a database error (e.g. "database is locked").
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+
+def seed(app, db, models, attempts, rounds):
+    User, Job, Application, InterviewSlot = models
+    with app.app_context():
+        db.create_all()
+        employer = User(name='Bench Employer', email=f'employer-{time.time_ns()}@luminate.com',
+                        password_hash='-', is_employer=True)
+        db.session.add(employer)
+        db.session.flush()
+        job = Job(title='Load Test Engineer', company='Bench Co', description='-', required_skills='Python',
+                  location='Remote', employer_id=employer.id)
+        db.session.add(job)
+        db.session.flush()
+        start = datetime.utcnow() + timedelta(days=1)
+        slots = [InterviewSlot(employer_id=employer.id, start_time=start + timedelta(hours=i),
+                               end_time=start + timedelta(hours=i, minutes=30), is_booked=False)
+                 for i in range(rounds)]
+        db.session.add_all(slots)
+        stamp = time.time_ns()
+        seekers = [User(name=f'Candidate {i}', email=f'candidate-{stamp}-{i}@luminate.com', password_hash='-')
+                   for i in range(attempts * rounds)]
+        db.session.add_all(seekers)
+        db.session.flush()
+        applications = [Application(user_id=user.id, job_id=job.id, status='Pending') for user in seekers]
+        db.session.add_all(applications)
+        db.session.commit()
+        return employer.id, [slot.id for slot in slots], [a.id for a in applications]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--attempts', type=int, default=500, help='Booking attempts per slot.')
+    parser.add_argument('--threads', type=int, default=64)
+    parser.add_argument('--rounds', type=int, default=5, help='Slots to fight over, one after another.')
+    parser.add_argument('--database-url', default='sqlite:///' + os.path.join(tempfile.mkdtemp(), 'booking.db'))
+    args = parser.parse_args()
+
+    # application reads DATABASE_URL at import time
+    os.environ['DATABASE_URL'] = args.database_url
+    from application import app, db, User, Job, Application, InterviewSlot, Interview, book_interview_slot
+    from sqlalchemy.exc import IntegrityError, OperationalError
+
+    employer_id, slot_ids, application_ids = seed(app, db, (User, Job, Application, InterviewSlot),
+                                                  args.attempts, args.rounds)
+    print(f"{db.engine.dialect.name}: {args.attempts} attempts x {args.rounds} slots on {args.threads} threads")
+
+    def attempt(go, slot_id, application_id):
+        go.wait()
+        started = time.perf_counter()
+        with app.app_context():
+            try:
+                application = Application.query.get(application_id)
+                won = book_interview_slot(application, slot_id, employer_id) is not None
+                if won:
+                    db.session.commit()
+                else:
+                    db.session.rollback()
+                outcome = 'won' if won else 'lost'
+            except IntegrityError:
+                db.session.rollback()
+                outcome = 'lost'
+            except OperationalError:
+                db.session.rollback()
+                outcome = 'error'
+        return outcome, time.perf_counter() - started
+
+    failed = False
+    for round_no, slot_id in enumerate(slot_ids):
+        go = threading.Event()
+        batch = application_ids[round_no * args.attempts:(round_no + 1) * args.attempts]
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            futures = [pool.submit(attempt, go, slot_id, application_id) for application_id in batch]
+            started = time.perf_counter()
+            go.set()
+            results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - started
+
+        outcomes = [outcome for outcome, _ in results]
+        latencies = sorted(seconds for _, seconds in results)
+        with app.app_context():
+            booked = Interview.query.filter_by(slot_id=slot_id).count()
+            slot_taken = InterviewSlot.query.get(slot_id).is_booked
+        ok = outcomes.count('won') == 1 and booked == 1 and slot_taken and not outcomes.count('error')
+        failed = failed or not ok
+        print(f"slot {slot_id:6d}  {'ok  ' if ok else 'FAIL'}  won={outcomes.count('won')} "
+              f"lost={outcomes.count('lost')} errors={outcomes.count('error')} interviews={booked}  "
+              f"{len(batch) / elapsed:8.1f} attempts/s  "
+              f"p50={statistics.median(latencies) * 1000:6.1f}ms "
+              f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:6.1f}ms")
+
+    if failed:
+        raise SystemExit('FAIL: a slot was not booked exactly once, or an attempt hit a database error')
+
+
+if __name__ == '__main__':
+    main()
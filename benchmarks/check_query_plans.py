@@ -0,0 +1,174 @@
+"""Query plan regression check: every SQL statement the main routes issue must use an index.
+
+Generates a large dataset (benchmarks.dataset), requests each route as an
+anonymous visitor, a job seeker and an employer while recording the
+statements they send, then runs each SELECT/UPDATE/DELETE through EXPLAIN QUERY PLAN (SQLite) or EXPLAIN
+(PostgreSQL). Exits non-zero if any of them reads a table with a full scan,
+or if a route answers with a 4xx/5xx or raises: the statements it would
+have issued after the failure would otherwise go unchecked.
+
+Run from the repository root:
+
+    python -m benchmarks.check_query_plans --jobs 20000 --applications 200000
+
+Uses a throwaway SQLite file unless --database-url points at a scratch database.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+
+from benchmarks.dataset import add_volume_arguments, generate, volumes_from
+
+SQLITE_FULL_SCAN = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+
+# Scans that are intended: (table, statement pattern, why)
+ALLOWED_SCANS = [
+    ('job', r'^SELECT job\.id AS job_id, job\.required_skills AS job_required_skills, job\.location AS job_location '
+            r'FROM job$', 'MatchingEngine loads the job corpus once per process'),
+    ('job', r'^SELECT count\(\*\) AS count_1 FROM \(SELECT .* FROM job\s+LIMIT \?', 'bounded by its LIMIT'),
+    ('activity_unread_count', r'^SELECT activity_unread_count\.user_id .* FROM activity_unread_count LIMIT \?',
+     'ensure_unread_counts() checks for any row once per process'),
+    ('learning_resource',
+     r'FROM learning_resource LEFT OUTER JOIN skill .* ORDER BY learning_resource\.id(?: ASC| DESC)? LIMIT',
+     'first keyset page walks the primary key and stops at the LIMIT'),
+]
+
+
+def routes(seeker_id, employer_id, job_id, application_id):
+    """(who, method, path, data) for each request to trace."""
+    anonymous = [
+        ('GET', '/', None), ('GET', '/jobs', None), ('GET', '/jobs?q=engineer', None),
+        ('GET', '/jobs?skill=python', None), ('GET', f'/job/{job_id}', None), ('GET', '/login', None),
+        ('GET', '/register', None),
+    ]
+    seeker = [
+        ('GET', '/dashboard', None), ('GET', '/jobs', None), ('GET', f'/job/{job_id}', None),
+        ('GET', '/api/activities', None), ('GET', '/interviews', None), ('GET', '/profile', None), ('GET', '/skills', None),
+        ('GET', '/learning-resources', None), ('GET', '/results', None), ('GET', '/ai/job-matching', None),
+        ('GET', '/ai/resume-builder', None), ('GET', '/ai/interview-prep', None), ('GET', '/ai/career-path', None),
+        ('GET', f'/schedule_interview/{application_id}', None), ('GET', f'/apply/{job_id}', None),
+        ('POST', '/api/activities/mark-read', {}),
+    ]
+    employer = [
+        ('GET', '/employer/dashboard', None), ('GET', f'/view_applications/{job_id}', None),
+        ('GET', '/analytics', None), ('GET', '/all_applications', None), ('GET', '/manage_slots', None),
+        ('GET', '/api/slots', None), ('GET', '/interviews', None), ('GET', '/all_activities', None),
+        ('GET', '/post_job', None), ('GET', f'/schedule_interview_form/{application_id}', None),
+        ('GET', f'/view_applications/{job_id}/resumes.zip', None),
+        ('POST', f'/update_application_status/{application_id}', {'status': 'Reviewing'}),
+    ]
+    return ([(None, *r) for r in anonymous] + [((seeker_id, False), *r) for r in seeker] +
+            [((employer_id, True), *r) for r in employer])
+
+
+def trace(app, db, requests_to_trace):
+    """Send each request and collect the distinct statements it executes, keyed by statement text.
+
+    Returns the statements and the (label, status) of every request that
+    answered with a 4xx/5xx or raised (status is then the exception name).
+    """
+    from sqlalchemy import event
+    captured = {}
+    broken = []
+    current = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        verb = statement.lstrip().split(None, 1)[0].upper()
+        if verb in ('SELECT', 'UPDATE', 'DELETE') and not executemany:
+            captured.setdefault(statement, (parameters, current[0]))
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        for who, method, path, data in requests_to_trace:
+            client = app.test_client()
+            if who is not None:
+                with client.session_transaction() as session:
+                    session['user_id'], session['is_employer'] = who
+            label = f"{'employer' if who and who[1] else 'seeker' if who else 'anonymous'} {method} {path}"
+            current[:] = [label]
+            try:
+                status = client.open(path, method=method, data=data).status_code
+            except Exception as e:  # the statements issued before the failure are still checked
+                status = type(e).__name__
+            if not isinstance(status, int) or status >= 400:
+                broken.append((label, status))
+            print(f"  {status}  {label}")
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    return captured, broken
+
+
+def allowed(table, statement):
+    flat = ' '.join(statement.split())
+    return any(table == allowed_table and re.search(pattern, flat) for allowed_table, pattern, _ in ALLOWED_SCANS)
+
+
+def full_scans(db, statement, parameters, tables):
+    """Tables the plan of one statement reads without an index, other than ALLOWED_SCANS."""
+    conn = db.engine.connect()
+    try:
+        if db.engine.dialect.name == 'sqlite':
+            rows = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).fetchall()
+            return [m.group(1) for m in (SQLITE_FULL_SCAN.match(row[-1]) for row in rows)
+                    if m and m.group(1) in tables and not allowed(m.group(1), statement)]
+        plan = conn.exec_driver_sql('EXPLAIN (FORMAT JSON) ' + statement, parameters).scalar()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        scans, stack = [], [plan[0]['Plan']]
+        while stack:
+            node = stack.pop()
+            table = node.get('Relation Name')
+            if node.get('Node Type') == 'Seq Scan' and table in tables and not allowed(table, statement):
+                scans.append(table)
+            stack.extend(node.get('Plans', ()))
+        return scans
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_volume_arguments(parser)
+    parser.add_argument('--database-url', default='sqlite:///' + os.path.join(tempfile.mkdtemp(), 'plans.db'))
+    parser.add_argument('--allow', action='append', default=[], metavar='TABLE',
+                        help='Tolerate full scans of this (small) table; may be repeated.')
+    parser.add_argument('--allow-error', action='append', default=[], metavar='PATTERN',
+                        help='Tolerate a failing request whose label (e.g. "seeker GET /profile") '
+                             'matches this regular expression; may be repeated.')
+    args = parser.parse_args()
+
+    # application reads its configuration at import time; cached pages would hide their queries
+    os.environ['DATABASE_URL'] = args.database_url
+    os.environ['RESPONSE_CACHE'] = '0'
+    from application import app, db
+    from database_updates import create_missing_indexes
+
+    with app.app_context():
+        db.create_all()
+        create_missing_indexes()
+        sample = generate(volumes_from(args), args.seed)
+        print("Tracing routes:")
+        requests_to_trace = routes(*sample)
+        captured, broken = trace(app, db, requests_to_trace)
+        tables = set(db.Model.metadata.tables) - set(args.allow)
+        failures = 0
+        for statement, (parameters, label) in captured.items():
+            scans = full_scans(db, statement, parameters, tables)
+            if scans:
+                failures += 1
+                print(f"\nFULL SCAN of {', '.join(sorted(set(scans)))} in {label}:\n  "
+                      f"{' '.join(statement.split())[:400]}")
+        print(f"\n{len(captured)} distinct statements checked, {failures} with full table scans")
+        errors = [(label, status) for label, status in broken
+                  if not any(re.search(pattern, label) for pattern in args.allow_error)]
+        for label, status in errors:
+            print(f"FAILED REQUEST {status}: {label}")
+        print(f"{len(broken)} of {len(requests_to_trace)} requests failed, "
+              f"{len(errors)} of them not allowed by --allow-error")
+    sys.exit(1 if failures or errors else 0)
+
+
+if __name__ == '__main__':
+    main()
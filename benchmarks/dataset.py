@@ -0,0 +1,320 @@
+"""Deterministic synthetic dataset at production-like volumes for the benchmarks and plan checks.
+
+Jobs and job seekers are drawn from the curated postings in database_updates:
+each job is a variant of one curated role with most of its skills, seekers
+build a career around one role, and both pick up extra skills in proportion
+to how common they are across the roles. Applications favour recent jobs and
+active seekers, and every table has its own random stream, so the same seed
+and volumes always produce the same rows.
+
+Run from the repository root to load a scratch database:
+
+    python -m benchmarks.dataset --database-url sqlite:////tmp/large.db \\
+        --users 500000 --jobs 1000000 --applications 5000000 --activities 20000000
+
+The target database must be empty; derived tables (skill links, status
+counters, unread counts, analytics rollups, content hashes and the search
+index) are rebuilt from the generated rows afterwards.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from array import array
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import NamedTuple
+
+STATUS_WEIGHTS = {'Pending': 50, 'Reviewing': 22, 'Interview Scheduled': 10, 'Accepted': 5, 'Rejected': 13}
+SENIORITY = ('Junior ', '', '', 'Senior ', 'Lead ')
+ACTIVITY_MESSAGES = ('You applied for {}', 'Your application for {} is being reviewed',
+                     'New job matching your skills: {}', 'Interview scheduled for {}')
+CHUNK = 20_000
+
+
+class Volumes(NamedTuple):
+    users: int = 20_000
+    jobs: int = 20_000
+    applications: int = 200_000
+    activities: int = 200_000
+    slots_per_employer: int = 20
+    resources_per_skill: int = 5
+
+
+class Sample(NamedTuple):
+    """Ids of rows with data behind every page, for driving routes."""
+    seeker_id: int
+    employer_id: int
+    job_id: int
+    application_id: int
+
+
+def _roles():
+    from database_updates import CURATED_POSTINGS
+    from application import parse_skill_names
+    roles = [dict(p, skills=parse_skill_names(p['required_skills'])) for p in CURATED_POSTINGS]
+    popularity = {}
+    for role in roles:
+        for skill in role['skills']:
+            popularity[skill] = popularity.get(skill, 0) + 1
+    return roles, popularity
+
+
+def _skewed(rng, n, exponent=2.0):
+    """An index in [0, n) biased towards 0."""
+    return min(n - 1, int(n * rng.random() ** exponent))
+
+
+def _pick_skills(rng, role, popular, weights, keep, extra):
+    skills = rng.sample(role['skills'], keep)
+    for _ in range(extra):
+        skill = rng.choices(popular, weights)[0]
+        if skill not in skills:
+            skills.append(skill)
+    return skills
+
+
+def _insert(conn, table, rows, label):
+    started, done = time.perf_counter(), 0
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, CHUNK))
+        if not batch:
+            break
+        conn.execute(table.insert(), batch)
+        done += len(batch)
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<22} {done:>11,d} rows in {elapsed:7.1f}s ({done / max(elapsed, 1e-9):>9,.0f}/s)")
+    return done
+
+
+def _advance_sequences(conn, tables):
+    # Rows were inserted with explicit ids; move the serial sequences past them
+    if conn.dialect.name != 'postgresql':
+        return
+    for table in tables:
+        conn.exec_driver_sql(f"""SELECT setval(pg_get_serial_sequence('"{table}"', 'id'), """
+                             f"""(SELECT coalesce(max(id), 0) + 1 FROM "{table}"), false)""")
+
+
+def generate(volumes=Volumes(), seed=0, now=None):
+    """Bulk-load ``volumes`` of synthetic rows into the (empty) application database; returns a Sample.
+
+    Call inside an application context. ``now`` anchors every timestamp, so
+    pass a fixed datetime as well as a seed for byte-identical datasets.
+    """
+    from application import (db, User, Job, Application, Activity, InterviewSlot, Interview, Skill, JobSkill,
+                             UserSkill, PortfolioLink, LearningResource, ApplicationStatusEvent,
+                             get_search_backend)
+    from database_updates import (reconcile_application_counters, reconcile_unread_counts,
+                                  rebuild_analytics_rollups, backfill_job_content_hashes)
+
+    if db.session.query(Job.id).first() is not None or db.session.query(User.id).first() is not None:
+        raise ValueError('generate() needs an empty database')
+    now = (now or datetime.utcnow()).replace(microsecond=0)
+    roles, popularity = _roles()
+    popular, weights = list(popularity), list(popularity.values())
+    skill_ids = {name: i for i, name in enumerate(sorted(popularity), 1)}
+    n_employers = max(1, volumes.users // 40)
+    seekers = range(n_employers + 1, volumes.users + 1)
+    if volumes.applications > len(seekers) * volumes.jobs // 2:
+        raise ValueError('more applications than half of all (seeker, job) pairs')
+    statuses, status_weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+    conn = db.session.connection()
+    started = time.perf_counter()
+    print(f"Generating {volumes} with seed {seed}:")
+
+    def stream(name):
+        return random.Random(f'{seed}:{name}')
+
+    _insert(conn, Skill.__table__, ({'id': i, 'name': name} for name, i in skill_ids.items()), 'skill')
+    rng = stream('learning_resource')
+    _insert(conn, LearningResource.__table__, (
+        {'skill_id': skill_id, 'title': f'{name} {kind} {i + 1}', 'url': f'https://learn.example/{skill_id}/{i}',
+         'resource_type': kind}
+        for name, skill_id in skill_ids.items() for i in range(volumes.resources_per_skill)
+        for kind in [rng.choice(('Course', 'Certification', 'Article'))]), 'learning_resource')
+
+    rng = stream('user')
+    seeker_skills = {}
+
+    def users():
+        for i in range(1, volumes.users + 1):
+            role = rng.choice(roles)
+            if i <= n_employers:
+                yield {'id': i, 'name': f"{role['company']} Recruiting {i}", 'email': f'employer{i}@example.com',
+                       'password_hash': '-', 'is_employer': True, 'company': f"{role['company']} {i}",
+                       'title': 'Recruiter', 'location': role['location'], 'skills': None}
+                continue
+            skills = _pick_skills(rng, role, popular, weights, rng.randint(2, 4), rng.randint(0, 2))
+            seeker_skills[i] = skills
+            yield {'id': i, 'name': f'Seeker {i}', 'email': f'seeker{i}@example.com', 'password_hash': '-',
+                   'is_employer': False, 'company': None, 'title': f"{rng.choice(SENIORITY)}{role['title']}",
+                   'location': role['location'], 'skills': ', '.join(skills)}
+    _insert(conn, User.__table__, users(), 'user')
+    _insert(conn, UserSkill.__table__, (
+        {'user_id': user_id, 'skill_id': skill_ids[skill], 'is_verified': False}
+        for user_id, skills in seeker_skills.items() for skill in skills), 'user_skill')
+    _insert(conn, PortfolioLink.__table__, (
+        {'user_id': user_id, 'url': f'https://portfolio.example/{user_id}', 'description': 'Portfolio'}
+        for user_id in seekers if user_id % 4 == 0), 'portfolio_link')
+    del seeker_skills
+
+    # Jobs are posted at a steady rate over the last year, oldest first
+    rng = stream('job')
+    span = timedelta(days=365) / max(1, volumes.jobs)
+    job_employer = array('i', [0]) * (volumes.jobs + 1)
+    job_titles = []
+    job_skills = []
+
+    def jobs():
+        for i in range(1, volumes.jobs + 1):
+            role = rng.choice(roles)
+            employer_id = rng.randint(1, n_employers)
+            skills = _pick_skills(rng, role, popular, weights, rng.randint(3, 5), int(rng.random() < 0.3))
+            job_employer[i] = employer_id
+            title = f"{rng.choice(SENIORITY)}{role['title']}"
+            job_titles.append(title)
+            job_skills.append(skills)
+            yield {'id': i, 'title': title, 'company': f"{role['company']} {employer_id}",
+                   'description': role['description'], 'required_skills': ', '.join(skills),
+                   'location': role['location'], 'salary': role['salary'],
+                   'date_posted': now - span * (volumes.jobs - i), 'employer_id': employer_id}
+    _insert(conn, Job.__table__, jobs(), 'job')
+    _insert(conn, JobSkill.__table__, (
+        {'job_id': job_id, 'skill_id': skill_id}
+        for job_id, skills in enumerate(job_skills, 1) for skill_id in {skill_ids[s] for s in skills}), 'job_skill')
+    del job_skills
+
+    # Recent jobs and a core of active seekers account for most applications
+    def draw_applications():
+        # Seekers apply to a job at most once, as /apply enforces
+        rng = stream('application')
+        applied_to = set()
+        applicants = array('i', [0]) * (volumes.jobs + 1)
+        for i in range(1, volumes.applications + 1):
+            job_id = volumes.jobs - _skewed(rng, volumes.jobs, 3.0)
+            while applicants[job_id] == len(seekers):  # every seeker applied already; only small volumes get here
+                job_id = rng.randint(1, volumes.jobs)
+            applicants[job_id] += 1
+            seeker_id = seekers[_skewed(rng, len(seekers), 1.5)]
+            while seeker_id * (volumes.jobs + 1) + job_id in applied_to:
+                seeker_id = rng.choice(seekers)
+            applied_to.add(seeker_id * (volumes.jobs + 1) + job_id)
+            applied = min(now, now - span * (volumes.jobs - job_id) + timedelta(hours=rng.randint(1, 24 * 30)))
+            yield i, seeker_id, job_id, rng.choices(statuses, status_weights)[0], applied
+
+    interviews = []
+
+    def applications():
+        for i, seeker_id, job_id, status, applied in draw_applications():
+            if status == 'Interview Scheduled':
+                interviews.append((i, job_employer[job_id], applied))
+            yield {'id': i, 'user_id': seeker_id, 'job_id': job_id, 'status': status, 'date_applied': applied}
+
+    def status_events():
+        # Pending on application, then one timed move to the current status
+        event_rng = stream('application_status_event')
+        for i, _, job_id, status, applied in draw_applications():
+            row = {'application_id': i, 'job_id': job_id, 'employer_id': job_employer[job_id]}
+            yield dict(row, from_status=None, to_status='Pending', created_at=applied, seconds_in_previous=None)
+            if status != 'Pending':
+                waited = event_rng.randint(3600, 14 * 86400)
+                yield dict(row, from_status='Pending', to_status=status,
+                           created_at=min(now, applied + timedelta(seconds=waited)), seconds_in_previous=waited)
+    _insert(conn, Application.__table__, applications(), 'application')
+    _insert(conn, ApplicationStatusEvent.__table__, status_events(), 'application_status_event')
+
+    # Booked slots for the scheduled interviews, then open ones over the next two weeks
+    rng = stream('interview_slot')
+    slots = []
+    for application_id, employer_id, applied in interviews:
+        start = (applied + timedelta(days=rng.randint(2, 10))).replace(minute=0, second=0)
+        slots.append((employer_id, start, True, application_id))
+    for employer_id in range(1, n_employers + 1):
+        day = now.replace(hour=9, minute=0, second=0) + timedelta(days=1)
+        for i in range(volumes.slots_per_employer):
+            slots.append((employer_id, day + timedelta(days=i // 8, minutes=30 * (i % 8) + employer_id % 2 * 240),
+                          False, None))
+    _insert(conn, InterviewSlot.__table__, (
+        {'id': i, 'employer_id': employer_id, 'start_time': start, 'end_time': start + timedelta(minutes=30),
+         'is_booked': booked} for i, (employer_id, start, booked, _) in enumerate(slots, 1)), 'interview_slot')
+    _insert(conn, Interview.__table__, (
+        {'slot_id': i, 'application_id': application_id, 'status': 'Scheduled', 'notes': ''}
+        for i, (_, _, booked, application_id) in enumerate(slots, 1) if booked), 'interview')
+    del slots, interviews
+
+    # Activity is concentrated on active users; most of it older than a week has been read
+    rng = stream('activity')
+    activity_span = timedelta(days=90) / max(1, volumes.activities)
+
+    def activities():
+        for i in range(volumes.activities):
+            job_id = volumes.jobs - _skewed(rng, volumes.jobs, 3.0)
+            date = now - activity_span * (volumes.activities - i)
+            yield {'user_id': 1 + _skewed(rng, volumes.users, 1.5), 'job_id': job_id,
+                   'message': rng.choice(ACTIVITY_MESSAGES).format(job_titles[job_id - 1]), 'date': date,
+                   'is_read': rng.random() < (0.95 if now - date > timedelta(days=7) else 0.4)}
+    _insert(conn, Activity.__table__, activities(), 'activity')
+    del job_titles
+
+    _advance_sequences(conn, ('user', 'job', 'application', 'interview_slot', 'skill'))
+    db.session.commit()
+    print(f"Rows loaded in {time.perf_counter() - started:.1f}s; rebuilding derived tables:")
+    reconcile_application_counters()
+    reconcile_unread_counts()
+    rebuild_analytics_rollups()
+    backfill_job_content_hashes()
+    get_search_backend().rebuild()
+    if db.engine.dialect.name == 'sqlite':
+        db.session.execute('ANALYZE')
+    else:
+        db.session.connection().exec_driver_sql('ANALYZE')
+    db.session.commit()
+    print(f"Dataset ready in {time.perf_counter() - started:.1f}s")
+    return sample()
+
+
+def sample():
+    """A Sample from an already generated database: the newest job with an application, its employer
+    and its first application."""
+    from application import db, Job, Application
+    row = db.session.query(Job.id, Job.employer_id, Application.id, Application.user_id).\
+        join(Application, Application.job_id == Job.id).order_by(Job.id.desc(), Application.id).first()
+    if row is None:
+        raise ValueError('The database has no applications to sample; load it with benchmarks.dataset first')
+    job_id, employer_id, application_id, seeker_id = row
+    return Sample(seeker_id, employer_id, job_id, application_id)
+
+
+def add_volume_arguments(parser):
+    defaults = Volumes()
+    for field in Volumes._fields:
+        parser.add_argument('--' + field.replace('_', '-'), type=int, default=getattr(defaults, field))
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def volumes_from(args):
+    return Volumes(*(getattr(args, field) for field in Volumes._fields))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_volume_arguments(parser)
+    parser.add_argument('--database-url', default='sqlite:///' + os.path.join(tempfile.mkdtemp(), 'dataset.db'))
+    args = parser.parse_args()
+
+    # application reads DATABASE_URL at import time
+    os.environ['DATABASE_URL'] = args.database_url
+    from application import app, db
+    from database_updates import create_missing_indexes
+
+    with app.app_context():
+        db.create_all()
+        create_missing_indexes()
+        print(f"{generate(volumes_from(args), args.seed)} in {args.database_url}")
+
+
+if __name__ == '__main__':
+    main()
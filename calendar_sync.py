@@ -0,0 +1,185 @@
+import atexit
+import logging
+import queue
+import random
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest
+
+logger = logging.getLogger(__name__)
+
+# The Calendar API accepts at most 50 calls per batch request
+MAX_BATCH = 50
+DEFAULT_BATCH_URI = 'https://www.googleapis.com/batch/calendar/v3'
+TRANSIENT_STATUSES = {429, 500, 502, 503, 504}
+TRANSIENT_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded', 'backendError'}
+
+
+class InsertResult(NamedTuple):
+    event: Dict[str, Any]
+    response: Optional[Dict[str, Any]]
+    error: Optional[Exception]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _status(error: Exception) -> Optional[int]:
+    return getattr(getattr(error, 'resp', None), 'status', None)
+
+
+def is_transient(error: Exception) -> bool:
+    """Rate limits, 5xx and transport failures are retried; other API errors are final."""
+    if not isinstance(error, HttpError):
+        return True
+    status = _status(error)
+    if status in TRANSIENT_STATUSES:
+        return True
+    return status == 403 and any(d.get('reason') in TRANSIENT_REASONS for d in (error.error_details or [])
+                                 if isinstance(d, dict))
+
+
+def insert_events(service, events: List[Dict[str, Any]], calendar_id: str = 'primary',
+                  batch_uri: Optional[str] = None, max_retries: int = 5, backoff: float = 0.5,
+                  max_backoff: float = 32.0, sleep: Callable[[float], None] = time.sleep) -> List[InsertResult]:
+    """Insert events through the batch endpoint, MAX_BATCH per HTTP request.
+
+    Calls that fail transiently (or whose whole batch failed) are resent with
+    exponential backoff and jitter, up to ``max_retries`` more rounds. Every
+    event gets a client-side id first, so a resent insert that had in fact
+    succeeded comes back as 409 and is counted as done rather than duplicated.
+    Returns one InsertResult per event, in input order.
+    """
+    for event in events:
+        event.setdefault('id', uuid.uuid4().hex)  # hex is valid base32hex
+    results: List[Optional[InsertResult]] = [None] * len(events)
+    pending = list(range(len(events)))
+    attempt = 0
+    while pending:
+        retry = []
+        for start in range(0, len(pending), MAX_BATCH):
+            chunk = pending[start:start + MAX_BATCH]
+            outcome = {}
+
+            def collect(request_id, response, exception):
+                outcome[int(request_id)] = (response, exception)
+
+            batch = BatchHttpRequest(callback=collect, batch_uri=batch_uri or DEFAULT_BATCH_URI)
+            for i in chunk:
+                batch.add(service.events().insert(calendarId=calendar_id, body=events[i]), request_id=str(i))
+            try:
+                batch.execute()
+            except Exception as e:
+                logger.warning('Calendar batch of %d failed: %s', len(chunk), e)
+                outcome = {i: (None, e) for i in chunk}
+            for i in chunk:
+                response, error = outcome.get(i, (None, RuntimeError('missing from batch response')))
+                if error is not None and attempt and _status(error) == 409:
+                    response, error = {'id': events[i]['id']}, None
+                if error is None:
+                    results[i] = InsertResult(events[i], response, None)
+                elif attempt < max_retries and is_transient(error):
+                    retry.append(i)
+                else:
+                    results[i] = InsertResult(events[i], None, error)
+        if retry:
+            sleep(min(max_backoff, backoff * 2 ** attempt) * random.uniform(0.5, 1.0))
+        attempt += 1
+        pending = retry
+    return results
+
+
+class CalendarSync:
+    """Background sender that batches event inserts per user.
+
+    Request threads call ``put`` and return immediately. The worker gathers
+    what arrives within ``max_latency`` seconds, groups it by user, and sends
+    each group with insert_events() on the service leased by
+    ``lease_service(user_id, credentials)``, a context manager such as
+    CalendarClientPool.service.
+    ``callback(result)`` runs on the worker thread once an event is settled.
+    """
+
+    def __init__(self, lease_service: Callable[[Any, Any], Any], max_latency: float = 0.5,
+                 max_queue: int = 10000, **insert_options):
+        self.lease_service = lease_service
+        self.max_latency = max_latency
+        self.insert_options = insert_options
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def put(self, user_id, credentials, event: Dict[str, Any],
+            callback: Optional[Callable[[InsertResult], None]] = None):
+        if self._thread is None:
+            self._start()
+        self._queue.put((user_id, credentials, event, callback))
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='calendar-sync', daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def _collect(self):
+        items = [self._queue.get()]
+        deadline = time.monotonic() + self.max_latency
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return items
+
+    def _send(self, items):
+        by_user = {}
+        for item in items:
+            by_user.setdefault(item[0], []).append(item)
+        for user_id, group in by_user.items():
+            try:
+                with self.lease_service(user_id, group[-1][1]) as service:
+                    results = insert_events(service, [event for _, _, event, _ in group], **self.insert_options)
+            except Exception as e:
+                logger.exception('Calendar sync failed for user %s', user_id)
+                results = [InsertResult(event, None, e) for _, _, event, _ in group]
+            for (_, _, _, callback), result in zip(group, results):
+                if callback is not None:
+                    try:
+                        callback(result)
+                    except Exception:
+                        logger.exception('Calendar sync callback failed')
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            items = [item for item in batch if item is not None]
+            if items:
+                self._send(items)
+            for _ in batch:
+                self._queue.task_done()
+            if self._stopping.is_set() and self._queue.empty():
+                return
+
+    def flush(self):
+        """Block until every queued insert has been settled."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self._stopping.clear()
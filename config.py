@@ -6,4 +6,22 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     UPLOAD_FOLDER = 'static/uploads'
     MAX_CONTENT_LENGTH = 2 * 1024 * 1024  # 2MB
-    ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
\ No newline at end of file
+    ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
+
+    # Engine tuning, applied by db_engine.engine_options()
+    # SQLite: set on every new connection (WAL lets readers run alongside the writer)
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE') or 'WAL'
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS') or 'NORMAL'
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE') or 256 * 1024 * 1024)
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS') or 5000)
+    SQLITE_POOL_SIZE = int(os.environ.get('SQLITE_POOL_SIZE') or 5)
+    # PostgreSQL (and other server databases): QueuePool sizing per process
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 10)
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW') or 20)
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT') or 10)
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE') or 1800)
+    # Read-only replica for the read-heavy GET routes; "local" opens the primary
+    # read-only through a second engine, a stand-in for tests and development.
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    # After a write, that browser session reads from the primary for this long
+    REPLICA_STICKY_SECONDS = float(os.environ.get('REPLICA_STICKY_SECONDS') or 5)
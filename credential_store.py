@@ -0,0 +1,196 @@
+import atexit
+import base64
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+from google.auth.exceptions import RefreshError
+from google.oauth2.credentials import Credentials
+
+logger = logging.getLogger(__name__)
+
+
+def fernet_for(secret: str) -> Fernet:
+    """Fernet cipher for a configured key: a Fernet key as-is, any other string via SHA-256."""
+    try:
+        return Fernet(secret.encode() if isinstance(secret, str) else secret)
+    except ValueError:
+        return Fernet(base64.urlsafe_b64encode(hashlib.sha256(secret.encode()).digest()))
+
+
+def credentials_to_json(credentials: Credentials) -> str:
+    return json.dumps({
+        'token': credentials.token,
+        'refresh_token': credentials.refresh_token,
+        'token_uri': credentials.token_uri,
+        'client_id': credentials.client_id,
+        'client_secret': credentials.client_secret,
+        'scopes': list(credentials.scopes or []),
+        'expiry': credentials.expiry.isoformat() if credentials.expiry else None,
+    })
+
+
+def credentials_from_json(data: str) -> Credentials:
+    info = json.loads(data)
+    return Credentials(
+        token=info.get('token'),
+        refresh_token=info.get('refresh_token'),
+        token_uri=info.get('token_uri'),
+        client_id=info.get('client_id'),
+        client_secret=info.get('client_secret'),
+        scopes=info.get('scopes') or None,
+        expiry=datetime.fromisoformat(info['expiry']) if info.get('expiry') else None,
+    )
+
+
+class CredentialStore:
+    """OAuth credentials in a database table, encrypted with Fernet, behind a per-process TTL cache.
+
+    ``model`` is the CalendarCredential model (user_id, encrypted_credentials,
+    expiry, refreshable, updated_at). Cached entries are dropped on save/delete in this
+    process and expire after ``ttl`` seconds, so other hosts' writes show up
+    within that window. Users without stored credentials are not cached, so
+    an authorization completed on another host is seen on the next request.
+    Without a ``secret`` the store can be built, but reading or saving
+    credentials raises RuntimeError.
+    """
+
+    def __init__(self, db, model, secret: Optional[str], ttl: float = 300.0):
+        self.db = db
+        self.model = model
+        self.cipher = fernet_for(secret) if secret else None
+        self.ttl = ttl
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _require_cipher(self) -> Fernet:
+        if self.cipher is None:
+            raise RuntimeError('CALENDAR_CREDENTIAL_KEY must be set to store Google Calendar credentials')
+        return self.cipher
+
+    def get(self, user_id) -> Optional[Credentials]:
+        now = time.monotonic()
+        with self._lock:
+            item = self._cache.get(user_id)
+            if item is not None and item[1] > now:
+                return item[0]
+        cipher = self._require_cipher()
+        row = self.db.session.query(self.model.encrypted_credentials).filter(self.model.user_id == user_id).scalar()
+        if row is None:
+            return None
+        try:
+            credentials = credentials_from_json(cipher.decrypt(row).decode())
+        except InvalidToken:
+            logger.error('Stored calendar credentials for user %s cannot be decrypted', user_id)
+            return None
+        with self._lock:
+            self._cache[user_id] = (credentials, now + self.ttl)
+        return credentials
+
+    def save(self, user_id, credentials: Credentials, commit: bool = True):
+        encrypted = self._require_cipher().encrypt(credentials_to_json(credentials).encode())
+        row = self.model.query.get(user_id)
+        if row is None:
+            row = self.model(user_id=user_id)
+            self.db.session.add(row)
+        row.encrypted_credentials = encrypted
+        row.expiry = credentials.expiry
+        row.refreshable = bool(credentials.refresh_token)
+        row.updated_at = datetime.utcnow()
+        if commit:
+            self.db.session.commit()
+        with self._lock:
+            self._cache[user_id] = (credentials, time.monotonic() + self.ttl)
+
+    def delete(self, user_id, commit: bool = True):
+        self.model.query.filter(self.model.user_id == user_id).delete(synchronize_session=False)
+        if commit:
+            self.db.session.commit()
+        with self._lock:
+            self._cache.pop(user_id, None)
+
+    def mark_unrefreshable(self, user_id):
+        """Keep the refresher off credentials whose refresh failed until they are saved again."""
+        self.model.query.filter(self.model.user_id == user_id).update({'refreshable': False},
+                                                                       synchronize_session=False)
+        self.db.session.commit()
+
+    def expiring(self, margin: float, limit: int = 100):
+        """User ids whose access token expires within ``margin`` seconds, soonest first."""
+        cutoff = datetime.utcnow() + timedelta(seconds=margin)
+        return [user_id for (user_id,) in self.db.session.query(self.model.user_id).
+                filter(self.model.refreshable.is_(True), self.model.expiry < cutoff).
+                order_by(self.model.expiry).limit(limit)]
+
+
+class CredentialRefresher:
+    """Daemon thread that renews access tokens shortly before they expire.
+
+    Every ``interval`` seconds it refreshes the credentials expiring within
+    ``margin`` seconds and saves them back, so request paths find a valid
+    token and never wait on ``credentials.refresh()``.
+    """
+
+    def __init__(self, app, store: CredentialStore, refresh: Any, margin: float = 300.0, interval: float = 60.0):
+        self.app = app
+        self.store = store
+        self.refresh = refresh
+        self.margin = margin
+        self.interval = interval
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='credential-refresher', daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def refresh_due(self) -> int:
+        """Refresh every credential due within the margin; returns how many were renewed."""
+        renewed = 0
+        with self.app.app_context():
+            for user_id in self.store.expiring(self.margin):
+                credentials = self.store.get(user_id)
+                if credentials is None or not credentials.refresh_token:
+                    self.store.mark_unrefreshable(user_id)
+                    logger.warning('Calendar credentials for user %s have no refresh token', user_id)
+                    continue
+                try:
+                    self.refresh(credentials)
+                    self.store.save(user_id, credentials)
+                    renewed += 1
+                except RefreshError as e:
+                    # invalid_grant and the like: the user has to authorize again. Retryable
+                    # refresh errors (5xx, rate limits) are left for the next pass.
+                    self.store.db.session.rollback()
+                    if not e.retryable:
+                        self.store.mark_unrefreshable(user_id)
+                    logger.warning('Refreshing calendar credentials for user %s failed: %s', user_id, e)
+                except Exception as e:
+                    # Network errors and the like; the next pass tries again
+                    self.store.db.session.rollback()
+                    logger.warning('Refreshing calendar credentials for user %s failed: %s', user_id, e)
+        return renewed
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            try:
+                self.refresh_due()
+            except Exception:
+                logger.exception('Credential refresher pass failed')
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+        self._stopping.clear()
@@ -1,8 +1,17 @@
-from application import db, User, Job, Application, Activity, InterviewSlot, Interview
+from application import (
+    db, User, Job, Application, Activity, InterviewSlot, Interview,
+    JobStatusCount, EmployerStatusCount, ApplicationStatusEvent, JobDailyRollup, EmployerDailyRollup,
+    ActivityUnreadCount,
+)
 from datetime import datetime, timedelta
 from werkzeug.security import generate_password_hash
+from collections import namedtuple
+import glob
+import io
+import os
 import random
 import csv
+import time
 
 
 def add_sample_data():
@@ -10,6 +19,9 @@ def add_sample_data():
     print("Adding sample data to the database...")
 
     # Clear existing data
+    for model in (EmployerDailyRollup, JobDailyRollup, ApplicationStatusEvent, EmployerStatusCount, JobStatusCount,
+                  ActivityUnreadCount):
+        db.session.query(model).delete()
     db.session.query(Interview).delete()
     db.session.query(InterviewSlot).delete()
     db.session.query(Activity).delete()
@@ -219,15 +231,142 @@ def add_sample_data():
     ]
     db.session.add_all(activities)
     db.session.commit()
+    reconcile_application_counters()
+    rebuild_analytics_rollups()
+    reconcile_unread_counts()
 
     print("Sample data added successfully.")
 
 
-def import_jobs_from_csv(csv_path, employer_id=None):
-    """Import jobs from a CSV file into the Job table. If employer_id is None, assign to a default employer."""
-    from application import Job, db, User
-    from datetime import datetime
-    
+# Job columns written by the CSV importer, in COPY column order
+IMPORT_COLUMNS = ('id', 'title', 'company', 'description', 'required_skills', 'location', 'salary',
+                  'date_posted', 'employer_id')
+# Column limits from the Job model; longer values are rejected rather than truncated
+IMPORT_LIMITS = {'title': 100, 'company': 100, 'required_skills': 500, 'location': 100, 'salary': 50}
+
+ImportedJob = namedtuple('ImportedJob', 'id required_skills location')
+
+
+def _parse_job_row(row, employer_id):
+    """Map a Naukri-style CSV row to Job column values; raises ValueError for unusable rows."""
+    job = {
+        'title': (row.get('Job Title') or '').strip(),
+        'company': (row.get('Industry') or '').strip() or "Imported Company",
+        'description': (row.get('Role Category') or '').strip() or (row.get('Functional Area') or '').strip()
+        or "No description provided.",
+        'required_skills': (row.get('Key Skills') or '').replace('|', ',').strip(),
+        'location': (row.get('Location') or '').strip(),
+        'salary': (row.get('Job Salary') or '').strip(),
+        'employer_id': employer_id,
+    }
+    if not job['title']:
+        raise ValueError('missing Job Title')
+    for column, limit in IMPORT_LIMITS.items():
+        if len(job[column]) > limit:
+            raise ValueError(f'{column} longer than {limit} characters')
+    crawled = (row.get('Crawl Timestamp') or '').strip()
+    job['date_posted'] = datetime.strptime(crawled.split(' ')[0], '%Y-%m-%d') if crawled else datetime.utcnow()
+    return job
+
+
+def _allocate_job_ids(count):
+    """Reserve ids for a batch: the serial sequence on Postgres, max(id) + 1.. elsewhere.
+
+    The max(id) path is optimistic; a concurrent insert makes the batch fail
+    with an IntegrityError and the caller retries it with fresh ids.
+    """
+    from application import db, Job
+    connection = db.session.connection()
+    if connection.dialect.name == 'postgresql':
+        rows = connection.execute(db.text(
+            "SELECT nextval(pg_get_serial_sequence('job', 'id')) FROM generate_series(1, :n)"), {'n': count})
+        return [row[0] for row in rows]
+    start = (connection.execute(db.select(db.func.max(Job.id))).scalar() or 0) + 1
+    return list(range(start, start + count))
+
+
+def _copy_jobs(rows):
+    """COPY a batch into the job table through psycopg2 (Postgres only)."""
+    from application import db
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+    for row in rows:
+        writer.writerow([row[column] for column in IMPORT_COLUMNS])
+    buffer.seek(0)
+    cursor = db.session.connection().connection.cursor()
+    cursor.copy_expert(f"COPY job ({', '.join(IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _new_hashes(hashes):
+    """The subset of ``hashes`` not yet recorded in JobContentHash."""
+    from application import db, JobContentHash
+    hashes = list(hashes)
+    existing = set()
+    for start in range(0, len(hashes), 500):
+        chunk = hashes[start:start + 500]
+        existing.update(h for (h,) in db.session.query(JobContentHash.content_hash).
+                        filter(JobContentHash.content_hash.in_(chunk)))
+    return [h for h in hashes if h not in existing]
+
+
+def _write_job_batch(batch):
+    """Insert one batch of parsed rows keyed by content hash; returns the ImportedJob tuples written."""
+    from application import db, Job, JobContentHash, sync_job_skills, invalidate_after_commit
+    fresh = _new_hashes(batch)
+    if not fresh:
+        return []
+    rows = [batch[h] for h in fresh]
+    for row, job_id in zip(rows, _allocate_job_ids(len(rows))):
+        row['id'] = job_id
+    if db.session.connection().dialect.name == 'postgresql':
+        _copy_jobs(rows)
+    else:
+        db.session.execute(Job.__table__.insert(), [{column: row[column] for column in IMPORT_COLUMNS}
+                                                    for row in rows])
+    db.session.execute(JobContentHash.__table__.insert(),
+                       [{'content_hash': h, 'job_id': row['id']} for h, row in zip(fresh, rows)])
+    imported = [ImportedJob(row['id'], row['required_skills'], row['location']) for row in rows]
+    sync_job_skills(imported)
+    invalidate_after_commit('jobs')
+    return imported
+
+
+def backfill_job_content_hashes(batch_size=5000):
+    """Record content hashes for jobs created since the last import (posted, seeded or legacy rows)."""
+    from application import db, Job, JobContentHash, job_content_hash
+    last_id = db.session.query(db.func.max(JobContentHash.job_id)).scalar() or 0
+    count = 0
+    while True:
+        jobs = db.session.query(Job.id, Job.title, Job.company, Job.description, Job.required_skills,
+                                Job.location, Job.salary).\
+            filter(Job.id > last_id).order_by(Job.id).limit(batch_size).all()
+        if not jobs:
+            break
+        hashes = {}
+        for job_id, *fields in jobs:
+            hashes.setdefault(job_content_hash(*fields), job_id)
+        fresh = _new_hashes(hashes)
+        if fresh:
+            db.session.execute(JobContentHash.__table__.insert(),
+                               [{'content_hash': h, 'job_id': hashes[h]} for h in fresh])
+        db.session.commit()
+        last_id = jobs[-1][0]
+        count += len(fresh)
+    return count
+
+
+def import_jobs_from_csv(csv_path, employer_id=None, batch_size=5000, reject_path=None):
+    """Stream jobs from a CSV file into the Job table. If employer_id is None, assign to a default employer.
+
+    Rows are parsed and written in batches of ``batch_size`` with Core
+    executemany (COPY on Postgres), each batch in its own transaction, so memory
+    stays flat and a bad batch only loses itself. Rows whose content hash is
+    already known are skipped. Unparseable rows and rows of failed batches go to
+    ``reject_path`` (default: ``<csv_path>.rejects.csv``) with a reject_reason.
+    """
+    from application import Job, db, User, JobContentHash, matching_engine, job_content_hash
+    from sqlalchemy.exc import IntegrityError
+
     # Find or create a default employer if not provided
     if employer_id is None:
         employer = User.query.filter_by(email="imported_jobs@luminate.com").first()
@@ -245,31 +384,170 @@ def import_jobs_from_csv(csv_path, employer_id=None):
             db.session.commit()
         employer_id = employer.id
 
-    with open(csv_path, newline='', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
-        count = 0
-        for row in reader:
-            # Map CSV columns to Job fields
-            job = Job(
-                title=row.get('Job Title', '').strip(),
-                company=row.get('Industry', '').strip() or "Imported Company",
-                description=row.get('Role Category', '').strip() or row.get('Functional Area', '').strip() or "No description provided.",
-                required_skills=row.get('Key Skills', '').replace('|', ',').strip(),
-                location=row.get('Location', '').strip(),
-                salary=row.get('Job Salary', '').strip(),
-                date_posted=datetime.strptime(row.get('Crawl Timestamp', '').split(' ')[0], '%Y-%m-%d') if row.get('Crawl Timestamp') else datetime.utcnow(),
-                employer_id=employer_id
-            )
-            # Optionally, add a flag for imported jobs if you add such a column
-            db.session.add(job)
-            count += 1
-        db.session.commit()
-        print(f"Imported {count} jobs from {csv_path}")
+    JobContentHash.__table__.create(db.engine, checkfirst=True)
+    backfill_job_content_hashes()
+
+    reject_path = reject_path or csv_path + '.rejects.csv'
+    stats = {'read': 0, 'inserted': 0, 'duplicates': 0, 'rejected': 0}
+    started = time.perf_counter()
+    reject_file = reject_writer = None
+
+    def reject(rows, reason):
+        nonlocal reject_file, reject_writer
+        if reject_writer is None:
+            reject_file = open(reject_path, 'w', newline='', encoding='utf-8')
+            reject_writer = csv.DictWriter(reject_file, fieldnames=reader.fieldnames + ['reject_reason'],
+                                           extrasaction='ignore')
+            reject_writer.writeheader()
+        for raw in rows:
+            reject_writer.writerow(dict(raw, reject_reason=reason))
+        stats['rejected'] += len(rows)
+
+    def flush(batch, raw_rows):
+        # batch: content hash -> parsed row (in-batch duplicates already dropped)
+        for attempt in (1, 2):
+            try:
+                imported = _write_job_batch(batch)
+                db.session.commit()
+            except IntegrityError as e:
+                db.session.rollback()
+                if attempt == 1:
+                    continue  # ids taken by a concurrent insert; reallocate and retry
+                reject(raw_rows, f'batch failed: {e.orig}')
+                return
+            except Exception as e:
+                db.session.rollback()
+                reject(raw_rows, f'batch failed: {e}')
+                return
+            break
+        matching_engine.add_jobs(imported)
+        stats['inserted'] += len(imported)
+        stats['duplicates'] += len(raw_rows) - len(imported)
+        elapsed = time.perf_counter() - started
+        print(f"  {stats['read']:,} rows read, {stats['inserted']:,} inserted "
+              f"({stats['read'] / elapsed:,.0f} rows/s)")
+
+    try:
+        with open(csv_path, newline='', encoding='utf-8') as csvfile:
+            reader = csv.DictReader(csvfile)
+            batch, raw_rows = {}, []
+            for row in reader:
+                stats['read'] += 1
+                try:
+                    job = _parse_job_row(row, employer_id)
+                except ValueError as e:
+                    reject([row], str(e))
+                    continue
+                key = job_content_hash(job['title'], job['company'], job['description'],
+                                       job['required_skills'], job['location'], job['salary'])
+                batch.setdefault(key, job)
+                raw_rows.append(row)
+                if len(raw_rows) >= batch_size:
+                    flush(batch, raw_rows)
+                    batch, raw_rows = {}, []
+            if raw_rows:
+                flush(batch, raw_rows)
+    finally:
+        if reject_file is not None:
+            reject_file.close()
+
+    elapsed = time.perf_counter() - started
+    stats['seconds'] = round(elapsed, 2)
+    stats['rows_per_sec'] = round(stats['read'] / elapsed) if elapsed else 0
+    print(f"Imported {stats['inserted']} jobs from {csv_path} "
+          f"({stats['duplicates']} duplicates skipped, {stats['rejected']} rejected, "
+          f"{stats['rows_per_sec']:,} rows/s)")
+    if stats['rejected']:
+        print(f"Rejected rows written to {reject_path}")
+    return stats
+
+
+CURATED_POSTINGS = [
+    # 5 technical roles
+    {
+        'title': 'Software Engineer', 'company': 'TechCorp',
+        'description': 'Build scalable backend services and REST APIs.',
+        'required_skills': 'Python, Flask, SQL, Docker, AWS', 'location': 'Remote', 'salary': '$110,000 - $140,000'
+    },
+    {
+        'title': 'Data Scientist', 'company': 'Insight Labs',
+        'description': 'Develop ML models and analyze experimental results.',
+        'required_skills': 'Python, Pandas, Scikit-learn, SQL, Statistics', 'location': 'San Francisco, CA', 'salary': '$130,000 - $160,000'
+    },
+    {
+        'title': 'Frontend Engineer', 'company': 'PixelWorks',
+        'description': 'Build accessible UI and design system components.',
+        'required_skills': 'JavaScript, React, CSS, Accessibility, Testing', 'location': 'New York, NY', 'salary': '$100,000 - $130,000'
+    },
+    {
+        'title': 'DevOps Engineer', 'company': 'CloudOps',
+        'description': 'Manage CI/CD, infrastructure as code, and monitoring.',
+        'required_skills': 'Docker, Kubernetes, Terraform, AWS, Monitoring', 'location': 'Austin, TX', 'salary': '$120,000 - $150,000'
+    },
+    {
+        'title': 'Mobile Developer', 'company': 'Appify',
+        'description': 'Develop cross-platform mobile applications.',
+        'required_skills': 'Flutter, Dart, REST, CI/CD, UX', 'location': 'Remote', 'salary': '$95,000 - $125,000'
+    },
+    # 5 non-technical roles
+    {
+        'title': 'Marketing Specialist', 'company': 'BrightBrand',
+        'description': 'Plan and execute digital marketing campaigns.',
+        'required_skills': 'SEO, SEM, Analytics, Copywriting, Social Media', 'location': 'Remote', 'salary': '$65,000 - $85,000'
+    },
+    {
+        'title': 'HR Manager', 'company': 'PeopleFirst',
+        'description': 'Lead recruitment and employee engagement programs.',
+        'required_skills': 'Recruitment, Onboarding, Policy, Communication, Analytics', 'location': 'Chicago, IL', 'salary': '$80,000 - $100,000'
+    },
+    {
+        'title': 'Content Strategist', 'company': 'StoryLine',
+        'description': 'Develop content strategies and editorial calendars.',
+        'required_skills': 'Content, SEO, Analytics, Communication, Project Management', 'location': 'Remote', 'salary': '$70,000 - $90,000'
+    },
+    {
+        'title': 'Sales Associate', 'company': 'DealMakers',
+        'description': 'Drive pipeline growth and client relationships.',
+        'required_skills': 'CRM, Communication, Negotiation, Prospecting, Reporting', 'location': 'Dallas, TX', 'salary': '$55,000 - $75,000 + commission'
+    },
+    {
+        'title': 'Customer Support Specialist', 'company': 'HelpHub',
+        'description': 'Troubleshoot issues and ensure customer satisfaction.',
+        'required_skills': 'Communication, Ticketing, Product Knowledge, Empathy, Writing', 'location': 'Remote', 'salary': '$50,000 - $65,000'
+    },
+    # 3 managerial positions
+    {
+        'title': 'Project Manager', 'company': 'PlanIt',
+        'description': 'Lead cross-functional teams and deliver projects on time.',
+        'required_skills': 'Agile, Communication, Risk Management, Planning, Reporting', 'location': 'Seattle, WA', 'salary': '$100,000 - $130,000'
+    },
+    {
+        'title': 'Department Head', 'company': 'OpsCentral',
+        'description': 'Own department strategy and outcomes.',
+        'required_skills': 'Leadership, Strategy, Budgeting, Communication, Analytics', 'location': 'Boston, MA', 'salary': '$140,000 - $180,000'
+    },
+    {
+        'title': 'Product Manager', 'company': 'Visionary',
+        'description': 'Define product roadmap and deliver customer value.',
+        'required_skills': 'Roadmap, UX, Analytics, Communication, Prioritization', 'location': 'Remote', 'salary': '$120,000 - $150,000'
+    },
+    # 2 administrative roles
+    {
+        'title': 'Office Administrator', 'company': 'DailyOps',
+        'description': 'Manage office operations and scheduling.',
+        'required_skills': 'Scheduling, Communication, Tools, Organization, Reporting', 'location': 'Remote', 'salary': '$45,000 - $60,000'
+    },
+    {
+        'title': 'Executive Assistant', 'company': 'C-Suite Partners',
+        'description': 'Support executives with logistics and coordination.',
+        'required_skills': 'Calendar, Travel, Communication, Confidentiality, Tools', 'location': 'Los Angeles, CA', 'salary': '$60,000 - $80,000'
+    },
+]
 
 
 def add_curated_job_postings():
     """Add 15 diverse curated job postings if fewer exist."""
-    from application import Job, User, db
+    from application import Job, User, db, matching_engine, sync_job_skills
     existing = Job.query.count()
     if existing >= 15:
         print(f"Jobs already seeded: {existing}")
@@ -289,89 +567,8 @@ def add_curated_job_postings():
         db.session.add(employer)
         db.session.commit()
 
-    postings = [
-        # 5 technical roles
-        {
-            'title': 'Software Engineer', 'company': 'TechCorp',
-            'description': 'Build scalable backend services and REST APIs.',
-            'required_skills': 'Python, Flask, SQL, Docker, AWS', 'location': 'Remote', 'salary': '$110,000 - $140,000'
-        },
-        {
-            'title': 'Data Scientist', 'company': 'Insight Labs',
-            'description': 'Develop ML models and analyze experimental results.',
-            'required_skills': 'Python, Pandas, Scikit-learn, SQL, Statistics', 'location': 'San Francisco, CA', 'salary': '$130,000 - $160,000'
-        },
-        {
-            'title': 'Frontend Engineer', 'company': 'PixelWorks',
-            'description': 'Build accessible UI and design system components.',
-            'required_skills': 'JavaScript, React, CSS, Accessibility, Testing', 'location': 'New York, NY', 'salary': '$100,000 - $130,000'
-        },
-        {
-            'title': 'DevOps Engineer', 'company': 'CloudOps',
-            'description': 'Manage CI/CD, infrastructure as code, and monitoring.',
-            'required_skills': 'Docker, Kubernetes, Terraform, AWS, Monitoring', 'location': 'Austin, TX', 'salary': '$120,000 - $150,000'
-        },
-        {
-            'title': 'Mobile Developer', 'company': 'Appify',
-            'description': 'Develop cross-platform mobile applications.',
-            'required_skills': 'Flutter, Dart, REST, CI/CD, UX', 'location': 'Remote', 'salary': '$95,000 - $125,000'
-        },
-        # 5 non-technical roles
-        {
-            'title': 'Marketing Specialist', 'company': 'BrightBrand',
-            'description': 'Plan and execute digital marketing campaigns.',
-            'required_skills': 'SEO, SEM, Analytics, Copywriting, Social Media', 'location': 'Remote', 'salary': '$65,000 - $85,000'
-        },
-        {
-            'title': 'HR Manager', 'company': 'PeopleFirst',
-            'description': 'Lead recruitment and employee engagement programs.',
-            'required_skills': 'Recruitment, Onboarding, Policy, Communication, Analytics', 'location': 'Chicago, IL', 'salary': '$80,000 - $100,000'
-        },
-        {
-            'title': 'Content Strategist', 'company': 'StoryLine',
-            'description': 'Develop content strategies and editorial calendars.',
-            'required_skills': 'Content, SEO, Analytics, Communication, Project Management', 'location': 'Remote', 'salary': '$70,000 - $90,000'
-        },
-        {
-            'title': 'Sales Associate', 'company': 'DealMakers',
-            'description': 'Drive pipeline growth and client relationships.',
-            'required_skills': 'CRM, Communication, Negotiation, Prospecting, Reporting', 'location': 'Dallas, TX', 'salary': '$55,000 - $75,000 + commission'
-        },
-        {
-            'title': 'Customer Support Specialist', 'company': 'HelpHub',
-            'description': 'Troubleshoot issues and ensure customer satisfaction.',
-            'required_skills': 'Communication, Ticketing, Product Knowledge, Empathy, Writing', 'location': 'Remote', 'salary': '$50,000 - $65,000'
-        },
-        # 3 managerial positions
-        {
-            'title': 'Project Manager', 'company': 'PlanIt',
-            'description': 'Lead cross-functional teams and deliver projects on time.',
-            'required_skills': 'Agile, Communication, Risk Management, Planning, Reporting', 'location': 'Seattle, WA', 'salary': '$100,000 - $130,000'
-        },
-        {
-            'title': 'Department Head', 'company': 'OpsCentral',
-            'description': 'Own department strategy and outcomes.',
-            'required_skills': 'Leadership, Strategy, Budgeting, Communication, Analytics', 'location': 'Boston, MA', 'salary': '$140,000 - $180,000'
-        },
-        {
-            'title': 'Product Manager', 'company': 'Visionary',
-            'description': 'Define product roadmap and deliver customer value.',
-            'required_skills': 'Roadmap, UX, Analytics, Communication, Prioritization', 'location': 'Remote', 'salary': '$120,000 - $150,000'
-        },
-        # 2 administrative roles
-        {
-            'title': 'Office Administrator', 'company': 'DailyOps',
-            'description': 'Manage office operations and scheduling.',
-            'required_skills': 'Scheduling, Communication, Tools, Organization, Reporting', 'location': 'Remote', 'salary': '$45,000 - $60,000'
-        },
-        {
-            'title': 'Executive Assistant', 'company': 'C-Suite Partners',
-            'description': 'Support executives with logistics and coordination.',
-            'required_skills': 'Calendar, Travel, Communication, Confidentiality, Tools', 'location': 'Los Angeles, CA', 'salary': '$60,000 - $80,000'
-        },
-    ]
-
-    for p in postings:
+    seeded = []
+    for p in CURATED_POSTINGS:
         job = Job(
             title=p['title'],
             company=p['company'],
@@ -382,8 +579,232 @@ def add_curated_job_postings():
             employer_id=employer.id,
         )
         db.session.add(job)
+        seeded.append(job)
+    db.session.flush()
+    sync_job_skills(seeded)
+    matching_engine.add_jobs(seeded)
+    db.session.commit()
+    print(f"Seeded {len(CURATED_POSTINGS)} curated jobs.")
+
+
+def backfill_job_skills(batch_size=500):
+    """Populate JobSkill rows from every Job's comma-separated required_skills."""
+    from application import Job, db, sync_job_skills
+    last_id = 0
+    count = 0
+    while True:
+        jobs = Job.query.filter(Job.id > last_id).order_by(Job.id).limit(batch_size).all()
+        if not jobs:
+            break
+        sync_job_skills(jobs)
+        last_id = jobs[-1].id
+        count += len(jobs)
+        db.session.commit()
+    print(f"Backfilled skills for {count} jobs")
+    return count
+
+
+def _index_names(conn):
+    # The inspector skips expression indexes such as ix_skill_name_lower, so ask the catalog directly
+    dialect = conn.dialect.name
+    if dialect == 'sqlite':
+        return {name for (name,) in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    if dialect == 'postgresql':
+        return {name for (name,) in conn.exec_driver_sql(
+            "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()")}
+    from sqlalchemy import inspect
+    inspector = inspect(conn)
+    return {index['name'] for table in inspector.get_table_names() for index in inspector.get_indexes(table)}
+
+
+def create_missing_indexes():
+    """Create every index the models declare that the database does not have yet.
+
+    create_all() only builds indexes along with new tables, so databases
+    created before an index was declared need this. On PostgreSQL the indexes
+    are built CONCURRENTLY, outside a transaction, so writers are not blocked.
+    """
+    from application import db
+    concurrent = db.engine.dialect.name == 'postgresql'
+    created = []
+    with db.engine.connect() as conn:
+        if concurrent:
+            conn = conn.execution_options(isolation_level='AUTOCOMMIT')
+        existing = _index_names(conn)
+        for table in db.Model.metadata.sorted_tables:
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                if index.name in existing:
+                    continue
+                if concurrent:
+                    index.dialect_options['postgresql']['concurrently'] = True
+                index.create(conn)
+                created.append(index.name)
+    print(f"Created {len(created)} missing indexes" + (f": {', '.join(created)}" if created else ""))
+    return created
+
+
+def reconcile_application_counters():
+    """Rebuild JobStatusCount and EmployerStatusCount from Application rows and report drift."""
+    from application import db, Application, Job, JobStatusCount, EmployerStatusCount
+    per_job = db.session.query(Application.job_id, Application.status, db.func.count(Application.id)).\
+        filter(Application.status.isnot(None)).\
+        group_by(Application.job_id, Application.status).all()
+    per_employer = db.session.query(Job.employer_id, Application.status, db.func.count(Application.id)).\
+        join(Job, Application.job_id == Job.id).\
+        filter(Application.status.isnot(None)).\
+        group_by(Job.employer_id, Application.status).all()
+
+    drift = 0
+    for model, key, rows in ((JobStatusCount, 'job_id', per_job),
+                             (EmployerStatusCount, 'employer_id', per_employer)):
+        expected = {(owner_id, status): count for owner_id, status, count in rows}
+        current = {(getattr(row, key), row.status): row.count for row in model.query}
+        drift += sum(1 for k in expected.keys() | current.keys() if expected.get(k, 0) != current.get(k, 0))
+        model.query.delete()
+        if expected:
+            db.session.execute(model.__table__.insert(), [
+                {key: owner_id, 'status': status, 'count': count}
+                for (owner_id, status), count in expected.items()
+            ])
+    db.session.commit()
+    print(f"Reconciled application counters: {drift} rows corrected")
+    return drift
+
+
+def ensure_application_counters():
+    """Reconcile the application counters when applications exist but no counter row does.
+
+    create_all() adds the counter tables to an existing database empty, and
+    the first status change would then decrement from zero. Returns whether
+    a reconcile ran.
+    """
+    from application import db, Application, JobStatusCount
+    if db.session.query(JobStatusCount.job_id).first() is not None:
+        return False
+    if db.session.query(Application.id).filter(Application.status.isnot(None)).first() is None:
+        return False
+    reconcile_application_counters()
+    return True
+
+
+def ensure_unread_counts():
+    """Reconcile ActivityUnreadCount when unread activities exist but no counter row does.
+
+    create_all() adds the table to an existing database empty, and the navbar
+    badge would read 0 until someone ran reconcile-unread-counts. Returns
+    whether a reconcile ran.
+    """
+    from application import db, Activity, ActivityUnreadCount
+    if db.session.query(ActivityUnreadCount.user_id).first() is not None:
+        return False
+    unread = db.or_(Activity.is_read.is_(False), Activity.is_read.is_(None))
+    if db.session.query(Activity.id).filter(unread).first() is None:
+        return False
+    reconcile_unread_counts()
+    return True
+
+
+def reconcile_unread_counts():
+    """Recompute ActivityUnreadCount from Activity.is_read and report drift."""
+    from application import db, Activity, ActivityUnreadCount
+    expected = dict(db.session.query(Activity.user_id, db.func.count(Activity.id)).
+                    filter(db.or_(Activity.is_read.is_(False), Activity.is_read.is_(None))).
+                    group_by(Activity.user_id).all())
+    current = dict(db.session.query(ActivityUnreadCount.user_id, ActivityUnreadCount.count).all())
+    drift = sum(1 for k in expected.keys() | current.keys() if expected.get(k, 0) != current.get(k, 0))
+    ActivityUnreadCount.query.delete()
+    if expected:
+        db.session.execute(ActivityUnreadCount.__table__.insert(),
+                           [{'user_id': user_id, 'count': count} for user_id, count in expected.items()])
+    db.session.commit()
+    print(f"Reconciled unread activity counts: {drift} users corrected")
+    return drift
+
+
+def rebuild_analytics_rollups(batch_size=5000):
+    """Recompute JobDailyRollup and EmployerDailyRollup by replaying ApplicationStatusEvent.
+
+    Applications without any event (created before the log existed) first get
+    synthetic events at date_applied: an entry into Pending and, if they have
+    moved on, an untimed transition to their current status.
+    """
+    from application import db, Application, Job, ApplicationStatusEvent, JobDailyRollup, EmployerDailyRollup
+    from datetime import datetime
+
+    unlogged = db.session.query(Application.id, Application.job_id, Job.employer_id,
+                                Application.status, Application.date_applied).\
+        join(Job, Application.job_id == Job.id).\
+        outerjoin(ApplicationStatusEvent, ApplicationStatusEvent.application_id == Application.id).\
+        filter(ApplicationStatusEvent.id.is_(None), Application.status.isnot(None)).all()
+    synthetic = []
+    for application_id, job_id, employer_id, status, date_applied in unlogged:
+        transitions = [(None, 'Pending')] + ([('Pending', status)] if status != 'Pending' else [])
+        for from_status, to_status in transitions:
+            synthetic.append({
+                'application_id': application_id,
+                'job_id': job_id,
+                'employer_id': employer_id,
+                'from_status': from_status,
+                'to_status': to_status,
+                'created_at': date_applied or datetime.utcnow(),
+                'seconds_in_previous': None,
+            })
+    if synthetic:
+        db.session.execute(ApplicationStatusEvent.__table__.insert(), synthetic)
+
+    per_job = {}
+    per_employer = {}
+    events = db.session.query(ApplicationStatusEvent).order_by(ApplicationStatusEvent.id).yield_per(batch_size)
+    for event in events:
+        day = event.created_at.date()
+        for totals, owner_id in ((per_job, event.job_id), (per_employer, event.employer_id)):
+            entry = totals.setdefault((day, owner_id, event.to_status), [0, 0, 0])
+            entry[0] += 1
+            # Untimed (synthetic) transitions count as entries only
+            if event.from_status is not None and event.seconds_in_previous is not None:
+                entry = totals.setdefault((day, owner_id, event.from_status), [0, 0, 0])
+                entry[1] += 1
+                entry[2] += event.seconds_in_previous
+
+    for model, key, totals in ((JobDailyRollup, 'job_id', per_job), (EmployerDailyRollup, 'employer_id', per_employer)):
+        model.query.delete()
+        rows = [{'day': day, key: owner_id, 'status': status,
+                 'entered': entered, 'exited': exited, 'seconds_in_stage': seconds}
+                for (day, owner_id, status), (entered, exited, seconds) in totals.items()]
+        for start in range(0, len(rows), batch_size):
+            db.session.execute(model.__table__.insert(), rows[start:start + batch_size])
     db.session.commit()
-    print(f"Seeded {len(postings)} curated jobs.")
+    print(f"Rebuilt analytics rollups: {len(per_job)} job rows, {len(per_employer)} employer rows "
+          f"({len(unlogged)} applications backfilled into the event log)")
+    return len(per_job), len(per_employer)
+
+
+def import_pickled_credentials(directory='.', remove=True):
+    """Import legacy token_<user_id>.pickle files into CalendarCredential.
+
+    Files are only removed once their row is committed; unreadable files and
+    files for unknown users are reported and left in place.
+    """
+    from application import db, User, credential_store
+    from google_calendar import load_pickled_credentials
+    imported = 0
+    for path in sorted(glob.glob(os.path.join(directory, 'token_*.pickle'))):
+        name = os.path.basename(path)[len('token_'):-len('.pickle')]
+        if not name.isdigit() or User.query.get(int(name)) is None:
+            print(f"Skipping {path}: no matching user")
+            continue
+        try:
+            credentials = load_pickled_credentials(path)
+            credential_store.save(int(name), credentials)
+        except Exception as e:
+            db.session.rollback()
+            print(f"Skipping {path}: {e}")
+            continue
+        imported += 1
+        if remove:
+            os.remove(path)
+    print(f"Imported {imported} calendar credentials from {directory}")
+    return imported
 
 
 if __name__ == "__main__":
@@ -0,0 +1,131 @@
+import sqlite3
+from urllib.parse import quote
+
+from flask_sqlalchemy import SQLAlchemy, SignallingSession
+from sqlalchemy import create_engine, event, orm
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+
+def _in_memory(url) -> bool:
+    return url.database in (None, '', ':memory:')
+
+
+def engine_options(database_url, config):
+    """create_engine() keyword arguments for ``database_url``, tuned from ``config`` (a config.Config)."""
+    url = make_url(database_url)
+    if url.get_backend_name() == 'sqlite':
+        if _in_memory(url):
+            return {}  # Flask-SQLAlchemy keeps in-memory databases on a single StaticPool connection
+        # Pool file connections too, so the pragmas below run once per connection, not per request
+        return {
+            'poolclass': QueuePool,
+            'pool_size': config.SQLITE_POOL_SIZE,
+            'max_overflow': config.DB_MAX_OVERFLOW,
+            'pool_timeout': config.DB_POOL_TIMEOUT,
+            'connect_args': {'check_same_thread': False, 'timeout': config.SQLITE_BUSY_TIMEOUT_MS / 1000},
+        }
+    return {
+        'pool_size': config.DB_POOL_SIZE,
+        'max_overflow': config.DB_MAX_OVERFLOW,
+        'pool_timeout': config.DB_POOL_TIMEOUT,
+        'pool_recycle': config.DB_POOL_RECYCLE,
+        'pool_pre_ping': True,
+        # Reuse the most recent connection so idle ones can age out under server-side timeouts
+        'pool_use_lifo': True,
+    }
+
+
+def max_bind_parameters(dialect) -> int:
+    """Most bind parameters a single statement may carry on ``dialect``.
+
+    SQLite's default SQLITE_MAX_VARIABLE_NUMBER is 999 before 3.32.0 and
+    32766 since; PostgreSQL's protocol allows 65535. Other databases get
+    999, which every one of them accepts.
+    """
+    if dialect.name == 'sqlite':
+        return 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+    if dialect.name == 'postgresql':
+        return 65535
+    return 999
+
+
+def install_sqlite_pragmas(engine, config, read_only=False):
+    """Apply the configured journal mode, synchronous level, mmap size and busy timeout on connect."""
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if not read_only:
+            # journal_mode is persistent in the file; a read-only connection cannot change it
+            cursor.execute(f'PRAGMA journal_mode={config.SQLITE_JOURNAL_MODE}')
+        cursor.execute(f'PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}')
+        cursor.execute(f'PRAGMA mmap_size={int(config.SQLITE_MMAP_SIZE)}')
+        cursor.execute(f'PRAGMA busy_timeout={int(config.SQLITE_BUSY_TIMEOUT_MS)}')
+        cursor.close()
+
+
+def create_replica_engine(primary, replica_url, config):
+    """Engine for the read replica at ``replica_url``.
+
+    ``"local"`` opens the primary database a second time, read-only: the
+    same file through SQLite's mode=ro, or the same server with
+    default_transaction_read_only on PostgreSQL. Reads are routed exactly as
+    they would be to a real replica, and a write that strays there fails.
+    """
+    if replica_url != 'local':
+        engine = create_engine(replica_url, **engine_options(replica_url, config))
+        if engine.dialect.name == 'sqlite':
+            install_sqlite_pragmas(engine, config)
+        return engine
+
+    options = engine_options(primary.url, config)
+    if primary.dialect.name != 'sqlite':
+        return create_engine(primary.url, connect_args={'options': '-c default_transaction_read_only=on'},
+                             **options)
+    if _in_memory(primary.url):
+        raise ValueError('A local read replica needs a file-based SQLite database')
+    uri = f'file:{quote(primary.url.database)}?mode=ro'
+    options.pop('connect_args')
+    engine = create_engine('sqlite://', creator=lambda: sqlite3.connect(
+        uri, uri=True, check_same_thread=False, timeout=config.SQLITE_BUSY_TIMEOUT_MS / 1000), **options)
+    install_sqlite_pragmas(engine, config, read_only=True)
+    return engine
+
+
+def _writes(clause) -> bool:
+    return clause is not None and (getattr(clause, 'is_dml', False) or
+                                   getattr(clause, '_for_update_arg', None) is not None)
+
+
+class RoutingSession(SignallingSession):
+    """Session that reads from ``info['replica']`` while it is set.
+
+    Flushes, INSERT/UPDATE/DELETE statements and SELECT ... FOR UPDATE go to
+    the primary, and the first of them drops the replica for the rest of the
+    session, so a request always reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None):
+        replica = self.info.get('replica')
+        if replica is not None:
+            if not self._flushing and not _writes(clause):
+                return replica
+            del self.info['replica']
+        return super().get_bind(mapper, clause)
+
+
+class RoutingSQLAlchemy(SQLAlchemy):
+    """Flask-SQLAlchemy with RoutingSession and the SQLite pragmas from ``engine_config``."""
+
+    def __init__(self, app=None, engine_config=None, **kwargs):
+        self.engine_config = engine_config
+        super().__init__(app, **kwargs)
+
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+    def create_engine(self, sa_url, engine_opts):
+        engine = super().create_engine(sa_url, engine_opts)
+        if engine.dialect.name == 'sqlite' and self.engine_config is not None:
+            install_sqlite_pragmas(engine, self.engine_config)
+        return engine
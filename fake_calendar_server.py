@@ -0,0 +1,165 @@
+"""Local stand-in for the Google Calendar v3 API, for offline throughput and failure tests.
+
+Serves event inserts (single and through the multipart batch endpoint) from
+memory, with optional per-request latency and injected failures:
+
+    python fake_calendar_server.py --port 8765 --latency 0.05 --fail-rate 0.1
+
+Point a service at it with calendar_service_for():
+
+    service = calendar_service_for('http://127.0.0.1:8765')
+    insert_events(service, events, batch_uri='http://127.0.0.1:8765/batch/calendar/v3')
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+INSERT_RE = re.compile(r'^/calendar/v3/calendars/([^/]+)/events(?:\?.*)?$')
+REASONS = {429: 'rateLimitExceeded', 500: 'backendError', 503: 'backendError', 409: 'duplicate'}
+
+
+def _error(status, message):
+    return status, {'error': {'code': status, 'message': message,
+                              'errors': [{'reason': REASONS.get(status, 'invalid'), 'message': message}]}}
+
+
+class FakeCalendar:
+    """In-memory event store shared by the handler threads."""
+
+    def __init__(self, latency=0.0, fail_rate=0.0, fail_status=503, batch_fail_rate=0.0, seed=None):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.batch_fail_rate = batch_fail_rate
+        self.events = {}
+        self.stats = {'http_requests': 0, 'batch_requests': 0, 'calls': 0, 'inserted': 0, 'failed': 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def insert(self, calendar_id, body):
+        with self._lock:
+            self.stats['calls'] += 1
+            if self._rng.random() < self.fail_rate:
+                self.stats['failed'] += 1
+                return _error(self.fail_status, 'Injected failure')
+            event = dict(body, id=body.get('id') or uuid.uuid4().hex, status='confirmed',
+                         organizer={'email': calendar_id, 'self': True})
+            if event['id'] in self.events:
+                return _error(409, 'The requested identifier already exists.')
+            self.events[event['id']] = event
+            self.stats['inserted'] += 1
+            return 200, event
+
+    def batch_fails(self):
+        with self._lock:
+            return self._rng.random() < self.batch_fail_rate
+
+
+class FakeCalendarHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Keep-alive clients would otherwise hit Nagle/delayed-ACK stalls (~40ms per request)
+    disable_nagle_algorithm = True
+    calendar: FakeCalendar = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body: bytes, content_type='application/json; charset=UTF-8'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        calendar = self.calendar
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        with calendar._lock:
+            calendar.stats['http_requests'] += 1
+        if calendar.latency:
+            time.sleep(calendar.latency)
+        path = self.path
+        if path.startswith('/batch'):
+            return self._batch(body)
+        match = INSERT_RE.match(path)
+        if not match:
+            status, payload = _error(404, 'Not Found')
+        else:
+            status, payload = calendar.insert(match.group(1), json.loads(body or b'{}'))
+        self._send(status, json.dumps(payload).encode())
+
+    def _batch(self, body):
+        calendar = self.calendar
+        with calendar._lock:
+            calendar.stats['batch_requests'] += 1
+        if calendar.batch_fails():
+            status, payload = _error(503, 'Injected batch failure')
+            return self._send(status, json.dumps(payload).encode())
+        message = BytesParser(policy=HTTP).parsebytes(
+            b'Content-Type: ' + self.headers['Content-Type'].encode() + b'\r\n\r\n' + body)
+        boundary = 'batch_' + uuid.uuid4().hex
+        parts = []
+        for part in message.iter_parts():
+            request_line, _, rest = part.get_payload(decode=True).decode().partition('\n')
+            inner_body = rest.split('\r\n\r\n', 1)[-1] if '\r\n\r\n' in rest else rest.split('\n\n', 1)[-1]
+            match = INSERT_RE.match(request_line.split(' ')[1])
+            if not match:
+                status, payload = _error(404, 'Not Found')
+            else:
+                status, payload = calendar.insert(match.group(1), json.loads(inner_body or '{}'))
+            content_id = part['Content-ID'].strip('<>')
+            parts.append(
+                f'--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <response-{content_id}>\r\n\r\n'
+                f'HTTP/1.1 {status} {"OK" if status == 200 else "Error"}\r\n'
+                f'Content-Type: application/json; charset=UTF-8\r\n\r\n{json.dumps(payload)}\r\n')
+        response = ''.join(parts) + f'--{boundary}--\r\n'
+        self._send(200, response.encode(), f'multipart/mixed; boundary={boundary}')
+
+
+def start_fake_calendar_server(port=0, **options):
+    """Serve a FakeCalendar on 127.0.0.1 from a daemon thread; returns (server, calendar, base_url)."""
+    calendar = FakeCalendar(**options)
+    handler = type('Handler', (FakeCalendarHandler,), {'calendar': calendar})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, name='fake-calendar', daemon=True).start()
+    return server, calendar, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def calendar_service_for(base_url, token='fake-token'):
+    """A Calendar service that talks to ``base_url`` (built from the bundled discovery document)."""
+    from google.oauth2.credentials import Credentials
+    from google_calendar import get_calendar_service
+    return get_calendar_service(Credentials(token=token), client_options=fake_client_options(base_url))
+
+
+def fake_client_options(base_url):
+    """client_options that point a Calendar service (or CalendarClientPool) at the fake server."""
+    return {'api_endpoint': base_url + '/calendar/v3/'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every HTTP request.')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='Fraction of calls that fail.')
+    parser.add_argument('--fail-status', type=int, default=503)
+    parser.add_argument('--batch-fail-rate', type=float, default=0.0, help='Fraction of whole batches that fail.')
+    args = parser.parse_args()
+    server, _, url = start_fake_calendar_server(args.port, latency=args.latency, fail_rate=args.fail_rate,
+                                                fail_status=args.fail_status, batch_fail_rate=args.batch_fail_rate)
+    print(f"Fake Calendar API on {url} (batch endpoint {url}/batch/calendar/v3)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,14 @@
-import os
+import json
 import pickle
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from google_auth_oauthlib.flow import Flow
 from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-from google.auth.transport.requests import Request
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+import google_auth_httplib2
+import httplib2
 import requests
 
 # --- Constants ---
@@ -12,45 +17,115 @@ SCOPES = ['https://www.googleapis.com/auth/calendar']
 API_SERVICE_NAME = 'calendar'
 API_VERSION = 'v3'
 
-def get_calendar_service(credentials):
-    """Builds and returns a Google Calendar service object."""
-    return build(API_SERVICE_NAME, API_VERSION, credentials=credentials)
+_discovery_document = None
+_client_config = None
+_config_lock = threading.Lock()
+
+
+def get_discovery_document():
+    """The Calendar discovery document, parsed once per process from the copy bundled with the client."""
+    global _discovery_document
+    if _discovery_document is None:
+        with _config_lock:
+            if _discovery_document is None:
+                _discovery_document = json.loads(get_static_doc(API_SERVICE_NAME, API_VERSION))
+    return _discovery_document
+
+
+def get_client_config():
+    """client_secret.json, read once per process."""
+    global _client_config
+    if _client_config is None:
+        with _config_lock:
+            if _client_config is None:
+                with open(CLIENT_SECRETS_FILE) as f:
+                    _client_config = json.load(f)
+    return _client_config
+
+
+def get_oauth_flow(redirect_uri, state=None):
+    """An OAuth flow built from the cached client config."""
+    return Flow.from_client_config(get_client_config(), scopes=SCOPES, redirect_uri=redirect_uri, state=state)
+
+
+def authorized_http(credentials, http=None, timeout=30):
+    """An httplib2 transport that signs requests with ``credentials`` (its ``credentials`` attribute may be swapped)."""
+    return google_auth_httplib2.AuthorizedHttp(credentials, http=http or httplib2.Http(timeout=timeout))
+
+
+def get_calendar_service(credentials, http=None, client_options=None, timeout=30, authorized=None):
+    """Builds and returns a Google Calendar service object, on ``authorized`` if given."""
+    authorized = authorized or authorized_http(credentials, http, timeout)
+    return build_from_document(get_discovery_document(), http=authorized, client_options=client_options)
+
+
+class CalendarClientPool:
+    """Bounded pool of authorized Calendar service objects, kept per user.
+
+    httplib2 connections are not thread-safe, so a service is leased to one
+    caller at a time through ``service()``. Each service is built on an
+    AuthorizedHttp the pool keeps next to it, so a leased service is signed
+    with the caller's current credentials; idle ones (at most ``per_user``
+    each) keep their keep-alive connections for the next request. The pool
+    holds idle services for at most ``max_users`` users, least recently used
+    first out. Each HTTP call gives up after ``timeout`` seconds.
+    """
+
+    def __init__(self, max_users=256, per_user=2, client_options=None, timeout=30):
+        self.max_users = max_users
+        self.per_user = per_user
+        self.client_options = client_options
+        self.timeout = timeout
+        self._idle = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def service(self, user_id, credentials):
+        with self._lock:
+            idle = self._idle.get(user_id)
+            pooled = idle.pop() if idle else None
+        if pooled is None:
+            authorized = authorized_http(credentials, timeout=self.timeout)
+            service = get_calendar_service(credentials, client_options=self.client_options, authorized=authorized)
+        else:
+            service, authorized = pooled
+            # Credentials may have been reloaded or refreshed since the service was pooled
+            authorized.credentials = credentials
+        yield service
+        with self._lock:
+            idle = self._idle.setdefault(user_id, [])
+            if len(idle) < self.per_user:
+                idle.append((service, authorized))
+            self._idle.move_to_end(user_id)
+            while len(self._idle) > self.max_users:
+                self._idle.popitem(last=False)
+
+    def clear(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._idle.clear()
+            else:
+                self._idle.pop(user_id, None)
 
 
 
-def get_user_credentials(user_id):
-    """Retrieves user's stored credentials."""
-    creds_path = f'token_{user_id}.pickle'
-    if os.path.exists(creds_path):
-        with open(creds_path, 'rb') as token:
-            return pickle.load(token)
-    return None
+def load_pickled_credentials(creds_path):
+    """Loads credentials from a legacy token_<user_id>.pickle file."""
+    with open(creds_path, 'rb') as token:
+        return pickle.load(token)
 
-def save_user_credentials(user_id, credentials):
-    """Saves user's credentials for future use."""
-    creds_path = f'token_{user_id}.pickle'
-    with open(creds_path, 'wb') as token:
-        pickle.dump(credentials, token)
+def refresh_credentials(credentials):
+    """Refreshes the access token in place (a blocking call to Google's token endpoint)."""
+    credentials.refresh(Request())
 
 def get_authorization_url(redirect_uri):
     """Generates and returns the Google authorization URL."""
-    flow = Flow.from_client_secrets_file(
-        CLIENT_SECRETS_FILE, scopes=SCOPES,
-        redirect_uri=redirect_uri)
+    flow = get_oauth_flow(redirect_uri)
     auth_url, state = flow.authorization_url(access_type='offline', prompt='consent', include_granted_scopes='true')
     return auth_url, state
 
-def delete_user_credentials(user_id):
-    """Deletes stored credentials and attempts token revocation."""
-    creds = get_user_credentials(user_id)
-    # Remove local token file
-    creds_path = f'token_{user_id}.pickle'
-    if os.path.exists(creds_path):
-        try:
-            os.remove(creds_path)
-        except Exception:
-            pass
-    # Attempt to revoke token if available
+def revoke_credentials(creds):
+    """Attempts token revocation; best effort."""
     try:
         if creds and getattr(creds, 'token', None):
             requests.post(
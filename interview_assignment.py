@@ -0,0 +1,120 @@
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+Interval = Tuple[datetime, datetime]
+
+UNMATCHED = -1
+
+
+def max_matching(adjacency: Sequence[Sequence[int]], n_right: int) -> List[int]:
+    """Maximum bipartite matching (Hopcroft-Karp); returns the right vertex of each left one, or UNMATCHED.
+
+    Left vertices are seeded greedily in index order with the first free
+    neighbour in their adjacency order, so list higher-priority vertices and
+    preferred neighbours first; the augmenting phases then only grow the
+    matching, O(E * sqrt(V)) overall.
+    """
+    n_left = len(adjacency)
+    match_left = [UNMATCHED] * n_left
+    match_right = [UNMATCHED] * n_right
+    for u, neighbours in enumerate(adjacency):
+        for v in neighbours:
+            if match_right[v] == UNMATCHED:
+                match_left[u], match_right[v] = v, u
+                break
+
+    infinity = n_left + 1
+    while True:
+        # BFS from the free left vertices layers the graph by alternating path length
+        dist = [infinity] * n_left
+        queue = deque(u for u in range(n_left) if match_left[u] == UNMATCHED)
+        for u in queue:
+            dist[u] = 0
+        found = False
+        while queue:
+            u = queue.popleft()
+            for v in adjacency[u]:
+                w = match_right[v]
+                if w == UNMATCHED:
+                    found = True
+                elif dist[w] == infinity:
+                    dist[w] = dist[u] + 1
+                    queue.append(w)
+        if not found:
+            return match_left
+
+        # Iterative DFS along the layers finds a maximal set of disjoint augmenting paths
+        cursor = [0] * n_left
+        for root in range(n_left):
+            if match_left[root] != UNMATCHED:
+                continue
+            path = [root]
+            while path:
+                u = path[-1]
+                neighbours = adjacency[u]
+                advanced = False
+                while cursor[u] < len(neighbours):
+                    v = neighbours[cursor[u]]
+                    cursor[u] += 1
+                    w = match_right[v]
+                    if w == UNMATCHED:
+                        # Flip the path: every left vertex on it takes the right vertex it came through
+                        for left in reversed(path):
+                            match_left[left], match_right[v], v = v, left, match_left[left]
+                        path = []
+                        advanced = True
+                        break
+                    if dist[w] == dist[u] + 1:
+                        path.append(w)
+                        advanced = True
+                        break
+                if not advanced:
+                    dist[u] = infinity  # dead end for the rest of this phase
+                    path.pop()
+
+
+def slots_within(slots: Sequence[Interval], starts: Sequence[datetime], windows: Sequence[Interval]) -> List[int]:
+    """Indices of the slots (sorted by start, with ``starts`` their start times) inside any window."""
+    found = set()
+    for window_start, window_end in windows:
+        i = bisect_left(starts, window_start)
+        while i < len(slots) and slots[i][0] < window_end:
+            if slots[i][1] <= window_end:
+                found.add(i)
+            i += 1
+    return sorted(found)
+
+
+def assign_slots(applicants: Sequence[Hashable], slots: Sequence[Interval],
+                 availability: Optional[Dict[Hashable, Sequence[Interval]]] = None) -> Dict[Hashable, int]:
+    """Give as many applicants as possible a slot of their own; returns {applicant: slot index}.
+
+    ``applicants`` come in priority order and ``slots`` sorted by start.
+    Applicants listed in ``availability`` with at least one window may only
+    take slots inside one of those windows (an empty list means no
+    constraint, as if the applicant were not listed); they are matched first (maximum matching, earliest slots
+    preferred), and everyone else fills the remaining slots in order. Since
+    the unconstrained applicants can take any slot, this is a maximum
+    matching of the whole graph without ever materializing its edges.
+    """
+    availability = availability or {}
+    starts = [start for start, _ in slots]
+    constrained = [a for a in applicants if availability.get(a)]
+    matching = max_matching([slots_within(slots, starts, availability[a]) for a in constrained], len(slots))
+
+    assigned, taken = {}, set()
+    for applicant, slot in zip(constrained, matching):
+        if slot != UNMATCHED:
+            assigned[applicant] = slot
+            taken.add(slot)
+    free = (i for i in range(len(slots)) if i not in taken)
+    for applicant in applicants:
+        if availability.get(applicant):
+            continue
+        slot = next(free, None)
+        if slot is None:
+            break
+        assigned[applicant] = slot
+    return assigned
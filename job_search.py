@@ -0,0 +1,190 @@
+import re
+from typing import List, Tuple
+
+from sqlalchemy import text
+
+# Matches either a "quoted phrase" or a bare term, optionally ending in * for prefix search
+_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+SEARCH_COLUMNS = ('title', 'company', 'description', 'required_skills')
+
+
+def parse_query(query: str) -> List[Tuple[str, List[str], bool]]:
+    """Split a user query into (kind, words, prefix) clauses.
+
+    ``kind`` is 'phrase' for double-quoted text and 'term' otherwise; a term
+    ending in ``*`` is a prefix query. Punctuation is dropped so the result is
+    safe to splice into FTS5 / tsquery syntax.
+    """
+    clauses = []
+    for phrase, term in _TOKEN_RE.findall(query or ''):
+        if phrase:
+            words = _WORD_RE.findall(phrase.lower())
+            if words:
+                clauses.append(('phrase', words, False))
+        else:
+            words = _WORD_RE.findall(term.lower())
+            for i, word in enumerate(words):
+                # Only the word the trailing * is attached to becomes a prefix query
+                clauses.append(('term', [word], term.endswith('*') and i == len(words) - 1))
+    return clauses
+
+
+class LikeSearchBackend:
+    """Fallback for databases without a full-text engine: the old ilike scan."""
+
+    name = 'like'
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def install(self):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def search(self, query: str, limit: int = 200) -> List[int]:
+        words = [w for _, clause, _ in parse_query(query) for w in clause]
+        if not words:
+            return []
+        params = {'limit': limit}
+        conditions = []
+        for i, word in enumerate(words):
+            params[f'w{i}'] = f'%{word}%'
+            conditions.append('(' + ' OR '.join(f'lower({c}) LIKE :w{i}' for c in SEARCH_COLUMNS) + ')')
+        sql = f"SELECT id FROM job WHERE {' AND '.join(conditions)} ORDER BY date_posted DESC, id DESC LIMIT :limit"
+        with self.engine.connect() as conn:
+            return [row[0] for row in conn.execute(text(sql), params)]
+
+
+class SQLiteFTSBackend:
+    """FTS5 external-content table over ``job`` kept in sync by triggers, ranked with BM25."""
+
+    name = 'fts5'
+    # bm25 column weights, in SEARCH_COLUMNS order
+    WEIGHTS = (10.0, 4.0, 1.0, 6.0)
+    TRIGGERS = {
+        'job_fts_ai': """
+            CREATE TRIGGER IF NOT EXISTS job_fts_ai AFTER INSERT ON job BEGIN
+                INSERT INTO job_fts(rowid, title, company, description, required_skills)
+                VALUES (new.id, new.title, new.company, new.description, new.required_skills);
+            END""",
+        'job_fts_ad': """
+            CREATE TRIGGER IF NOT EXISTS job_fts_ad AFTER DELETE ON job BEGIN
+                INSERT INTO job_fts(job_fts, rowid, title, company, description, required_skills)
+                VALUES ('delete', old.id, old.title, old.company, old.description, old.required_skills);
+            END""",
+        'job_fts_au': """
+            CREATE TRIGGER IF NOT EXISTS job_fts_au AFTER UPDATE ON job BEGIN
+                INSERT INTO job_fts(job_fts, rowid, title, company, description, required_skills)
+                VALUES ('delete', old.id, old.title, old.company, old.description, old.required_skills);
+                INSERT INTO job_fts(rowid, title, company, description, required_skills)
+                VALUES (new.id, new.title, new.company, new.description, new.required_skills);
+            END""",
+    }
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def install(self):
+        """Create the FTS table and triggers if missing, rebuilding when anything was created."""
+        with self.engine.begin() as conn:
+            existing = {row[0] for row in conn.execute(text(
+                "SELECT name FROM sqlite_master WHERE name = 'job_fts' OR name LIKE 'job_fts_a_'"))}
+            missing = [name for name in ('job_fts',) + tuple(self.TRIGGERS) if name not in existing]
+            if not missing:
+                return
+            if 'job_fts' not in existing:
+                conn.execute(text(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS job_fts USING fts5("
+                    "title, company, description, required_skills, "
+                    "content='job', content_rowid='id', tokenize='unicode61')"))
+            for name, ddl in self.TRIGGERS.items():
+                if name not in existing:
+                    conn.execute(text(ddl))
+        self.rebuild()
+
+    def rebuild(self):
+        with self.engine.begin() as conn:
+            conn.execute(text("INSERT INTO job_fts(job_fts) VALUES ('rebuild')"))
+
+    @staticmethod
+    def match_expression(query: str) -> str:
+        parts = []
+        for kind, words, prefix in parse_query(query):
+            if kind == 'phrase':
+                parts.append('"' + ' '.join(words) + '"')
+            else:
+                parts.append(f'"{words[0]}"' + ('*' if prefix else ''))
+        return ' '.join(parts)
+
+    def search(self, query: str, limit: int = 200) -> List[int]:
+        expression = self.match_expression(query)
+        if not expression:
+            return []
+        weights = ', '.join(str(w) for w in self.WEIGHTS)
+        sql = text(
+            f"SELECT rowid FROM job_fts WHERE job_fts MATCH :q "
+            f"ORDER BY bm25(job_fts, {weights}), rowid DESC LIMIT :limit")
+        with self.engine.connect() as conn:
+            return [row[0] for row in conn.execute(sql, {'q': expression, 'limit': limit})]
+
+
+class PostgresSearchBackend:
+    """Generated, GIN-indexed tsvector column on ``job``, ranked with ts_rank."""
+
+    name = 'tsvector'
+    CONFIG = 'english'
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def install(self):
+        # A STORED generated column keeps itself in sync on every insert/update (PostgreSQL 12+)
+        with self.engine.begin() as conn:
+            conn.execute(text(f"""
+                ALTER TABLE job ADD COLUMN IF NOT EXISTS search_vector tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('{self.CONFIG}', coalesce(title, '')), 'A') ||
+                    setweight(to_tsvector('{self.CONFIG}', coalesce(required_skills, '')), 'A') ||
+                    setweight(to_tsvector('{self.CONFIG}', coalesce(company, '')), 'B') ||
+                    setweight(to_tsvector('{self.CONFIG}', coalesce(description, '')), 'C')
+                ) STORED"""))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_job_search_vector ON job USING GIN (search_vector)"))
+
+    def rebuild(self):
+        with self.engine.begin() as conn:
+            conn.execute(text("REINDEX INDEX ix_job_search_vector"))
+
+    @staticmethod
+    def tsquery(query: str) -> str:
+        parts = []
+        for kind, words, prefix in parse_query(query):
+            if kind == 'phrase':
+                parts.append('(' + ' <-> '.join(words) + ')')
+            else:
+                parts.append(words[0] + (':*' if prefix else ''))
+        return ' & '.join(parts)
+
+    def search(self, query: str, limit: int = 200) -> List[int]:
+        tsquery = self.tsquery(query)
+        if not tsquery:
+            return []
+        sql = text(
+            f"SELECT id FROM job, to_tsquery('{self.CONFIG}', :q) AS query "
+            f"WHERE search_vector @@ query "
+            f"ORDER BY ts_rank(search_vector, query) DESC, id DESC LIMIT :limit")
+        with self.engine.connect() as conn:
+            return [row[0] for row in conn.execute(sql, {'q': tsquery, 'limit': limit})]
+
+
+def create_search_backend(engine):
+    """Pick the full-text backend for the engine's dialect, falling back to ilike."""
+    if engine.dialect.name == 'sqlite':
+        return SQLiteFTSBackend(engine)
+    if engine.dialect.name == 'postgresql':
+        return PostgresSearchBackend(engine)
+    return LikeSearchBackend(engine)
@@ -0,0 +1,236 @@
+import threading
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from skill_index import SkillIndex
+
+
+class MatchingEngine:
+    """Scores seekers against every job in one vectorized pass.
+
+    Jobs live in a SkillIndex (normalized skill sets and locations, updated
+    incrementally) and are compiled from it into a CSR-style sparse job x
+    skill matrix: ``indptr`` and ``indices`` are NumPy arrays, row ``i`` holds
+    the column ids of job ``job_ids[i]``'s skills. A column-major copy is
+    derived lazily so scoring only touches the non-zeros of the skills a user
+    actually has. New jobs are appended to a pending
+    buffer and folded into the arrays on the next query, so ``post_job`` and
+    the importers only pay for a couple of list appends.
+    """
+
+    # Upper bound on the users x jobs score matrix built per chunk by score_users
+    BATCH_CELLS = 16 * 1024 * 1024
+
+    def __init__(self, index: Optional[SkillIndex] = None):
+        self._lock = threading.RLock()
+        self.index = index if index is not None else SkillIndex()
+        self._reset()
+        self.loaded = False
+
+    def _reset(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.skill_names: List[str] = []
+        self.job_ids = np.zeros(0, dtype=np.int64)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.sizes = np.zeros(0, dtype=np.int32)
+        self._row_of: Dict[int, int] = {}
+        self._pending: List[tuple] = []
+        self._csc = None
+
+    def __len__(self):
+        return len(self._row_of)
+
+    # ---------- building ----------
+    def load(self, rows: Iterable[Any]):
+        """Rebuild the index and the matrix from (id, required_skills, location) rows."""
+        with self._lock:
+            self._reset()
+            self.index.load(rows)
+            for job_id in self.index.job_ids():
+                self._queue(job_id)
+            self._compact()
+            self.loaded = True
+
+    def add_job(self, job_id: int, required_skills: str, location: Optional[str] = None):
+        """Queue one job; jobs already present are left as they are."""
+        with self._lock:
+            if job_id not in self._row_of:
+                self.index.add_job(job_id, required_skills, location)
+                self._queue(job_id)
+
+    def add_jobs(self, jobs: Iterable[Any]):
+        """Queue a batch of flushed Job objects."""
+        with self._lock:
+            for job in jobs:
+                self.add_job(job.id, job.required_skills, job.location)
+
+    def extend(self, rows: Iterable[Any]) -> Optional[int]:
+        """Queue (id, required_skills, location) rows not present yet; returns the highest id seen."""
+        newest = None
+        with self._lock:
+            for job_id, required_skills, location in rows:
+                self.add_job(job_id, required_skills, location)
+                newest = job_id if newest is None else max(newest, job_id)
+        return newest
+
+    def _queue(self, job_id):
+        columns = []
+        for skill in sorted(self.index.skills(job_id)):
+            col = self.vocabulary.get(skill)
+            if col is None:
+                col = self.vocabulary[skill] = len(self.skill_names)
+                self.skill_names.append(skill)
+            columns.append(col)
+        self._row_of[job_id] = len(self._row_of)
+        self._pending.append((job_id, sorted(columns)))
+
+    def _compact(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        lengths = np.fromiter((len(p[1]) for p in pending), dtype=np.int64, count=len(pending))
+        new_indices = np.fromiter((c for p in pending for c in p[1]), dtype=np.int32, count=int(lengths.sum()))
+        self.job_ids = np.concatenate([self.job_ids, np.fromiter((p[0] for p in pending), dtype=np.int64)])
+        self.indptr = np.concatenate([self.indptr, self.indptr[-1] + np.cumsum(lengths)])
+        self.indices = np.concatenate([self.indices, new_indices])
+        self.sizes = np.concatenate([self.sizes, lengths.astype(np.int32)])
+        self._csc = None
+
+    def _columns(self):
+        """Column-major view: (colptr, rows) so rows[colptr[c]:colptr[c + 1]] lists skill c's jobs."""
+        if self._csc is None:
+            order = np.argsort(self.indices, kind='stable')
+            rows = np.repeat(np.arange(len(self.sizes), dtype=np.int64), self.sizes)[order]
+            colptr = np.searchsorted(self.indices[order], np.arange(len(self.skill_names) + 1))
+            self._csc = (colptr, rows)
+        return self._csc
+
+    # ---------- scoring ----------
+    def _user_columns(self, user_skills: Sequence[str]) -> List[int]:
+        columns = {self.vocabulary.get(skill.strip().lower()) for skill in user_skills}
+        columns.discard(None)
+        return sorted(columns)
+
+    def _overlap(self, users_skills: Sequence[Sequence[str]]) -> np.ndarray:
+        """Matching-skill counts for each (user, job) pair, shape (users, jobs).
+
+        Every user's posting lists are offset into their own block of a flat
+        array and counted with a single bincount.
+        """
+        colptr, rows = self._columns()
+        n_jobs = len(self.sizes)
+        parts = [
+            rows[colptr[col]:colptr[col + 1]] + i * n_jobs
+            for i, skills in enumerate(users_skills)
+            for col in self._user_columns(skills)
+        ]
+        flat = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+        counts = np.bincount(flat, minlength=len(users_skills) * n_jobs)
+        return counts.reshape(len(users_skills), n_jobs)
+
+    def _percentages(self, overlap: np.ndarray) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct = overlap / self.sizes * 100
+        pct[:, self.sizes == 0] = 0.0
+        return pct
+
+    def score_users(self, users_skills: Sequence[Sequence[str]]) -> np.ndarray:
+        """Match percentage of every user against every job, shape (users, jobs).
+
+        Column ``j`` corresponds to ``job_ids[j]``. Users are processed in
+        chunks so the scratch matrix stays under ``BATCH_CELLS`` cells.
+        """
+        with self._lock:
+            self._compact()
+            out = np.zeros((len(users_skills), len(self.job_ids)), dtype=np.float64)
+            if not len(self.job_ids):
+                return out
+            chunk = max(1, self.BATCH_CELLS // len(self.job_ids))
+            for start in range(0, len(users_skills), chunk):
+                block = users_skills[start:start + chunk]
+                out[start:start + len(block)] = self._percentages(self._overlap(block))
+        return out
+
+    def score_user(self, user_skills: Sequence[str]) -> np.ndarray:
+        """Match percentage of one user against every job, aligned with ``job_ids``."""
+        return self.score_users([user_skills])[0]
+
+    def _explain(self, row: int, user_set: set) -> Dict[str, List[str]]:
+        job_skills = [self.skill_names[c] for c in self.indices[self.indptr[row]:self.indptr[row + 1]]]
+        return {
+            'matching': sorted(s for s in job_skills if s in user_set),
+            'missing': sorted(s for s in job_skills if s not in user_set),
+        }
+
+    def match(self, user_skills: Sequence[str], job_id: int) -> Dict[str, Any]:
+        """Match details for a single job; percentage is 0 for unknown or skill-less jobs."""
+        user_set = {s.strip().lower() for s in user_skills}
+        with self._lock:
+            self._compact()
+            row = self._row_of.get(job_id)
+            if row is None or not self.sizes[row]:
+                return {'job_id': job_id, 'percentage': 0, 'matching': [], 'missing': []}
+            result = self._explain(row, user_set)
+            result['job_id'] = job_id
+            result['percentage'] = (len(result['matching']) / int(self.sizes[row])) * 100
+        return result
+
+    def _rank(self, overlap: np.ndarray, user_set: set, k: Optional[int], location: str,
+              after: Optional[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        candidates = np.flatnonzero(overlap)
+        pct = overlap[candidates] / self.sizes[candidates] * 100
+        scores = np.floor(pct)
+        if location:
+            bonus = np.fromiter((location in self.index.location(int(self.job_ids[r])) for r in candidates),
+                                dtype=bool, count=len(candidates))
+            scores = np.minimum(100, scores + 5 * bonus)
+        # Highest score first, newest job id breaking ties
+        key = scores.astype(np.int64) * (1 << 40) + self.job_ids[candidates]
+        if after is not None:
+            keep = np.flatnonzero(key < after[0] * (1 << 40) + after[1])
+            candidates, pct, scores, key = candidates[keep], pct[keep], scores[keep], key[keep]
+        if k is not None and k < len(key):
+            order = np.argpartition(-key, k)[:k]
+            order = order[np.argsort(-key[order])]
+        else:
+            order = np.argsort(-key)
+        results = []
+        for i in order:
+            row = candidates[i]
+            result = self._explain(row, user_set)
+            result['job_id'] = int(self.job_ids[row])
+            result['percentage'] = float(pct[i])
+            result['score'] = int(scores[i])
+            results.append(result)
+        return results
+
+    def top_k(self, user_skills: Sequence[str], k: Optional[int] = 20, location: str = '',
+              after: Optional[Tuple[int, int]] = None) -> List[Dict[str, Any]]:
+        """Best matching jobs for one user, highest score first.
+
+        ``score`` equals ``compute_match_score``'s score plus the location bonus
+        applied by ``recommend_jobs_for_user``; ``percentage`` is the unrounded
+        match percentage. Jobs sharing no skill with the user are omitted.
+        ``after`` is the (score, job_id) of the last hit of a previous page;
+        only hits ranked below it are returned.
+        """
+        return self.top_k_batch([user_skills], k=k, location=location, after=after)[0]
+
+    def top_k_batch(self, users_skills: Sequence[Sequence[str]], k: Optional[int] = 20,
+                    location: str = '', after: Optional[Tuple[int, int]] = None) -> List[List[Dict[str, Any]]]:
+        desired_location = (location or '').lower()
+        results = []
+        with self._lock:
+            self._compact()
+            if not len(self.job_ids):
+                return [[] for _ in users_skills]
+            chunk = max(1, self.BATCH_CELLS // len(self.job_ids))
+            for start in range(0, len(users_skills), chunk):
+                block = users_skills[start:start + chunk]
+                overlap = self._overlap(block)
+                for i, skills in enumerate(block):
+                    user_set = {s.strip().lower() for s in skills}
+                    results.append(self._rank(overlap[i], user_set, k, desired_location, after))
+        return results
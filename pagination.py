@@ -0,0 +1,84 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Type
+
+from sqlalchemy import and_, or_
+
+
+class Page:
+    """One page of a keyset-paginated query."""
+
+    def __init__(self, items: List[Any], next_cursor: Optional[str], page_size: int):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.page_size = page_size
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Pack the sort-key values of the last row into an opaque, URL-safe token."""
+    payload = [['dt', v.isoformat()] if isinstance(v, datetime) else ['v', v] for v in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str], types: Sequence[Type]) -> Optional[List[Any]]:
+    """Inverse of encode_cursor for a sort key of the given Python types.
+
+    Malformed cursors, and cursors whose values are not exactly of ``types``
+    (a bool is not an int here), decode to None (first page), so client
+    input never reaches a comparison with the wrong type.
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = [datetime.fromisoformat(v) if tag == 'dt' else v for tag, v in payload]
+    except (ValueError, TypeError):
+        return None
+    if len(values) != len(types):
+        return None
+    for value, expected in zip(values, types):
+        if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+            return None
+    return values
+
+
+def _after(columns, values, descending):
+    """Row-value comparison (c1, c2, ...) < / > (v1, v2, ...) spelled out for portability."""
+    clauses = []
+    for i, column in enumerate(columns):
+        equal = [columns[j] == values[j] for j in range(i)]
+        beyond = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal, beyond))
+    return or_(*clauses)
+
+
+def keyset_paginate(query, columns, cursor: Optional[str] = None, page_size: int = 25,
+                    descending: bool = True) -> Page:
+    """Return the page of ``query`` that follows ``cursor``.
+
+    ``columns`` is the sort key, most significant first; the last one must be
+    unique (normally the primary key) so the order is total and cursors are
+    stable while rows are inserted. Rows with a NULL in a nullable sort column
+    are left out: NULLs sort differently per database and cannot be resumed
+    from with a comparison. Only ``page_size + 1`` rows are fetched.
+    """
+    query = query.filter(*(column.isnot(None) for column in columns if column.nullable))
+    after = decode_cursor(cursor, [column.type.python_type for column in columns])
+    if after is not None:
+        query = query.filter(_after(columns, after, descending))
+    order = [column.desc() if descending else column.asc() for column in columns]
+    rows = query.order_by(*order).limit(page_size + 1).all()
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in columns])
+    return Page(rows, next_cursor, page_size)
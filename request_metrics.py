@@ -0,0 +1,265 @@
+import atexit
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from time import perf_counter
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Histogram upper bounds; the last bucket (+Inf) is implicit
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+# Index of each field in a request's running totals (a list, so the SQL hooks are plain item updates)
+_STARTED, _QUERIES, _QUERY_SECONDS, _ROWS, _QUERY_STARTED, _STATUS = range(6)
+
+Key = Tuple[str, str]  # (endpoint, method)
+
+
+class EndpointStats:
+    """Totals for one (endpoint, method): request count by status, latency and SQL work."""
+
+    __slots__ = ('statuses', 'seconds', 'latency', 'queries', 'query_seconds', 'rows', 'query_counts')
+
+    def __init__(self):
+        self.statuses = {}
+        self.seconds = 0.0
+        self.latency = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.rows = 0
+        self.query_counts = [0] * (len(QUERY_COUNT_BUCKETS) + 1)
+
+    def merge(self, other: 'EndpointStats'):
+        for status, n in list(other.statuses.items()):
+            self.statuses[status] = self.statuses.get(status, 0) + n
+        self.seconds += other.seconds
+        self.latency = [a + b for a, b in zip(self.latency, other.latency)]
+        self.queries += other.queries
+        self.query_seconds += other.query_seconds
+        self.rows += other.rows
+        self.query_counts = [a + b for a, b in zip(self.query_counts, other.query_counts)]
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'EndpointStats':
+        stats = cls()
+        for name in cls.__slots__:
+            setattr(stats, name, data[name])
+        stats.statuses = {int(status): n for status, n in data['statuses'].items()}  # JSON keys are strings
+        return stats
+
+
+def _merge_into(totals: Dict[Key, EndpointStats], stats: Dict[Key, EndpointStats]):
+    for key, entry in list(stats.items()):
+        total = totals.get(key)
+        if total is None:
+            total = totals[key] = EndpointStats()
+        total.merge(entry)
+
+
+class RequestMetrics:
+    """Per-endpoint request latency and SQL counters with Prometheus text exposition.
+
+    Every thread records into its own dict of EndpointStats, so the request
+    path takes no lock: start_request/finish_request bracket a request and the
+    cursor hooks add each statement's time and driver-reported row count
+    (rows affected, or rows returned where the driver knows them, as
+    psycopg2 does) to the request in flight on that thread. A scrape merges
+    the per-thread dicts, folding in those of threads that have exited.
+
+    With ``directory`` set, a background thread writes this process's
+    totals to ``directory/metrics-<pid>.json`` every ``flush_interval``
+    seconds, and collect() sums the files of all processes sharing it.
+    """
+
+    def __init__(self, prefix: str = 'luminate', directory: Optional[str] = None, flush_interval: float = 5.0):
+        self.prefix = prefix
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._local = threading.local()
+        self._shards = []  # (thread, its stats dict)
+        self._retired = {}
+        self._flusher_pid = None
+        self._lock = threading.Lock()
+
+    def _register(self) -> Dict[Key, EndpointStats]:
+        stats = {}
+        with self._lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    _merge_into(self._retired, shard)
+            live.append((threading.current_thread(), stats))
+            self._shards = live
+        self._local.stats = stats
+        return stats
+
+    # Request and cursor hooks
+
+    def start_request(self):
+        self._local.request = [perf_counter(), 0, 0.0, 0, None, 500]
+
+    def set_status(self, status: int):
+        current = getattr(self._local, 'request', None)
+        if current is not None:
+            current[_STATUS] = status
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        current = getattr(self._local, 'request', None)
+        if current is not None:
+            current[_QUERY_STARTED] = perf_counter()
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        current = getattr(self._local, 'request', None)
+        if current is not None and current[_QUERY_STARTED] is not None:
+            current[_QUERY_SECONDS] += perf_counter() - current[_QUERY_STARTED]
+            current[_QUERY_STARTED] = None
+            current[_QUERIES] += 1
+            if cursor.rowcount > 0:
+                current[_ROWS] += cursor.rowcount
+
+    def finish_request(self, endpoint: str, method: str):
+        local = self._local
+        current = local.__dict__.pop('request', None)
+        if current is None:
+            return
+        elapsed = perf_counter() - current[_STARTED]
+        stats = local.__dict__.get('stats')
+        if stats is None:
+            stats = self._register()
+        entry = stats.get((endpoint, method))
+        if entry is None:
+            entry = stats[(endpoint, method)] = EndpointStats()
+        status = current[_STATUS]
+        entry.statuses[status] = entry.statuses.get(status, 0) + 1
+        entry.seconds += elapsed
+        entry.latency[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+        entry.queries += current[_QUERIES]
+        entry.query_seconds += current[_QUERY_SECONDS]
+        entry.rows += current[_ROWS]
+        entry.query_counts[bisect_left(QUERY_COUNT_BUCKETS, current[_QUERIES])] += 1
+        if self.directory and self._flusher_pid != os.getpid():
+            self._start_flusher()
+
+    # Aggregation
+
+    def snapshot(self) -> Dict[Key, EndpointStats]:
+        """This process's totals; concurrent requests may be half-counted, never lost."""
+        totals = {}
+        with self._lock:
+            _merge_into(totals, self._retired)
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            _merge_into(totals, shard)
+        return totals
+
+    def collect(self) -> Dict[Key, EndpointStats]:
+        """Totals across every process sharing ``directory``, or this process's without one."""
+        if not self.directory:
+            return self.snapshot()
+        self.flush()
+        totals = {}
+        for path in glob.glob(os.path.join(self.directory, 'metrics-*.json')):
+            try:
+                with open(path) as f:
+                    records = json.load(f)
+            except (OSError, ValueError):
+                continue  # a worker is replacing it right now, or it was cleaned up
+            _merge_into(totals, {(r['endpoint'], r['method']): EndpointStats.from_dict(r['stats'])
+                                 for r in records})
+        return totals
+
+    def flush(self):
+        """Write this process's snapshot to its file in ``directory``, atomically."""
+        records = [{'endpoint': endpoint, 'method': method, 'stats': stats.to_dict()}
+                   for (endpoint, method), stats in self.snapshot().items()]
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f'metrics-{os.getpid()}.json')
+        temporary = f'{path}.{threading.get_ident()}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(records, f)
+        os.replace(temporary, path)
+
+    def _start_flusher(self):
+        with self._lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+        threading.Thread(target=self._run_flusher, name='metrics-flush', daemon=True).start()
+        atexit.register(self.flush)
+
+    def _run_flusher(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError:
+                logger.exception('Could not write request metrics to %s', self.directory)
+
+    def render(self) -> str:
+        """Prometheus text exposition (format 0.0.4) of collect()."""
+        return render_prometheus(self.collect(), self.prefix)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _histogram(lines, name, bounds, counts, total, labels):
+    cumulative = 0
+    for bound, n in zip(bounds, counts):
+        cumulative += n
+        lines.append(f'{name}_bucket{_labels(**labels, le=bound)} {cumulative}')
+    lines.append(f'{name}_bucket{_labels(**labels, le="+Inf")} {cumulative + counts[-1]}')
+    lines.append(f'{name}_sum{_labels(**labels)} {total}')
+    lines.append(f'{name}_count{_labels(**labels)} {cumulative + counts[-1]}')
+
+
+def render_prometheus(totals: Dict[Key, EndpointStats], prefix: str = 'luminate') -> str:
+    families = {
+        'http_requests_total': ('counter', 'Requests handled, by endpoint, method and response status.'),
+        'http_request_duration_seconds': ('histogram', 'Time from the first before_request hook to teardown.'),
+        'db_queries_total': ('counter', 'SQL statements executed while handling requests.'),
+        'db_query_duration_seconds_total': ('counter', 'Time spent executing SQL statements.'),
+        'db_rows_total': ('counter', 'Rows reported by the database driver (affected or returned).'),
+        'db_queries_per_request': ('histogram', 'SQL statements executed per request.'),
+    }
+    lines = {name: [] for name in families}
+    for (endpoint, method), stats in sorted(totals.items()):
+        labels = {'endpoint': endpoint, 'method': method}
+        for status, n in sorted(stats.statuses.items()):
+            lines['http_requests_total'].append(
+                f'{prefix}_http_requests_total{_labels(**labels, status=status)} {n}')
+        _histogram(lines['http_request_duration_seconds'], f'{prefix}_http_request_duration_seconds',
+                   LATENCY_BUCKETS, stats.latency, stats.seconds, labels)
+        lines['db_queries_total'].append(f'{prefix}_db_queries_total{_labels(**labels)} {stats.queries}')
+        lines['db_query_duration_seconds_total'].append(
+            f'{prefix}_db_query_duration_seconds_total{_labels(**labels)} {stats.query_seconds}')
+        lines['db_rows_total'].append(f'{prefix}_db_rows_total{_labels(**labels)} {stats.rows}')
+        _histogram(lines['db_queries_per_request'], f'{prefix}_db_queries_per_request',
+                   QUERY_COUNT_BUCKETS, stats.query_counts, stats.queries, labels)
+
+    out = []
+    for name, (kind, help_text) in families.items():
+        out.append(f'# HELP {prefix}_{name} {help_text}')
+        out.append(f'# TYPE {prefix}_{name} {kind}')
+        out.extend(lines[name])
+    return '\n'.join(out) + '\n'
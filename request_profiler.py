@@ -0,0 +1,219 @@
+import json
+import logging
+import marshal
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Func = Tuple[str, int, str]  # (filename, first line, function name), as pstats keys functions
+
+CAPTURE_NAME = re.compile(r'^[\w.-]+\.(json|collapsed|pstats)$')
+UNSAFE_NAME_CHARS = re.compile(r'[^\w.]')
+
+
+class Capture:
+    """Stack samples of one request's thread.
+
+    ``samples`` counts how often each stack was seen; ``seconds`` weights
+    each sample by the time since the previous one, which stays accurate
+    when a busy thread holds the GIL past the sampling interval.
+    """
+
+    def __init__(self, name: str, thread_id: int, trigger: str):
+        self.name = name
+        self.thread_id = thread_id
+        self.trigger = trigger
+        self.samples = Counter()
+        self.seconds = Counter()
+        self.started = self._last = time.perf_counter()
+        self.status = None
+
+    def add(self, frame, now: float):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+        stack.reverse()
+        stack = tuple(stack)
+        self.samples[stack] += 1
+        self.seconds[stack] += now - self._last
+        self._last = now
+
+
+class StackSampler:
+    """Daemon thread that samples the stacks of the threads being profiled every ``interval`` seconds.
+
+    It sleeps on an event while nothing is being profiled, so requests that
+    are not profiled pay nothing. Sampling a thread means reading its frame
+    from sys._current_frames(), so the profiled code runs unmodified; the
+    sampler does need the GIL, so on a busy thread the effective interval
+    is at least sys.getswitchinterval().
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._captures: Dict[int, Capture] = {}
+        self._wake = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        # Held for each sampling pass, so remove() returns only once the
+        # capture's counters have stopped changing.
+        self._pass_lock = threading.Lock()
+
+    def add(self, capture: Capture):
+        if self._thread is None:
+            self._start()
+        self._captures[capture.thread_id] = capture
+        self._wake.set()
+
+    def remove(self, capture: Capture):
+        with self._pass_lock:
+            self._captures.pop(capture.thread_id, None)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            if not self._captures:
+                self._wake.clear()
+                if not self._captures:
+                    self._wake.wait()
+            with self._pass_lock:
+                frames = sys._current_frames()
+                now = time.perf_counter()
+                for thread_id, capture in list(self._captures.items()):
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        capture.add(frame, now)
+                del frames
+            time.sleep(self.interval)
+
+
+def _label(func: Func) -> str:
+    filename, line, name = func
+    return f"{name} ({os.path.basename(filename)}:{line})".replace(';', ':')
+
+
+def collapsed_stacks(seconds: Counter) -> str:
+    """Brendan Gregg's collapsed format ("root;caller;leaf count") with microseconds as the count,
+    for flamegraph.pl or speedscope."""
+    return ''.join(f"{';'.join(_label(func) for func in stack)} {round(elapsed * 1e6)}\n"
+                   for stack, elapsed in sorted(seconds.items()) if stack)
+
+
+def sampled_pstats(samples: Counter, seconds: Counter) -> dict:
+    """A pstats-compatible stats dict built from stack samples and their time weights.
+
+    A stack's time counts as own time for its leaf frame and as cumulative
+    time for every function on it (once per sample under recursion). Call
+    counts are sample counts, not calls.
+    """
+    stats = {}
+    for stack, n in samples.items():
+        if not stack:
+            continue
+        elapsed = seconds[stack]
+        seen = set()
+        for depth, func in enumerate(stack):
+            entry = stats.setdefault(func, [0, 0, 0.0, 0.0, {}])
+            if func not in seen:
+                seen.add(func)
+                entry[0] += n
+                entry[1] += n
+                entry[3] += elapsed
+            if depth:
+                caller = entry[4].setdefault(stack[depth - 1], [0, 0, 0.0, 0.0])
+                caller[0] += n
+                caller[1] += n
+                caller[3] += elapsed
+                if depth == len(stack) - 1:
+                    caller[2] += elapsed
+        stats[stack[-1]][2] += elapsed
+    return {func: (nc, cc, tt, ct, {caller: tuple(totals) for caller, totals in callers.items()})
+            for func, (nc, cc, tt, ct, callers) in stats.items()}
+
+
+class RequestProfiler:
+    """Sampling profiles of individual requests, kept in a bounded ring of files in ``directory``.
+
+    Each finished capture is written by a background thread as three files
+    sharing one name: ``.collapsed`` (flamegraph input), ``.pstats``
+    (loadable with pstats.Stats or snakeviz) and ``.json`` (request
+    metadata). Only the newest ``keep`` captures are kept.
+    """
+
+    def __init__(self, directory: str, keep: int = 100, interval: float = 0.005):
+        self.directory = directory
+        self.keep = keep
+        self.sampler = StackSampler(interval)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='profile-writer')
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def start(self, endpoint: str, trigger: str) -> Capture:
+        """Start sampling the calling thread."""
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+        now_ms = int(time.time() * 1000)
+        stamp = time.strftime('%Y%m%dT%H%M%S', time.gmtime(now_ms // 1000)) + f'.{now_ms % 1000:03d}'
+        name = f"{stamp}-{os.getpid()}-{sequence}-{UNSAFE_NAME_CHARS.sub('_', endpoint or 'unmatched')}"
+        capture = Capture(name, threading.get_ident(), trigger)
+        self.sampler.add(capture)
+        return capture
+
+    def finish(self, capture: Capture, metadata: dict):
+        """Stop sampling and queue the capture to be written."""
+        self.sampler.remove(capture)
+        duration = time.perf_counter() - capture.started
+        self._writer.submit(self._write, capture, dict(metadata, duration=duration))
+
+    def _write(self, capture: Capture, metadata: dict):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            total = sum(capture.samples.values())
+            base = os.path.join(self.directory, capture.name)
+            with open(base + '.collapsed', 'w') as f:
+                f.write(collapsed_stacks(capture.seconds))
+            with open(base + '.pstats', 'wb') as f:
+                marshal.dump(sampled_pstats(capture.samples, capture.seconds), f)
+            with open(base + '.json', 'w') as f:
+                json.dump(dict(metadata, name=capture.name, trigger=capture.trigger, status=capture.status,
+                               samples=total, created=time.time()), f)
+            self._trim()
+        except Exception:
+            logger.exception('Could not write profile %s', capture.name)
+
+    def _trim(self):
+        names = sorted(name[:-5] for name in os.listdir(self.directory) if name.endswith('.json'))
+        for name in names[:-self.keep] if self.keep else names:
+            for suffix in ('.json', '.collapsed', '.pstats'):
+                try:
+                    os.remove(os.path.join(self.directory, name + suffix))
+                except FileNotFoundError:
+                    pass  # another worker sharing the directory got there first
+
+    def recent(self, limit: Optional[int] = None) -> List[dict]:
+        """Metadata of the stored captures, newest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        captures = []
+        for name in sorted((n for n in os.listdir(self.directory) if n.endswith('.json')), reverse=True)[:limit]:
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    captures.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # trimmed or still being written
+        return captures
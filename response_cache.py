@@ -0,0 +1,152 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class LocalCacheBackend:
+    """In-process stand-in for the shared cache: an LRU with per-key expiry.
+
+    It implements the same get/set/incr surface as RedisCacheBackend, so a
+    single-process deployment (or a test run) behaves like a fleet sharing one
+    cache, minus the cross-process visibility. Entries stored with a TTL are
+    capped at ``max_entries`` and expired ones are purged on set(); counters
+    (the generation numbers, stored without a TTL) are kept apart and never
+    evicted, since losing one would revive the entries it invalidated.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        with self._lock:
+            if not ttl:
+                self._counters[key] = value
+                return
+            now = time.time()
+            self._data[key] = (value, now + ttl)
+            self._data.move_to_end(key)
+            for stale in [k for k, (_, expires) in self._data.items() if expires <= now]:
+                del self._data[stale]
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = int(self._counters.get(key, '0')) + 1
+            self._counters[key] = str(value)
+            return value
+
+
+class RedisCacheBackend:
+    """Shared cache on Redis, so every worker process sees the same entries and generations."""
+
+    def __init__(self, url: str):
+        import redis  # optional dependency, only needed when RESPONSE_CACHE_URL is set
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._client.get(key)
+        return value.decode() if value is not None else None
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        self._client.set(key, value, ex=int(ttl) if ttl else None)
+
+    def incr(self, key: str) -> int:
+        return int(self._client.incr(key))
+
+
+class ResponseCache:
+    """Two-level cache for rendered GET responses.
+
+    Entries live in a bounded in-process LRU in front of a shared backend, both
+    with the same TTL. Keys embed a generation number per namespace; bumping a
+    namespace (e.g. 'jobs' after a job is written) makes every older entry
+    unreachable at once, and the stale ones simply age out of the LRU.
+    """
+
+    PREFIX = 'rc:'
+
+    def __init__(self, shared=None, max_entries: int = 1024, ttl: float = 60.0):
+        self.shared = shared or LocalCacheBackend(max_entries)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    def generation(self, namespace: str) -> int:
+        return int(self.shared.get(f'{self.PREFIX}gen:{namespace}') or 0)
+
+    def bump(self, namespace: str) -> int:
+        """Invalidate every entry stored under the current generation of ``namespace``."""
+        return self.shared.incr(f'{self.PREFIX}gen:{namespace}')
+
+    def key(self, *parts: Any, namespaces=()) -> str:
+        generations = [f'{ns}={self.generation(ns)}' for ns in namespaces]
+        raw = '\x1f'.join([str(p) for p in parts] + generations)
+        return self.PREFIX + hashlib.sha1(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            item = self._local.get(key)
+            if item is not None:
+                entry, expires = item
+                if expires > now:
+                    self._local.move_to_end(key)
+                    return entry
+                del self._local[key]
+        raw = self.shared.get(key)
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        self._remember(key, entry, entry['stored_at'] + self.ttl)
+        return entry
+
+    def set(self, key: str, body: str, content_type: str) -> Dict[str, Any]:
+        """Store a rendered body; returns the entry with its ETag and timestamp."""
+        entry = {
+            'body': body,
+            'content_type': content_type,
+            'etag': hashlib.sha1(body.encode()).hexdigest(),
+            'stored_at': time.time(),
+        }
+        self.shared.set(key, json.dumps(entry), self.ttl)
+        self._remember(key, entry, entry['stored_at'] + self.ttl)
+        return entry
+
+    def _remember(self, key, entry, expires):
+        with self._lock:
+            self._local[key] = (entry, expires)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+
+def create_response_cache(url: Optional[str] = None, max_entries: int = 1024, ttl: float = 60.0) -> ResponseCache:
+    """Build the cache with a Redis backend for ``url`` or the local stand-in without one."""
+    shared = RedisCacheBackend(url) if url else LocalCacheBackend(max_entries)
+    return ResponseCache(shared, max_entries=max_entries, ttl=ttl)
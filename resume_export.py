@@ -0,0 +1,124 @@
+import re
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ai_features import Profile, generate_resume_sections
+from resume_renderer import resume_renderer
+
+# Column order of the rows fed to the exporter, see application.resume_export_rows()
+ROW_FIELDS = ('id', 'name', 'title', 'email', 'phone', 'location', 'skills', 'is_employer')
+
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+
+def profile_from_row(row: Sequence) -> Profile:
+    """Build the resume Profile for a user row, the same way /ai/resume-builder does."""
+    _, name, title, email, phone, location, skills, is_employer = row
+    return Profile(
+        name=name,
+        title=title or ('Employer' if is_employer else 'Job Seeker'),
+        email=email,
+        phone=phone or '',
+        location=location or '',
+        skills=[s.strip() for s in (skills or '').split(',') if s.strip()],
+    )
+
+
+def resume_filename(row: Sequence) -> str:
+    slug = _SLUG_RE.sub('-', (row[1] or '').lower()).strip('-') or 'resume'
+    return f'{row[0]}_{slug}.html'
+
+
+def render_chunk(rows: List[Sequence], variant: str = 'classic') -> List[Tuple[str, str]]:
+    """Worker entry point: (filename, html) for each user row in the chunk."""
+    sections = (generate_resume_sections(profile_from_row(row)) for row in rows)
+    return list(zip((resume_filename(row) for row in rows), resume_renderer.render_many(sections, variant)))
+
+
+def render_chunks(chunks: Iterable[List[Sequence]], variant: str = 'classic',
+                  workers: int = 1) -> Iterator[List[Tuple[str, str]]]:
+    """Render chunks in order, fanned out over ``workers`` processes.
+
+    At most two chunks per worker are in flight, so memory stays bounded no
+    matter how many rows the source yields.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield render_chunk(chunk, variant)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(render_chunk, chunk, variant))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class _StreamBuffer:
+    """Write-only sink for ZipFile; drain() hands back what was written since the last call.
+
+    It has no tell()/seek(), so ZipFile writes in streaming mode (data
+    descriptors after each member) and never needs to rewind.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_resume_zip(chunks: Iterable[List[Sequence]], variant: str = 'classic', workers: int = 1,
+                    total: Optional[int] = None,
+                    progress: Optional[Callable[[int, Optional[int], float], None]] = None) -> Iterator[bytes]:
+    """Yield a ZIP archive of rendered resumes piece by piece.
+
+    Rows are expected in user id order, as resume_export_rows() yields them;
+    a row repeating the previous user is skipped rather than written as a
+    second member with the same name. ``progress(done, total,
+    elapsed_seconds)`` is called after every chunk with the number of
+    resumes written so far.
+    """
+    started = time.perf_counter()
+    done = 0
+    previous = None
+    sink = _StreamBuffer()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for rendered in render_chunks(chunks, variant, workers):
+            for filename, html in rendered:
+                if filename == previous:
+                    continue
+                archive.writestr(filename, html)
+                previous = filename
+                done += 1
+            if progress:
+                progress(done, total, time.perf_counter() - started)
+            data = sink.drain()
+            if data:
+                yield data
+    yield sink.drain()
+
+
+def export_resumes(chunks: Iterable[List[Sequence]], out, variant: str = 'classic', workers: int = 1,
+                   total: Optional[int] = None,
+                   progress: Optional[Callable[[int, Optional[int], float], None]] = None) -> int:
+    """Write the ZIP archive to the binary file object ``out``; returns the bytes written."""
+    written = 0
+    for data in iter_resume_zip(chunks, variant, workers, total, progress):
+        out.write(data)
+        written += len(data)
+    return written
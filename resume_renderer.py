@@ -0,0 +1,157 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Any, Dict, Iterable, Iterator, Union
+
+from jinja2 import Environment
+
+from ai_features import Profile, generate_resume_sections
+
+# Shared by every variant; a variant only changes the wrapper class today, but
+# VARIANT_TEMPLATES may give one its own source.
+RESUME_TEMPLATE = """\
+<div class='resume resume-{{ variant }}'>
+  <section class='resume-header'>
+    <h1>{{ header.name }}</h1>
+    <p class='subtitle'>{{ header.title }}</p>
+    <p class='contact'>
+      <span>{{ header.contact.email }}</span> ·
+      <span>{{ header.contact.phone }}</span> ·
+      <span>{{ header.contact.location }}</span>
+    </p>
+  </section>
+  <section class='resume-summary'>
+    <h2>Professional Summary</h2>
+    <p>{{ summary }}</p>
+  </section>
+  <section class='resume-skills'>
+    <h2>Skills</h2>
+    <ul>{% for skill in skills %}<li>{{ skill }}</li>{% endfor %}</ul>
+  </section>
+  {%- if experience %}
+  <section class='resume-experience'><h2>Experience</h2>
+    {%- for exp in experience %}
+    <div class='role'><h3>{{ exp.role }}</h3><p class='company'>{{ exp.company }} · {{ exp.dates or exp.period }}</p><p>{{ exp.details or exp.description }}</p></div>
+    {%- endfor %}
+  </section>
+  {%- endif %}
+  {%- if education %}
+  <section class='resume-education'><h2>Education</h2>
+    {%- for ed in education %}
+    <div class='edu'><h3>{{ ed.degree }}</h3><p class='school'>{{ ed.school or ed.institution }} · {{ ed.year }}</p></div>
+    {%- endfor %}
+  </section>
+  {%- endif %}
+  {%- if projects %}
+  <section class='resume-projects'><h2>Projects</h2>
+    {%- for project in projects %}
+    <div class='project'><h3>{{ project.title }}</h3><p>{{ project.description }}</p></div>
+    {%- endfor %}
+  </section>
+  {%- endif %}
+</div>"""
+
+# The known variants. Their names double as CSS class names; anything else a
+# client sends renders as 'classic', so compiled templates and memoized output
+# only ever exist for these keys.
+VARIANT_TEMPLATES: Dict[str, str] = {
+    'classic': RESUME_TEMPLATE,
+}
+
+
+def normalize_variant(variant: str) -> str:
+    """Lowercased known variant name, or 'classic' for anything else."""
+    variant = (variant or '').strip().lower()
+    return variant if variant in VARIANT_TEMPLATES else 'classic'
+
+
+class _Row(dict):
+    """Dict whose missing keys render as '' (matching the old ``.get(key, '')``)."""
+
+    def __getattr__(self, name):
+        return self.get(name) or ''
+
+
+class ResumeRenderer:
+    """Renders resume HTML from compiled, autoescaping Jinja templates.
+
+    Each variant is compiled once. Rendered output is memoized in an LRU keyed
+    by a SHA-1 of the Profile (or precomputed sections) plus the variant, so
+    re-rendering an unchanged profile skips section generation and rendering.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._env = Environment(autoescape=True, trim_blocks=False)
+        self._templates = {}
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def template(self, variant: str):
+        variant = normalize_variant(variant)
+        compiled = self._templates.get(variant)
+        if compiled is None:
+            compiled = self._env.from_string(VARIANT_TEMPLATES[variant])
+            self._templates[variant] = compiled
+        return compiled
+
+    @staticmethod
+    def content_hash(source: Union[Profile, Dict[str, Any]], variant: str) -> str:
+        payload = asdict(source) if isinstance(source, Profile) else source
+        kind = 'profile' if isinstance(source, Profile) else 'sections'
+        raw = json.dumps([kind, normalize_variant(variant), payload], sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def render_sections(self, sections: Dict[str, Any], variant: str = 'classic') -> str:
+        """Render without touching the cache."""
+        header = sections['header']
+        return self.template(variant).render(
+            variant=normalize_variant(variant),
+            header=_Row(header, contact=_Row(header.get('contact') or {})),
+            summary=sections.get('summary', ''),
+            skills=sections.get('skills') or [],
+            experience=[_Row(exp) for exp in sections.get('experience') or []],
+            education=[_Row(ed) for ed in sections.get('education') or []],
+            projects=[_Row(p) for p in sections.get('projects') or []],
+        )
+
+    def render(self, source: Union[Profile, Dict[str, Any]], variant: str = 'classic') -> str:
+        """Render a Profile or its precomputed sections, memoized by content hash."""
+        key = self.content_hash(source, variant)
+        with self._lock:
+            html = self._cache.get(key)
+            if html is not None:
+                self._cache.move_to_end(key)
+                return html
+        sections = source if isinstance(source, dict) else generate_resume_sections(source)
+        html = self.render_sections(sections, variant)
+        with self._lock:
+            self._cache[key] = html
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return html
+
+    def render_many(self, profiles: Iterable[Union[Profile, Dict[str, Any]]], variant: str = 'classic',
+                    use_cache: bool = False) -> Iterator[str]:
+        """Render a stream of profiles for export, one HTML string per profile.
+
+        Bulk runs bypass the memo by default so an export of thousands of
+        profiles does not evict the entries serving interactive requests.
+        """
+        if use_cache:
+            for source in profiles:
+                yield self.render(source, variant)
+            return
+        for source in profiles:
+            sections = source if isinstance(source, dict) else generate_resume_sections(source)
+            yield self.render_sections(sections, variant)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+# Process-wide renderer used by generate_resume_html
+resume_renderer = ResumeRenderer()
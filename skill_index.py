@@ -0,0 +1,56 @@
+import threading
+from typing import List, Dict, Any, Iterable, Optional
+
+from ai_features import normalize_skills
+
+
+class SkillIndex:
+    """In-process store of every job's normalized skill set and location.
+
+    MatchingEngine compiles its sparse job x skill matrix from here and reads
+    locations back for the location bonus; ranking itself happens in the
+    engine, so no per-skill posting lists are kept.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._job_skills: Dict[int, frozenset] = {}
+        self._job_locations: Dict[int, str] = {}
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._job_skills)
+
+    def __contains__(self, job_id):
+        return job_id in self._job_skills
+
+    def load(self, rows: Iterable[Any]):
+        """Rebuild the store from (id, required_skills, location) rows."""
+        with self._lock:
+            self._job_skills = {}
+            self._job_locations = {}
+            for job_id, required_skills, location in rows:
+                self._add(job_id, required_skills, location)
+            self.loaded = True
+
+    def add_job(self, job_id: int, required_skills: str, location: Optional[str] = None):
+        """Store a newly created job; re-adding an existing id replaces it."""
+        with self._lock:
+            self._add(job_id, required_skills, location)
+
+    def _add(self, job_id, required_skills, location):
+        self._job_skills[job_id] = frozenset(normalize_skills(required_skills))
+        self._job_locations[job_id] = (location or '').lower()
+
+    def job_ids(self) -> List[int]:
+        """Stored job ids, in the order they were first added."""
+        with self._lock:
+            return list(self._job_skills)
+
+    def skills(self, job_id: int) -> frozenset:
+        """Normalized skill set of a stored job."""
+        return self._job_skills[job_id]
+
+    def location(self, job_id: int) -> str:
+        """Lowercased location of a stored job."""
+        return self._job_locations[job_id]
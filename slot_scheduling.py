@@ -0,0 +1,155 @@
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+Interval = Tuple[datetime, datetime]
+
+WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+DAY_SETS = {'weekdays': (0, 1, 2, 3, 4), 'weekends': (5, 6), 'daily': tuple(range(7))}
+# Upper bounds that keep one request from generating an unbounded number of rows
+MAX_RULE_WEEKS = 52
+MAX_RULE_SLOTS = 20000
+
+
+class RecurrenceRule(NamedTuple):
+    """Slots of ``slot_minutes`` (plus ``break_minutes`` between them) from ``day_start``
+    to ``day_end`` on each of ``days`` (0 = Monday), for ``weeks`` weeks from ``start_date``."""
+    start_date: date
+    weeks: int
+    days: Tuple[int, ...]
+    day_start: time
+    day_end: time
+    slot_minutes: int
+    break_minutes: int = 0
+
+
+def _parse_days(value: Any) -> Tuple[int, ...]:
+    if isinstance(value, str):
+        if value.lower() in DAY_SETS:
+            return DAY_SETS[value.lower()]
+        value = value.split(',')
+    days = set()
+    for day in value:
+        if isinstance(day, int) and 0 <= day < 7:
+            days.add(day)
+        elif str(day).strip().lower()[:3] in WEEKDAYS:
+            days.add(WEEKDAYS.index(str(day).strip().lower()[:3]))
+        else:
+            raise ValueError(f'unknown day {day!r}')
+    if not days:
+        raise ValueError('no days given')
+    return tuple(sorted(days))
+
+
+def parse_recurrence(data: Dict[str, Any]) -> RecurrenceRule:
+    """Build a RecurrenceRule from request data, raising ValueError on anything unusable.
+
+    Accepts e.g. {"start_date": "2026-11-02", "weeks": 8, "days": "weekdays",
+    "start": "09:00", "end": "17:00", "slot_minutes": 30, "break_minutes": 0};
+    ``days`` may also be a list or comma-separated string of day names.
+    """
+    try:
+        rule = RecurrenceRule(
+            start_date=date.fromisoformat(str(data['start_date'])),
+            weeks=int(data.get('weeks', 1)),
+            days=_parse_days(data.get('days', 'weekdays')),
+            day_start=time.fromisoformat(str(data.get('start', '09:00'))),
+            day_end=time.fromisoformat(str(data.get('end', '17:00'))),
+            slot_minutes=int(data.get('slot_minutes', 30)),
+            break_minutes=int(data.get('break_minutes', 0)),
+        )
+    except KeyError as e:
+        raise ValueError(f'missing {e.args[0]}')
+    except TypeError as e:
+        raise ValueError(str(e))
+    if not 1 <= rule.weeks <= MAX_RULE_WEEKS:
+        raise ValueError(f'weeks must be between 1 and {MAX_RULE_WEEKS}')
+    if rule.slot_minutes < 5 or rule.break_minutes < 0:
+        raise ValueError('slot_minutes must be at least 5 and break_minutes not negative')
+    if rule.day_start >= rule.day_end:
+        raise ValueError('end must be after start')
+    return rule
+
+
+def expand(rule: RecurrenceRule) -> List[Interval]:
+    """Every (start, end) the rule produces, in time order; slots never run past day_end."""
+    length = timedelta(minutes=rule.slot_minutes)
+    step = length + timedelta(minutes=rule.break_minutes)
+    slots = []
+    for offset in range(rule.weeks * 7):
+        day = rule.start_date + timedelta(days=offset)
+        if day.weekday() not in rule.days:
+            continue
+        start, day_end = datetime.combine(day, rule.day_start), datetime.combine(day, rule.day_end)
+        while start + length <= day_end:
+            slots.append((start, start + length))
+            if len(slots) > MAX_RULE_SLOTS:
+                raise ValueError(f'the rule produces more than {MAX_RULE_SLOTS} slots')
+            start += step
+    return slots
+
+
+class IntervalTree:
+    """Static interval tree over half-open [start, end) intervals.
+
+    The intervals are sorted by start and laid out as an implicit balanced
+    BST (each node is the midpoint of its range) with every subtree's
+    maximum end alongside, so an overlap query costs O(log n + k). Slots
+    that merely touch (one ends as the next starts) do not overlap.
+    """
+
+    def __init__(self, intervals: Sequence[Interval]):
+        self.intervals = sorted(intervals)
+        self._max_end: List[Optional[datetime]] = [None] * len(self.intervals)
+        if self.intervals:
+            self._build(0, len(self.intervals))
+
+    def _build(self, lo: int, hi: int) -> datetime:
+        mid = (lo + hi) // 2
+        max_end = self.intervals[mid][1]
+        if lo < mid:
+            max_end = max(max_end, self._build(lo, mid))
+        if mid + 1 < hi:
+            max_end = max(max_end, self._build(mid + 1, hi))
+        self._max_end[mid] = max_end
+        return max_end
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def iter_overlapping(self, start: datetime, end: datetime) -> Iterator[Interval]:
+        stack = [(0, len(self.intervals))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self._max_end[mid] <= start:
+                continue  # everything in this subtree ends before the query starts
+            node = self.intervals[mid]
+            if node[0] < end:
+                if node[1] > start:
+                    yield node
+                stack.append((mid + 1, hi))
+            stack.append((lo, mid))
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        return next(self.iter_overlapping(start, end), None) is not None
+
+
+def split_conflicts(existing: Sequence[Interval],
+                    candidates: Sequence[Interval]) -> Tuple[List[Interval], List[Interval]]:
+    """Partition candidates into (accepted, conflicting).
+
+    A candidate conflicts if it overlaps an existing interval or one already
+    accepted; the earliest of two overlapping candidates wins.
+    """
+    tree = IntervalTree(existing)
+    accepted, conflicts = [], []
+    last_end = None
+    for start, end in sorted(candidates):
+        if (last_end is not None and start < last_end) or tree.overlaps(start, end):
+            conflicts.append((start, end))
+        else:
+            accepted.append((start, end))
+            last_end = end if last_end is None else max(last_end, end)
+    return accepted, conflicts